@@ -26,11 +26,11 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from os.path import expanduser, isfile, join
-from copy import deepcopy
-from tempfile import mkstemp
-from threading import Event
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join
+from subprocess import Popen, TimeoutExpired
+from threading import Event, Lock, Thread
+from time import monotonic, time
 from typing import Optional
 
 from ovos_bus_client import Message
@@ -38,36 +38,101 @@ from ovos_utils import classproperty
 from ovos_utils.log import LOG
 from ovos_utils.process_utils import RuntimeRequirements
 from neon_utils.message_utils import get_message_user, dig_for_message
-from neon_utils.signal_utils import wait_for_signal_clear
 from neon_utils.skills import NeonSkill
 from neon_utils.user_utils import get_user_prefs
-from neon_utils.file_utils import load_commented_file
 from ovos_config.locations import get_xdg_data_save_path
 from ovos_plugin_manager.templates import TTS
-from ovos_utils.sound import play_audio
 from ovos_workshop.decorators import intent_handler
-from ovos_workshop.resource_files import find_resource
+
+from .audio_buffer import AudioBuffer, get_audio_buffer_dir
+from .audio_cache import PromptAudioCache, get_audio_cache_dir
+from .demo_profile import OverlayProfile
+from .demo_script import DemoScript, DemoScriptCache, resolve_demo_file
+from .history import HISTORY_MSG_TYPE, RunHistory, get_history_file
+from .kiosk import KIOSK_TASK, KioskScheduler
+from .metrics import METRICS_MSG_TYPE, MetricsLog, StepTimeline, \
+    get_metrics_file, AUDIO_END, PLAYBACK_END, PLAYBACK_START, \
+    PROMPT_EMITTED, PROMPT_HANDLED, SYNTHESIS_READY
+from .runner import DemoRunner, PlaybackWatcher
+from .session import DEMO_SESSION_KEY, DEMO_STEP_KEY, DEMO_USERNAME, \
+    DemoSession, DemoSessionManager, DemoState, get_prompt_context, \
+    get_step_outcome
+from .synthesis import PromptSynthesizer, can_batch, can_stream
+from .timing import HANDLER, SPEECH, StepTimingModel, get_timing_file
+from .tts_pool import TTSEnginePool
+from .version import __version__
+from .warmup import get_demo_langs, prerender_prompts
 
 
 class DemoSkill(NeonSkill):
     def __init__(self, **kwargs):
         NeonSkill.__init__(self, **kwargs)
-        self._active_demos = dict()
-        self._audio_output_done = Event()
-        self._prompt_handled = Event()
-        self._last_response = None
+        self._active_demos = DemoSessionManager()
+        self._runner = DemoRunner()
+        self._playback_watcher = PlaybackWatcher()
+        # Seconds to wait for more responses after one finishes speaking
+        self._settle_time = 0.5
+        # Seconds to wait for stopped playback to exit before killing it
+        self._terminate_timeout = 0.05
         self._data_path = get_xdg_data_save_path()
+        # Set up by `_init_demos` when a demo is first needed
+        self._audio_cache: Optional[PromptAudioCache] = None
+        self._demos_initialized = False
+        self._init_lock = Lock()
+        self._tts_pool = TTSEnginePool(self.tts_idle_timeout)
+        self._audio_buffer_dir = get_audio_buffer_dir(self.skill_id)
+        self._timing_models = dict()
+        self._metrics_log = MetricsLog(
+            get_metrics_file(self._data_path, self.skill_id))
+        self._history = RunHistory(
+            get_history_file(self._data_path, self.skill_id))
+        self._scripts = DemoScriptCache(
+            lambda filename, lang: resolve_demo_file(
+                filename, lang, self.skill_id, self.root_dir,
+                self._data_path, self.file_system.path))
+        self._shutdown_event = Event()
+        self._kiosk: Optional[KioskScheduler] = None
+        self._kiosk_session: Optional[DemoSession] = None
+        self._kiosk_tts: Optional[TTS] = None
+        self._kiosk_starting = False
 
         # When demo prompt enabled, wait for load and prompt user
-        if self.prompt_on_start:
+        if self.prompt_on_start and not self.kiosk_mode:
             self.add_event('mycroft.ready', self._show_demo_prompt)
-        self.add_event("recognizer_loop:audio_output_start",
-                       self._audio_started)
-        self.add_event("recognizer_loop:audio_output_end",
-                       self._audio_stopped)
-        self.add_event("mycroft.mic.listen", self._mic_listen)
-        self.add_event("mycroft.skill.handler.complete",
-                       self._handler_complete)
+        if self.prerender_on_ready:
+            self.add_event('mycroft.ready', self._start_prerender)
+        self.add_event("neon.demo.load_test", self._start_load_test)
+        self.add_event("neon.demo.health_sweep", self._start_health_sweep)
+        self.add_event(HISTORY_MSG_TYPE, self._handle_history_report)
+        self.add_event("neon.demo.kiosk.start", self._handle_kiosk_start)
+        self.add_event("neon.demo.kiosk.stop", self._handle_kiosk_stop)
+        if self.kiosk_mode:
+            self.start_kiosk()
+
+    def _init_demos(self):
+        """
+        Load the prompt audio cache, clear scratch audio left from a crash,
+        and listen for the events demos wait on. This is deferred until a
+        demo is first needed so skill load is fast on devices where the demo
+        doesn't run.
+        """
+        with self._init_lock:
+            if self._demos_initialized:
+                return
+            LOG.debug("Initializing demo resources")
+            self._audio_cache = PromptAudioCache(
+                get_audio_cache_dir(self._data_path, self.skill_id),
+                self.audio_cache_size * 1024 * 1024,
+                hold_time=self.speak_timeout)
+            AudioBuffer.clear_all(self._audio_buffer_dir)
+            self.add_event("recognizer_loop:audio_output_start",
+                           self._audio_started)
+            self.add_event("recognizer_loop:audio_output_end",
+                           self._audio_stopped)
+            self.add_event("mycroft.mic.listen", self._mic_listen)
+            self.add_event("mycroft.skill.handler.complete",
+                           self._handler_complete)
+            self._demos_initialized = True
 
     @classproperty
     def runtime_requirements(self):
@@ -103,6 +168,67 @@ class DemoSkill(NeonSkill):
     def intent_timeout(self):
         return self.settings.get("intent_timeout") or self._speak_timeout
 
+    @property
+    def tts_lookahead(self) -> int:
+        """
+        Get the number of prompts to synthesize ahead of the prompt currently
+        being played.
+        """
+        return self.settings.get("tts_lookahead", 1)
+
+    @property
+    def stream_prompts(self) -> bool:
+        """
+        If True, render long prompts in chunks and start playback when the
+        first chunk is ready, if the demo TTS plugin supports it.
+        """
+        return self.settings.get("stream_prompts", True)
+
+    @property
+    def batch_synthesis(self) -> bool:
+        """
+        If True, render prompts after the first look-ahead window in one call
+        to the demo TTS plugin if it supports batched synthesis.
+        """
+        return self.settings.get("batch_synthesis", True)
+
+    @property
+    def audio_cache_size(self) -> int:
+        """
+        Get the max size in MiB of synthesized prompt audio to keep on disk.
+        """
+        return self.settings.get("audio_cache_size", 100)
+
+    @property
+    def tts_idle_timeout(self) -> int:
+        """
+        Get the number of seconds an unused demo TTS engine stays loaded.
+        """
+        return self.settings.get("tts_idle_timeout", 900)
+
+    @property
+    def adaptive_timing(self) -> bool:
+        """
+        If True, learn how long each prompt takes to be handled and spoken
+        and use that to set per-prompt timeouts.
+        """
+        return self.settings.get("adaptive_timing", True)
+
+    @property
+    def record_metrics(self) -> bool:
+        """
+        If True, emit and log latency metrics for each demo step.
+        """
+        return self.settings.get("record_metrics", True)
+
+    @property
+    def record_history(self) -> bool:
+        """
+        If True, store the outcome and timing of each step of completed demos
+        in the run history.
+        """
+        return self.settings.get("record_history", True)
+
     @property
     def demo_filename(self):
         """
@@ -114,22 +240,197 @@ class DemoSkill(NeonSkill):
     def prompt_on_start(self):
         return self.settings.get("prompt_on_start", True)
 
-    def _audio_started(self, _):
-        # TODO: Handle audio per-user
-        self._audio_output_done.clear()
+    @property
+    def kiosk_mode(self) -> bool:
+        """
+        If True, run the demo in a loop while the device is idle.
+        """
+        return self.settings.get("kiosk_mode", False)
+
+    @property
+    def kiosk_interval(self) -> float:
+        """
+        Get the number of seconds between kiosk demo loops.
+        """
+        return self.settings.get("kiosk_interval", 300)
+
+    @property
+    def kiosk_idle_time(self) -> float:
+        """
+        Get the number of seconds without user activity before a kiosk demo
+        loop may start.
+        """
+        return self.settings.get("kiosk_idle_time", 60)
+
+    @property
+    def kiosk_max_load(self) -> float:
+        """
+        Get the max 1-minute load average per CPU to start a kiosk demo loop
+        at; loops are delayed while the device is busier than this.
+        """
+        return self.settings.get("kiosk_max_load", 0.8)
+
+    @property
+    def prerender_on_ready(self) -> bool:
+        """
+        If True, synthesize demo prompts for all languages in the background
+        after the system is ready, if a demo is expected to run (the user
+        will be prompted for one or kiosk mode is enabled).
+        """
+        return self.settings.get("prerender_on_ready", True)
 
-    def _audio_stopped(self, _):
-        # TODO: Handle audio per-user
-        self._audio_output_done.set()
+    def _audio_started(self, message):
+        session = self._active_demos.get_session(message)
+        if session:
+            session.on_audio_started(message)
+            self._runner.notify(session.session_id)
+        elif self._kiosk:
+            self._kiosk.on_audio_started()
 
-    def _mic_listen(self, _):
-        # TODO: Handle this per-user
-        self._prompt_handled.set()
+    def _audio_stopped(self, message):
+        session = self._active_demos.get_session(message)
+        if session:
+            session.on_audio_stopped(message)
+            self._runner.notify(session.session_id)
+        elif self._kiosk:
+            self._kiosk.on_audio_stopped()
+
+    def _user_activity(self, message):
+        # Demo prompts are not user activity
+        if self._kiosk and DEMO_SESSION_KEY not in message.context:
+            self._kiosk.on_activity()
+
+    def _mic_listen(self, message):
+        session = self._active_demos.get_session(message)
+        if session:
+            session.on_mic_listen(message)
+            self._runner.notify(session.session_id)
 
     def _handler_complete(self, message):
-        # TODO: Handle this per-user
-        self._last_response = message
-        self._prompt_handled.set()
+        # Only responses to demo prompts; not i.e. this skill's own handler
+        session = self._active_demos.get_session(message, strict=True)
+        if session:
+            session.on_handler_complete(message)
+            self._runner.notify(session.session_id)
+
+    def _start_prerender(self, _):
+        if not (self.prompt_on_start or self.kiosk_mode):
+            LOG.debug("No demo expected; not pre-rendering")
+            return
+        Thread(target=self.prerender_demos, daemon=True,
+               name="demo_prerender").start()
+
+    def _start_load_test(self, message):
+        Thread(target=self.run_load_test, args=(message,), daemon=True,
+               name="demo_load_test").start()
+
+    def run_load_test(self, message: Message) -> Optional[dict]:
+        """
+        Replay the demo script as utterances from synthetic users without
+        speaking prompts and report handler throughput and latency. The
+        report is emitted as a response to `message`.
+        :param message: Message with optional `users`, `concurrency`, `rate`,
+            `iterations`, `timeout`, and `lang` data
+        :returns: dict load test report, else None if there is no demo
+        """
+        from .load_test import LoadTest
+        lang = message.data.get("lang") or self.lang
+        script = self._get_demo_script(lang)
+        if not script:
+            LOG.warning(f"No demo file for lang={lang}")
+            self.bus.emit(message.response({"error": "no demo file"}))
+            return None
+        profile = OverlayProfile(get_user_prefs(message),
+                                 {"units": {"measure": "imperial"}})
+        load_test = LoadTest(self.bus, list(script.prompts), lang,
+                             int(message.data.get("users", 10)),
+                             message.data.get("concurrency"),
+                             message.data.get("rate"),
+                             int(message.data.get("iterations", 1)),
+                             float(message.data.get("timeout",
+                                                    self.intent_timeout)),
+                             profile.materialize())
+        report = load_test.run()
+        LOG.info(f"Load test finished: {report}")
+        self.bus.emit(message.response(report))
+        return report
+
+    def _start_health_sweep(self, message):
+        Thread(target=self.run_health_sweep, args=(message,), daemon=True,
+               name="demo_health_sweep").start()
+
+    def run_health_sweep(self, message: Message) -> Optional[dict]:
+        """
+        Send every prompt of the demo at once, without speaking them, and
+        report which skills handled their prompt and how quickly. The report
+        is emitted as a response to `message`.
+        :param message: Message with optional `timeout` and `lang` data
+        :returns: dict health sweep report, else None if there is no demo
+        """
+        from .health import HealthSweep
+        lang = message.data.get("lang") or self.lang
+        script = self._get_demo_script(lang)
+        if not script:
+            LOG.warning(f"No demo file for lang={lang}")
+            self.bus.emit(message.response({"error": "no demo file"}))
+            return None
+        profile = OverlayProfile(get_user_prefs(message),
+                                 {"units": {"measure": "imperial"}})
+        sweep = HealthSweep(self.bus, list(script.steps), lang,
+                            float(message.data.get("timeout",
+                                                   self.intent_timeout)),
+                            profile.materialize())
+        report = sweep.run()
+        LOG.info(f"Health sweep finished: {report['passed']} passed, "
+                 f"{report['failed']} failed")
+        self.bus.emit(message.response(report))
+        return report
+
+    def prerender_demos(self, langs: Optional[list] = None):
+        """
+        Prepare demos for each language in parallel: compile the demo
+        script, load the demo TTS engine into the pool, and synthesize
+        prompts into the prompt audio cache, so a demo in any language starts
+        without loading a plugin or waiting for synthesis.
+        :param langs: languages to prepare (default all languages in `locale`)
+        """
+        self._init_demos()
+        langs = langs or get_demo_langs(self.root_dir) or [self.lang]
+        with ThreadPoolExecutor(max_workers=len(langs),
+                                thread_name_prefix="demo_prerender") as pool:
+            futures = {lang: pool.submit(self._prerender_demo, lang)
+                       for lang in langs}
+            for lang, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    LOG.error(f"Failed to prepare demo for lang={lang}: {e}")
+
+    def _prerender_demo(self, lang: str):
+        """
+        Prepare the demo script, TTS engine, and prompt audio for `lang`.
+        :param lang: language of the demo to prepare
+        """
+        if self._shutdown_event.is_set():
+            return
+        script = self._get_demo_script(lang)
+        if not script:
+            LOG.debug(f"No demo file for lang={lang}")
+            return
+        tts = self._get_demo_tts(lang)
+        if not tts:
+            return
+        try:
+            rendered = prerender_prompts(tts, list(script.prompts),
+                                         self._audio_cache, lang,
+                                         self._shutdown_event,
+                                         self.speak_timeout,
+                                         self._is_streaming(tts),
+                                         self._is_batching(tts))
+        finally:
+            self._tts_pool.release(tts)
+        LOG.info(f"Pre-rendered {rendered}/{len(script)} prompts for "
+                 f"lang={lang}")
 
     def _show_demo_prompt(self, message):
         """
@@ -158,156 +459,697 @@ class DemoSkill(NeonSkill):
     @intent_handler("show_demo.intent")
     def handle_show_demo(self, message):
         """
-        Starts a brief demo
+        Starts a brief demo. The demo is run by `self._runner`, so this
+        handler returns as soon as the demo has started.
         :param message: message object associated with request
         """
         if not self.neon_in_request(message):
             return
-        # TODO: Parse demo language from request
-        lang = self.lang
-        original_message = deepcopy(message)
+        self._start_demo(message)
+
+    def _start_demo(self, message: Message) -> DemoSession:
+        """
+        Start a demo for the user associated with `message`.
+        :param message: Message requesting the demo
+        :returns: DemoSession of the started demo
+        """
+        self._init_demos()
+        prefs = get_user_prefs(message)
+        lang = self._get_demo_lang(message, prefs)
         # Track demo state for the user
-        user = get_message_user(message)
-        self._active_demos[user] = Event()
+        session = DemoSession(get_message_user(message), lang, message)
+        self._active_demos.add(session)
         # Define a demo profile so user profile isn't modified
-        profile = deepcopy(get_user_prefs(message))
-        profile['user']['username'] = 'demo'
-        profile['units']['measure'] = 'imperial'
+        session.profile = OverlayProfile(prefs,
+                                         {"user": {"username": DEMO_USERNAME},
+                                          "units": {"measure": "imperial"}})
         # Confirm demo is starting
-        self._audio_output_done.clear()  # Clear signal to wait for intro speak
-        self.speak_dialog("starting_demo")
+        session.audio_output_done.clear()  # Clear signal to wait for intro
+        self.speak_dialog("starting_demo", message=session.message)
         # Read the demo prompts
-        demo_prompts = load_commented_file(self._get_demo_file()).split('\n')
+        script = self._get_demo_script(lang)
+        if script:
+            session.script = script
+            session.prompts = list(script.prompts)
+            if self.adaptive_timing:
+                session.timing = self._get_timing_model(script.path)
+        else:
+            LOG.error(f"No demo file found: {self.demo_filename}")
         # Define message context for the demo actions
-        message_context = deepcopy(message.context)
-        message_context['neon_should_respond'] = True
-        message_context['username'] = 'demo'
-        message_context['user_profiles'] = [profile]
-        message_context['source'] = ['demo']
+        message_context = get_prompt_context(DEMO_USERNAME,
+                                             session.session_id,
+                                             session.profile.materialize(),
+                                             session.message.context)
 
         # Define a message that will be updated with any profile changes
-        message = Message("recognizer_loop:utterance", context=message_context)
-        prompter = {"name": "Demo",
-                    "language": lang,
-                    "gender": "female" if profile['speech'].get('tts_gender')
-                            == "male" else "female"}
-        # Initialize the demo TTS
-        tts = self._get_demo_tts()
-        # Iterate over demo prompts until done or user says 'stop'
-        for prompt in demo_prompts:
-            if self._active_demos[user].is_set():
-                # Check to stop before speaking the prompt
-                break
+        session.prompt_message = Message("recognizer_loop:utterance",
+                                         context=message_context)
+        session.prompter = {"name": "Demo",
+                            "language": lang,
+                            "gender": "female" if
+                            session.profile.get('speech', 'tts_gender') ==
+                            "male"
+                            else "female"}
+        # Get the demo TTS
+        session.tts = self._get_demo_tts(lang)
+        if session.tts:
+            # Render prompts in the background ahead of playback
+            session.synthesizer = PromptSynthesizer(
+                session.tts, session.prompts, self.tts_lookahead,
+                session.stopped, self._audio_cache, lang,
+                lambda _: self._tts_pool.mark_unhealthy(session.tts),
+                AudioBuffer(join(self._audio_buffer_dir, session.session_id)),
+                self._is_streaming(session.tts),
+                self._is_batching(session.tts))
+            session.synthesizer.prefetch(0)
+        session.state = DemoState.WAIT_AUDIO
+        session.deadline = monotonic() + self.speak_timeout
+        session.stopped.add_callback(lambda: self._cancel_demo(session))
+        self._runner.start(session.session_id,
+                           lambda: self._advance_demo(session))
+        return session
+
+    def start_kiosk(self):
+        """
+        Start running the demo in a loop while the device is idle.
+        """
+        if self._kiosk:
+            return
+        LOG.info("Starting kiosk demo loop")
+        self._init_demos()
+        self._kiosk = KioskScheduler(self.kiosk_interval, self.kiosk_idle_time,
+                                     self.kiosk_max_load)
+        self.add_event("recognizer_loop:wakeword", self._user_activity)
+        self.add_event("recognizer_loop:utterance", self._user_activity)
+        self._runner.start(KIOSK_TASK, self._advance_kiosk)
+
+    def stop_kiosk(self):
+        """
+        Stop the kiosk demo loop, including any loop in progress.
+        """
+        if not self._kiosk:
+            return
+        LOG.info("Stopping kiosk demo loop")
+        self._kiosk = None
+        self.remove_event("recognizer_loop:wakeword")
+        self.remove_event("recognizer_loop:utterance")
+        self._runner.cancel(KIOSK_TASK)
+        session, self._kiosk_session = self._kiosk_session, None
+        if session:
+            session.stop()
+        tts, self._kiosk_tts = self._kiosk_tts, None
+        self._tts_pool.release(tts)
+
+    def _handle_kiosk_start(self, _):
+        self.update_skill_settings({"kiosk_mode": True})
+        self.start_kiosk()
+
+    def _handle_kiosk_stop(self, _):
+        self.update_skill_settings({"kiosk_mode": False})
+        self.stop_kiosk()
+
+    def _advance_kiosk(self) -> Optional[float]:
+        """
+        Start a kiosk demo loop when the device is idle. Called by
+        `self._runner` when a loop finishes or a returned deadline passes.
+        :returns: monotonic time to check again, None if the kiosk stopped
+        """
+        kiosk = self._kiosk
+        if not kiosk:
+            return None
+        now = monotonic()
+        if self._kiosk_starting:
+            # Notified when the loop is started
+            return now + self.kiosk_interval
+        session = self._kiosk_session
+        if session:
+            if not session.finished.is_set():
+                # Notified when the loop finishes
+                return now + self.kiosk_interval
+            self._kiosk_session = None
+            kiosk.on_loop_finished()
+        if len(self._active_demos):
+            # A user is watching a demo
+            kiosk.on_activity()
+        next_run = kiosk.get_next_run(now)
+        if next_run > now:
+            return next_run
+        LOG.debug("Starting kiosk demo loop")
+        # Loading the script and TTS can block; keep them off the runner
+        self._kiosk_starting = True
+        Thread(target=self._start_kiosk_loop, args=(kiosk,), daemon=True,
+               name="demo_kiosk").start()
+        return now + self.kiosk_interval
+
+    def _start_kiosk_loop(self, kiosk: KioskScheduler):
+        """
+        Start a kiosk demo loop and notify `self._runner` once it is tracked.
+        :param kiosk: KioskScheduler the loop was started for
+        """
+        try:
+            session = self._start_demo(
+                Message("neon.demo.kiosk",
+                        context={"neon_should_respond": True,
+                                 "username": "local"}))
+            self._kiosk_session = session
+            if self._kiosk is not kiosk:
+                # Kiosk stopped while the loop was starting
+                self._kiosk_session = None
+                session.stop()
+                return
+            if session.tts and session.tts is not self._kiosk_tts:
+                # Keep the engine loaded between loops, replacing one the
+                # pool replaced after it was marked unhealthy
+                tts = self._get_demo_tts(session.lang)
+                if self._kiosk is kiosk:
+                    tts, self._kiosk_tts = self._kiosk_tts, tts
+                self._tts_pool.release(tts)
+        except Exception as e:
+            LOG.exception(f"Failed to start kiosk demo loop: {e}")
+        finally:
+            self._kiosk_starting = False
+            self._runner.notify(KIOSK_TASK)
+
+    def _advance_demo(self, session: DemoSession) -> Optional[float]:
+        """
+        Advance a demo as far as possible without blocking. Called by
+        `self._runner` when a bus event for the session is received or a
+        previously returned deadline passes.
+        :param session: DemoSession to advance
+        :returns: monotonic time to advance the demo again, None if finished
+        """
+        while True:
             try:
-                self._speak_prompt(prompt, prompter, tts)
-                if self._active_demos[user].is_set():
-                    # Check to stop before executing the prompt
-                    break
-                LOG.info(message.context['user_profiles'][0]['units']['measure'])
-                message.data = {"lang": lang,
-                                "utterances": [prompt.lower()]}
-                self._send_prompt(message)
+                if session.state == DemoState.FINISHED:
+                    return None
+                if session.stopped.is_set():
+                    return self._finish_demo(session)
+                now = monotonic()
+                state = session.state
+                if state == DemoState.WAIT_AUDIO:
+                    # Wait for the intro to be spoken before the first prompt
+                    if not session.audio_output_done.is_set() and \
+                            now < session.deadline:
+                        return session.deadline
+                    self._next_prompt(session)
+                elif state == DemoState.SYNTHESIZING:
+                    future = session.audio_future
+                    if future and not future.done() and now < session.deadline:
+                        return session.deadline
+                    wav_file = None
+                    if future and future.done():
+                        try:
+                            wav_file = future.result()
+                        except Exception as e:
+                            LOG.error(f"Failed to synthesize prompt: {e}")
+                    if session.audio_playing:
+                        # Don't play over a response to an earlier step
+                        # that didn't wait for audio
+                        if now < session.deadline:
+                            return session.deadline
+                        LOG.warning("Timed out waiting for audio to end")
+                        session.audio_playing = 0
+                    if session.chunk == 0:
+                        self._mark(session, SYNTHESIS_READY)
+                        self._mark(session, PLAYBACK_START)
+                    # If a chunk failed, the rest of the prompt is spoken
+                    prompt = session.synthesizer.get_remaining(
+                        session.index, session.chunk) if \
+                        session.synthesizer else session.prompt
+                    session.playback = self._speak_prompt(
+                        session, prompt, session.prompter, wav_file)
+                    if session.playback:
+                        self._watch_playback(session, session.playback)
+                    session.state = DemoState.PLAYING if session.playback \
+                        else DemoState.SPEAKING
+                    session.deadline = now + self.speak_timeout
+                elif state == DemoState.PLAYING:
+                    if session.playback.poll() is None and \
+                            now < session.deadline:
+                        # Notified when the playback process exits
+                        return session.deadline
+                    self._stop_playback(session)
+                    session.playback = None
+                    if session.chunk + 1 < len(
+                            session.synthesizer.get_chunks(session.index)):
+                        # Play the next chunk of the prompt
+                        session.chunk += 1
+                        self._queue_audio(session)
+                        continue
+                    self._mark(session, PLAYBACK_END)
+                    self._start_handling(session)
+                elif state == DemoState.SPEAKING:
+                    if not session.audio_output_done.is_set():
+                        if now < session.deadline:
+                            return session.deadline
+                        LOG.error(f"Timed out speaking: {session.prompt}")
+                    self._mark(session, PLAYBACK_END)
+                    self._start_handling(session)
+                elif state == DemoState.HANDLING:
+                    if not session.prompt_handled.is_set():
+                        if now < session.deadline:
+                            return session.deadline
+                        LOG.error(f"Handler not completed for: "
+                                  f"{session.prompt}")
+                        if session.timing:
+                            session.timing.record_timeout(session.prompt,
+                                                          HANDLER)
+                    elif session.last_response:
+                        self._update_profile(session, session.last_response)
+                    session.outcome = self._get_outcome(session)
+                    if not session.step.wait_for_audio:
+                        # Continue without waiting for the response audio
+                        self._record_step_timing(session)
+                        self._next_prompt(session)
+                        continue
+                    session.state = DemoState.RESPONDING
+                    session.deadline = now + self._get_timeout(
+                        session, SPEECH, self.speak_timeout)
+                elif state == DemoState.RESPONDING:
+                    if session.audio_output_done.is_set():
+                        # Wait briefly for anything not yet in the audio
+                        # queue, unless all expected responses were spoken
+                        session.state = DemoState.SETTLING
+                        session.deadline = now + self._get_settle_time(session)
+                    elif now < session.deadline:
+                        return session.deadline
+                    else:
+                        LOG.error(f"Timed out waiting")
+                        if session.timing:
+                            session.timing.record_timeout(session.prompt,
+                                                          SPEECH)
+                        self._next_prompt(session)
+                elif state == DemoState.SETTLING:
+                    if not session.audio_output_done.is_set():
+                        # Another response started speaking
+                        session.state = DemoState.RESPONDING
+                        session.deadline = now + self.speak_timeout
+                    elif now < session.deadline:
+                        return session.deadline
+                    else:
+                        self._record_step_timing(session)
+                        self._next_prompt(session)
             except Exception as e:
                 LOG.exception(e)
+                if session.state == DemoState.FINISHED:
+                    return None
+                try:
+                    # Continue with the next prompt, as if it timed out
+                    self._next_prompt(session)
+                except Exception as e:
+                    LOG.exception(f"Failed to continue demo: {e}")
+                    return self._finish_demo(session)
+
+    @staticmethod
+    def _update_profile(session: DemoSession, response: Message):
+        """
+        Apply profile changes made by a skill handling a demo prompt so they
+        are sent with following prompts.
+        :param session: DemoSession the prompt was sent for
+        :param response: `mycroft.skill.handler.complete` Message
+        """
+        profiles = response.context.get('user_profiles')
+        if profiles and session.profile.update(profiles[0]):
+            session.prompt_message.context['user_profiles'] = \
+                [session.profile.materialize()]
+
+    def _start_handling(self, session: DemoSession):
+        """
+        Send the current prompt to skills and wait for it to be handled.
+        :param session: DemoSession to advance
+        """
+        # Responses are tagged with the step so late audio from a step that
+        # didn't wait for it is not attributed to the next one
+        message = Message(session.prompt_message.msg_type,
+                          {"lang": session.lang,
+                           "utterances": [session.prompt.lower()]},
+                          {**session.prompt_message.context,
+                           DEMO_STEP_KEY: session.step_number})
+        session.state = DemoState.HANDLING
+        session.emitted_at = monotonic()
+        session.handled_at = None
+        session.audio_segments = 0
+        session.deadline = session.emitted_at + (
+            session.step.max_latency or
+            self._get_timeout(session, HANDLER, self.intent_timeout))
+        self._send_prompt(session, message)
+
+    @staticmethod
+    def _get_outcome(session: DemoSession) -> str:
+        """
+        Determine the outcome of the current step once it was handled or
+        timed out.
+        :param session: DemoSession to check
+        :returns: one of HANDLED, UNEXPECTED, ERROR, or TIMEOUT
+        """
+        return get_step_outcome(session.step, session.prompt_handled.is_set(),
+                                session.last_response)
+
+    @staticmethod
+    def _get_timeout(session: DemoSession, kind: str,
+                     default: float) -> float:
+        """
+        Get the timeout for the current step of a demo.
+        :param session: DemoSession to get a timeout for
+        :param kind: HANDLER or SPEECH
+        :param default: configured timeout to use without learned timing
+        :returns: timeout in seconds
+        """
+        if not session.timing:
+            return default
+        return session.timing.get_timeout(session.prompt, kind, default)
 
-        self.speak_dialog("finished_demo", message=original_message)
-        self._active_demos.pop(user)
-
-    def _get_demo_file(self):
-        """
-        Helper method for resolving a skill resource file in priority order:
-        1. Absolute Path
-        2. Skill File System Path
-        3. User-defined skill resource
-            ({XDG_DATA_HOME}/resources/skill-demo.neongeckocom/{lang})
-        4. Skill resource ({skill.base_dir}/locale/{lang})
-        """
-        if isfile(expanduser(self.demo_filename)):
-            return expanduser(self.demo_filename)
-        if self.file_system.exists(self.demo_filename):
-            return join(self.file_system.path, self.demo_filename)
-        root_dir = join(self._data_path, "resources", self.skill_id)
-        user_resource = find_resource(self.demo_filename, root_dir,
-                                      None, self.lang)
-        if user_resource:
-            return user_resource
-        skill_resource = self.find_resource(self.demo_filename)
-        if skill_resource:
-            return skill_resource
-
-    def _send_prompt(self, message: Message):
-        """
-        Send a message to skill processing and wait for it to be handled
+    def _get_settle_time(self, session: DemoSession) -> float:
+        """
+        Get the time to wait for more responses after audio output ends. No
+        wait is needed once the number of responses this prompt has
+        consistently produced were spoken.
+        :param session: DemoSession to get settle time for
+        :returns: settle time in seconds
+        """
+        if session.timing:
+            expected = session.timing.get_expected_segments(session.prompt)
+            if expected and session.audio_segments >= expected:
+                return 0.0
+        return self._settle_time
+
+    @staticmethod
+    def _record_step_timing(session: DemoSession):
+        """
+        Record how long the current step took to be handled and spoken.
+        :param session: DemoSession that completed a step
+        """
+        if not session.timing or session.handled_at is None:
+            return
+        session.timing.record(session.prompt, HANDLER,
+                              session.handled_at - session.emitted_at)
+        if session.audio_ended_at and \
+                session.audio_ended_at > session.handled_at:
+            session.timing.record(session.prompt, SPEECH,
+                                  session.audio_ended_at - session.handled_at)
+        session.timing.record_segments(session.prompt,
+                                       session.audio_segments)
+
+    def _get_timing_model(self, demo_file: str) -> StepTimingModel:
+        """
+        Get the shared timing model for a demo file.
+        :param demo_file: path to a demo file
+        :returns: StepTimingModel for `demo_file`
+        """
+        timing_file = get_timing_file(
+            demo_file, join(self._data_path, "cache", self.skill_id, "timing"),
+            self.root_dir)
+        if timing_file not in self._timing_models:
+            self._timing_models[timing_file] = StepTimingModel(timing_file)
+        return self._timing_models[timing_file]
+
+    def _next_prompt(self, session: DemoSession):
+        """
+        Move a demo on to its next prompt, or finish it if there are no more.
+        :param session: DemoSession to advance
+        """
+        self._emit_step_metrics(session)
+        next_index = session.script.get_next_index(
+            session.index, session.outcome) if session.script else None
+        if session.synthesizer and session.index >= 0:
+            # Remove audio for the prompt that was just played
+            session.synthesizer.release(session.index)
+        if next_index is None or session.stopped.is_set():
+            self._finish_demo(session)
+            return
+        session.index = next_index
+        session.step_number += 1
+        session.outcome = None
+        session.emitted_at = None
+        session.handled_at = None
+        if self.record_metrics or self.record_history:
+            session.timeline = StepTimeline(session.session_id, session.index,
+                                            session.prompt, session.lang)
+        session.chunk = 0
+        self._queue_audio(session)
+
+    def _queue_audio(self, session: DemoSession):
+        """
+        Wait for audio of the current prompt chunk to be rendered.
+        :param session: DemoSession to get audio for
+        """
+        session.audio_future = session.synthesizer.get_future(
+            session.index, session.chunk) if session.synthesizer else None
+        if session.audio_future:
+            session.audio_future.add_done_callback(
+                lambda _: self._runner.notify(session.session_id))
+        session.state = DemoState.SYNTHESIZING
+        session.deadline = monotonic() + self.speak_timeout
+
+    @staticmethod
+    def _mark(session: DemoSession, event: str):
+        """
+        Record an event in the current step's timeline, if metrics are on.
+        :param session: DemoSession the event occurred in
+        :param event: name of the timeline event
+        """
+        if session.timeline:
+            session.timeline.mark(event)
+
+    def _emit_step_metrics(self, session: DemoSession):
+        """
+        Emit and log metrics for the current step of a demo.
+        :param session: DemoSession that completed (or stopped) a step
+        """
+        timeline = session.timeline
+        if not timeline:
+            return
+        session.timeline = None
+        if session.emitted_at:
+            timeline.mark(PROMPT_EMITTED, session.emitted_at)
+            if session.audio_ended_at and \
+                    session.audio_ended_at > session.emitted_at:
+                timeline.mark(AUDIO_END, session.audio_ended_at)
+        if session.handled_at:
+            timeline.mark(PROMPT_HANDLED, session.handled_at)
+        if session.synthesizer:
+            timeline.data.update(
+                session.synthesizer.timings.get(timeline.index, dict()))
+        timeline.data["outcome"] = session.outcome
+        timeline.data["skill_id"] = session.last_response.context.get(
+            "skill_id") if session.last_response else None
+        timeline.data["expect_skill"] = session.step.expect_skill if \
+            session.step else None
+        timeline.data["stopped"] = session.stopped.is_set()
+        record = timeline.as_dict()
+        if self.record_history:
+            session.step_records.append(record)
+        if self.record_metrics:
+            self.bus.emit(session.message.forward(METRICS_MSG_TYPE, record))
+            Thread(target=self._metrics_log.write, args=(record,),
+                   daemon=True, name="demo_metrics").start()
+
+    def _finish_demo(self, session: DemoSession) -> None:
+        """
+        Release resources used by a demo and notify the user it is finished.
+        :param session: DemoSession to finish
+        """
+        session.state = DemoState.FINISHED
+        try:
+            self._stop_playback(session)
+            self._emit_step_metrics(session)
+            if session.synthesizer:
+                session.synthesizer.shutdown()
+            self._tts_pool.release(session.tts)
+            if session.timing:
+                Thread(target=session.timing.save, daemon=True,
+                       name="demo_timing").start()
+            if self.record_history and session.step_records:
+                self._save_run(session)
+            self.speak_dialog("finished_demo", message=session.message)
+        finally:
+            # The session is always released, even if cleanup failed
+            self._active_demos.remove(session)
+            session.finished.set()
+            if session is self._kiosk_session:
+                self._runner.notify(KIOSK_TASK)
+        return None
+
+    def _save_run(self, session: DemoSession):
+        """
+        Store a finished demo in the run history without blocking the runner.
+        :param session: DemoSession that finished
+        """
+        run = {"session_id": session.session_id,
+               "version": __version__,
+               "lang": session.lang,
+               "demo_file": session.script.path if session.script else None,
+               "started": session.started_at,
+               "duration": round(time() - session.started_at, 3),
+               "stopped": session.stopped.is_set()}
+        Thread(target=self._history.add_run, args=(run, session.step_records),
+               daemon=True, name="demo_history").start()
+
+    def get_history_report(self, limit: int = 10,
+                           version: Optional[str] = None) -> dict:
+        """
+        Get aggregate performance of past demo runs: the slowest prompts,
+        timeout rates by skill, and trends across skill versions.
+        :param limit: max number of prompts to list as slowest
+        :param version: only aggregate prompts and skills for this version
+        :returns: dict report
+        """
+        return self._history.get_report(limit, version)
+
+    def _handle_history_report(self, message: Message):
+        report = self.get_history_report(message.data.get("limit", 10),
+                                         message.data.get("version"))
+        self.bus.emit(message.response(report))
+
+    def _cancel_demo(self, session: DemoSession):
+        """
+        Interrupt work in progress for a stopped demo without waiting for
+        `self._runner` to advance it. Called on the thread stopping the demo.
+        :param session: DemoSession that was stopped
+        """
+        self._stop_playback(session)
+        if session.synthesizer:
+            # Abandon pending and in-flight synthesis
+            session.synthesizer.shutdown()
+        if session.state == DemoState.SPEAKING:
+            self.bus.emit(session.message.forward("mycroft.audio.speech.stop"))
+        self._runner.notify(session.session_id)
+
+    def _watch_playback(self, session: DemoSession, playback: Popen):
+        """
+        Advance a demo when its playback process exits. All playback is
+        watched by one shared thread rather than polled from `self._runner`.
+        :param session: DemoSession the prompt is played for
+        :param playback: playback process to watch
+        """
+        self._playback_watcher.watch(
+            playback, lambda: self._runner.notify(session.session_id))
+
+    def _stop_playback(self, session: DemoSession):
+        """
+        Stop a prompt being played by the skill, if any.
+        :param session: DemoSession to stop playback for
+        """
+        playback = session.playback
+        if not playback or playback.poll() is not None:
+            return
+        playback.terminate()
+        try:
+            playback.wait(self._terminate_timeout)
+        except TimeoutExpired:
+            playback.kill()
+
+    def _get_demo_lang(self, message: Message,
+                       prefs: Optional[dict] = None) -> str:
+        """
+        Get the language to show a demo in. The language of the request is
+        used if a demo is available in it, else the user's language, else
+        the configured default language.
+        :param message: Message requesting the demo
+        :param prefs: user preferences associated with `message`
+        :returns: language code of the demo
+        """
+        prefs = prefs or get_user_prefs(message)
+        requested = (message.data.get("lang"), message.context.get("lang"),
+                     (prefs.get("speech") or dict()).get("stt_language"))
+        available = get_demo_langs(self.root_dir)
+        for lang in filter(None, requested):
+            lang = lang.lower()
+            if lang in available:
+                return lang
+            # Match i.e. `uk` to `uk-ua`
+            for demo_lang in available:
+                if demo_lang.split('-')[0] == lang.split('-')[0]:
+                    return demo_lang
+        return self.core_lang
+
+    def _get_demo_script(self, lang: str = None) -> Optional[DemoScript]:
+        """
+        Get the compiled demo script for the configured demo file. Scripts
+        are cached and only resolved and parsed again if the file changes.
+        :param lang: language of the demo (default self.lang)
+        """
+        return self._scripts.get(self.demo_filename, lang or self.lang)
+
+    def _send_prompt(self, session: DemoSession, message: Message):
+        """
+        Send a message to skill processing. The demo advances when the
+        prompt is handled or `intent_timeout` expires.
+        :param session: DemoSession the prompt is sent for
         :param message: Message to emit to skills
         """
-        self._audio_output_done.clear()  # Clear to wait for this response
-        self._prompt_handled.clear()
+        session.audio_output_done.clear()  # Clear to wait for this response
+        session.prompt_handled.clear()
+        session.last_response = None
         self.bus.emit(message)
-        self._prompt_handled.wait(self.intent_timeout)
-        if not self._prompt_handled.is_set():
-            LOG.error(f"Handler not completed for: "
-                      f"{message.data.get('utterances')}")
-        else:
-            message.context['user_profiles'] = \
-                self._last_response.context['user_profiles']
-        if not self._audio_output_done.wait(self.speak_timeout):
-            LOG.error(f"Timed out waiting")
-        else:
-            sleep(0.5)
-            # Wait for anything not yet in the audio queue
-            wait_for_signal_clear("isSpeaking", self.speak_timeout)
 
-    def _speak_prompt(self, prompt: str, prompter: dict, tts: Optional[TTS]):
+    def _speak_prompt(self, session: DemoSession, prompt: str, prompter: dict,
+                      wav_file: Optional[str] = None) -> Optional[Popen]:
         """
-        Speak the prompt in a user's voice and wait for playback to end
+        Start speaking the prompt in a user's voice
+        :param session: DemoSession the prompt is spoken for
         :param prompt: User request to speak that will be emitted to skills
         :param prompter: Speaker config to use for spoken prompts
+        :param wav_file: Audio rendered by skill-managed TTS, if available
+        :returns: playback process if `wav_file` is played by the skill
         """
-        self._audio_output_done.wait(self.speak_timeout)
-        if tts:
-            # If available, use skill-managed TTS
-            _, output_file = mkstemp()
-            wav_file, _ = tts.get_tts(prompt, output_file)
-            play_audio(wav_file,
-                       self.config_core.get("play_wav_cmdline")).wait(
-                self.speak_timeout)
-        else:
-            # Else fallback to audio module (probably same voice
-            self.speak(prompt, speaker=prompter)
-            self._audio_output_done.wait(self.speak_timeout)
+        if wav_file:
+            # If available, use audio rendered by skill-managed TTS
+            from ovos_utils.sound import play_audio
+            return play_audio(wav_file,
+                              self.config_core.get("play_wav_cmdline"))
+        # Else fallback to audio module (probably same voice
+        session.audio_output_done.clear()
+        self.speak(prompt, speaker=prompter, message=session.message)
+        return None
 
-    def _get_demo_tts(self, lang: str = None) -> Optional[TTS]:
+    def _is_streaming(self, tts: TTS) -> bool:
         """
-        Create a TTS plugin instance to
+        Check if prompts should be rendered and played in chunks. Batched
+        prompts are rendered whole.
+        :param tts: TTS plugin instance used to render prompts
         """
-        from ovos_plugin_manager.tts import OVOSTTSFactory
+        return self.stream_prompts and can_stream(tts) and \
+            not self._is_batching(tts)
 
+    def _is_batching(self, tts: TTS) -> bool:
+        """
+        Check if prompts should be rendered in one batch.
+        :param tts: TTS plugin instance used to render prompts
+        """
+        return self.batch_synthesis and can_batch(tts)
+
+    def _get_demo_tts(self, lang: str = None) -> Optional[TTS]:
+        """
+        Get a TTS plugin instance to speak demo prompts with. Instances are
+        pooled and reused across demos; callers should release the returned
+        instance to `self._tts_pool` when done with it.
+        :param lang: language of the demo (default self.lang)
+        """
         # Get TTS config with lang and module overrides from skill
         config = dict(self.config_core.get('tts'))
         config['module'] = self.demo_tts_plugin
         config['lang'] = lang or self.lang
+        return self._tts_pool.acquire(
+            config, self.config_core["tts"].get("fallback_module"))
 
-        try:
-            LOG.debug(f'Creating TTS with config={config}')
-            return OVOSTTSFactory.create(config)
-        except Exception as e:
-            LOG.error(f"Failed to load TTS Plugin: {self.demo_tts_plugin}")
-            LOG.error(e)
-        try:
-            config['module'] = self.config_core["tts"].get("fallback_module")
-            LOG.info(f"Trying with configured fallback_module {config['module']}")
-            return OVOSTTSFactory.create(config)
-        except Exception as e:
-            LOG.error(f"Failed to load TTS Plugin: {self.demo_tts_plugin}")
-            LOG.error(e)
-        return None
+    def shutdown(self):
+        self._shutdown_event.set()
+        self.stop_kiosk()
+        self._runner.shutdown()
+        self._playback_watcher.shutdown()
+        self._tts_pool.shutdown()
+        if self._audio_cache:
+            self._audio_cache.flush()
+        AudioBuffer.clear_all(self._audio_buffer_dir)
 
     def stop(self):
         try:
             user = get_message_user(dig_for_message())
         except ValueError:
             user = None
-        if user and user in self._active_demos:
+        if not user:
+            return
+        for session in self._active_demos.get_user_sessions(user):
             LOG.info(f"{user} requested stop")
-            self._active_demos[user].set()
-            self._prompt_handled.set()
+            session.stop()
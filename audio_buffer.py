@@ -0,0 +1,114 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from os import makedirs, remove
+from os.path import join
+from shutil import rmtree
+from tempfile import gettempdir, mkdtemp
+from threading import Lock
+from typing import Optional, Set
+
+from ovos_utils.log import LOG
+
+
+def get_audio_buffer_dir(skill_id: str) -> str:
+    """
+    Get the scratch directory prompt audio is rendered into before it is
+    cached or played. This is under the system temp directory, which is
+    memory-backed on most devices.
+    :param skill_id: skill_id of the demo skill
+    :returns: path to the audio scratch directory
+    """
+    return join(gettempdir(), "neon", skill_id, "prompt_audio")
+
+
+class AudioBuffer:
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Scratch space for rendered prompt audio. Paths are allocated without
+        opening files, so no file handles are held, and files are removed
+        when released or when the buffer is cleared.
+        :param directory: directory to write audio in (default a new temp dir)
+        """
+        if directory:
+            makedirs(directory, mode=0o700, exist_ok=True)
+        self.directory = directory or mkdtemp(prefix="neon_demo_")
+        self._files: Set[str] = set()
+        self._count = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, path: str):
+        return path in self._files
+
+    def allocate(self, suffix: str = ".wav") -> str:
+        """
+        Get a new path in the buffer for a TTS plugin to write audio to.
+        :param suffix: file extension of the audio
+        :returns: path to write audio to
+        """
+        with self._lock:
+            self._count += 1
+            path = join(self.directory, f"{self._count}{suffix}")
+            self._files.add(path)
+        return path
+
+    def release(self, path: Optional[str]):
+        """
+        Remove a file allocated by this buffer. Paths not allocated by this
+        buffer, i.e. cached audio, are left in place.
+        :param path: path returned by `allocate`
+        """
+        with self._lock:
+            if path not in self._files:
+                return
+            self._files.remove(path)
+        try:
+            remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            LOG.warning(f"Failed to remove {path}: {e}")
+
+    def clear(self):
+        """
+        Remove all audio in the buffer and the buffer directory.
+        """
+        with self._lock:
+            self._files.clear()
+        rmtree(self.directory, ignore_errors=True)
+
+    @staticmethod
+    def clear_all(directory: str):
+        """
+        Remove buffers left in `directory`, i.e. after an unclean shutdown.
+        :param directory: parent directory of session buffers
+        """
+        rmtree(directory, ignore_errors=True)
@@ -0,0 +1,191 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from hashlib import sha256
+from os import makedirs, remove, replace
+from os.path import getsize, isfile, join, splitext
+from shutil import copyfile
+from threading import RLock
+from time import time
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+
+def get_audio_cache_dir(data_path: str, skill_id: str) -> str:
+    """
+    Get the directory synthesized prompt audio is cached in.
+    :param data_path: XDG data path to cache audio under
+    :param skill_id: skill_id of the demo skill
+    :returns: path to the prompt audio cache directory
+    """
+    return join(data_path, "cache", skill_id, "prompt_audio")
+
+
+class PromptAudioCache:
+    def __init__(self, cache_dir: str, max_size: int = 100 * 1024 * 1024,
+                 save_interval: float = 60.0, hold_time: float = 0.0):
+        """
+        Content-addressed, size-bounded cache of synthesized prompt audio.
+        Entries are evicted least recently used first and the index is
+        persisted so cached audio is reused across restarts.
+        :param cache_dir: directory to store cached audio and index in
+        :param max_size: max total size of cached audio in bytes
+        :param save_interval: min seconds between index writes for reads;
+            changes from `put` are always written immediately
+        :param hold_time: seconds after an entry is returned during which it
+            is not evicted, so audio handed to a playing demo isn't removed
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.save_interval = save_interval
+        self.hold_time = hold_time
+        self._index_file = join(cache_dir, "index.json")
+        self._lock = RLock()
+        makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._dirty = False
+        self._saved_at = time()
+
+    @staticmethod
+    def get_key(prompt: str, lang: str, module: str,
+                voice: Optional[str] = None) -> str:
+        """
+        Build a cache key for the given prompt and TTS spec.
+        :param prompt: text being synthesized
+        :param lang: language of the prompt
+        :param module: TTS plugin used to synthesize the prompt
+        :param voice: TTS voice used to synthesize the prompt
+        :returns: hex digest uniquely identifying the rendered audio
+        """
+        spec = json.dumps([prompt, lang.lower(), module, voice])
+        return sha256(spec.encode('utf-8')).hexdigest()
+
+    @property
+    def size(self) -> int:
+        """
+        Total size in bytes of cached audio.
+        """
+        with self._lock:
+            return sum(e['size'] for e in self._index.values())
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get cached audio for the specified key.
+        :param key: cache key returned by `get_key`
+        :returns: path to cached audio if available, else None
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry:
+                return None
+            path = join(self.cache_dir, entry['file'])
+            if not isfile(path):
+                LOG.warning(f"Cached audio removed: {path}")
+                self._index.pop(key)
+                self._save_index()
+                return None
+            entry['last_used'] = time()
+            # Access times only affect eviction order; don't write the index
+            # on every hit
+            self._dirty = True
+            if entry['last_used'] - self._saved_at >= self.save_interval:
+                self._save_index()
+            return path
+
+    def put(self, key: str, audio_file: str) -> str:
+        """
+        Add a rendered audio file to the cache.
+        :param key: cache key returned by `get_key`
+        :param audio_file: path to rendered audio to copy into the cache
+        :returns: path to the cached copy of `audio_file`
+        """
+        filename = f"{key}{splitext(audio_file)[1] or '.wav'}"
+        path = join(self.cache_dir, filename)
+        with self._lock:
+            if audio_file != path:
+                copyfile(audio_file, f"{path}.tmp")
+                replace(f"{path}.tmp", path)
+            self._index[key] = {"file": filename,
+                                "size": getsize(path),
+                                "last_used": time()}
+            self._evict(keep=key)
+            self._save_index()
+        return path
+
+    def flush(self):
+        """
+        Write access times not yet persisted to the index.
+        """
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _evict(self, keep: str):
+        """
+        Remove least recently used entries until the cache fits `max_size`.
+        Entries used within `hold_time` are kept since they may be playing.
+        :param keep: key to keep in the cache even if it exceeds `max_size`
+        """
+        total = self.size
+        held_since = time() - self.hold_time
+        for key, entry in sorted(self._index.items(),
+                                 key=lambda e: e[1]['last_used']):
+            if total <= self.max_size:
+                break
+            if key == keep or entry['last_used'] > held_since:
+                continue
+            self._index.pop(key)
+            total -= entry['size']
+            try:
+                remove(join(self.cache_dir, entry['file']))
+            except FileNotFoundError:
+                pass
+            LOG.debug(f"Evicted cached audio: {entry['file']}")
+
+    def _load_index(self) -> dict:
+        if not isfile(self._index_file):
+            return dict()
+        try:
+            with open(self._index_file) as f:
+                index = json.load(f)
+        except Exception as e:
+            LOG.error(f"Failed to load audio cache index: {e}")
+            return dict()
+        return {key: entry for key, entry in index.items()
+                if isfile(join(self.cache_dir, entry['file']))}
+
+    def _save_index(self):
+        tmp_file = f"{self._index_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self._index, f)
+        replace(tmp_file, self._index_file)
+        self._dirty = False
+        self._saved_at = time()
@@ -0,0 +1,105 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Any, Dict, Optional
+
+
+class OverlayProfile:
+    def __init__(self, base: dict,
+                 overrides: Optional[Dict[str, dict]] = None):
+        """
+        User profile made of a shared base profile with changes layered on
+        top. The base profile is never copied or modified; sections are
+        merged only when the profile is materialized to send on the bus.
+        :param base: user profile (section -> key -> value) to read from
+        :param overrides: changes to `base` by section, i.e.
+            {"units": {"measure": "imperial"}}
+        """
+        self._base = base
+        self._overrides: Dict[str, dict] = dict()
+        self._materialized: Optional[dict] = None
+        for section, values in (overrides or dict()).items():
+            for key, value in values.items():
+                self.set(section, key, value)
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        """
+        Get a value from the profile.
+        :param section: profile section, i.e. `user` or `units`
+        :param key: key within `section`
+        :param default: value to return if `key` is not set
+        :returns: overridden value, else the base value, else `default`
+        """
+        overrides = self._overrides.get(section)
+        if overrides and key in overrides:
+            return overrides[key]
+        return (self._base.get(section) or dict()).get(key, default)
+
+    def set(self, section: str, key: str, value: Any):
+        """
+        Override a value in the profile.
+        :param section: profile section, i.e. `user` or `units`
+        :param key: key within `section`
+        :param value: new value
+        """
+        self._overrides.setdefault(section, dict())[key] = value
+        self._materialized = None
+
+    def update(self, profile: Optional[dict]) -> bool:
+        """
+        Apply changes from a profile returned by a skill, i.e. in the context
+        of `mycroft.skill.handler.complete`. Only values that differ from
+        this profile are kept.
+        :param profile: user profile, as materialized by this object
+        :returns: True if the profile changed
+        """
+        if not profile or profile is self._materialized:
+            return False
+        changed = False
+        for section, values in profile.items():
+            if not isinstance(values, dict):
+                continue
+            for key, value in values.items():
+                if self.get(section, key) != value:
+                    self.set(section, key, value)
+                    changed = True
+        return changed
+
+    def materialize(self) -> dict:
+        """
+        Get this profile as a dict to send on the bus. The result is reused
+        until the profile changes and must not be modified.
+        :returns: user profile dict
+        """
+        if self._materialized is None:
+            profile = dict(self._base)
+            for section, overrides in self._overrides.items():
+                profile[section] = {**(self._base.get(section) or dict()),
+                                    **overrides}
+            self._materialized = profile
+        return self._materialized
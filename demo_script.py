@@ -0,0 +1,269 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import yaml
+
+from os import stat
+from os.path import expanduser, isfile, join, splitext
+from threading import Lock
+from time import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from ovos_utils.log import LOG
+from neon_utils.file_utils import load_commented_file
+from ovos_workshop.resource_files import find_resource
+
+
+def resolve_demo_file(filename: str, lang: str, skill_id: str,
+                      skill_dir: str, data_path: str,
+                      file_system_path: Optional[str] = None) -> \
+        Optional[str]:
+    """
+    Resolve a demo resource file in priority order:
+    1. Absolute Path
+    2. Skill File System Path
+    3. User-defined skill resource
+        ({XDG_DATA_HOME}/resources/skill-demo.neongeckocom/{lang})
+    4. Skill resource ({skill.base_dir}/locale/{lang})
+    :param filename: name of the demo text resource file (with extension)
+    :param lang: language of the demo to resolve
+    :param skill_id: skill_id used to locate user-defined resources
+    :param skill_dir: skill base directory containing `locale`
+    :param data_path: XDG data path containing user-defined resources
+    :param file_system_path: path of the skill's file system, if available
+    :returns: path to the resolved demo file, else None
+    """
+    if isfile(expanduser(filename)):
+        return expanduser(filename)
+    if file_system_path and isfile(join(file_system_path, filename)):
+        return join(file_system_path, filename)
+    root_dir = join(data_path, "resources", skill_id)
+    user_resource = find_resource(filename, root_dir, None, lang)
+    if user_resource:
+        return str(user_resource)
+    skill_resource = find_resource(filename, skill_dir, None, lang)
+    if skill_resource:
+        return str(skill_resource)
+
+
+def load_demo_prompts(demo_file: str) -> List[str]:
+    """
+    Read the prompts defined in a demo file. Whitespace is normalized and
+    blank lines are skipped.
+    :param demo_file: path to a demo text file
+    :returns: list of prompts in the order they should be spoken
+    """
+    prompts = (' '.join(line.split()) for line in
+               load_commented_file(demo_file).split('\n'))
+    return [prompt for prompt in prompts if prompt]
+
+
+# Outcomes of a handled step that may be used to branch to another step
+HANDLED = "handled"
+UNEXPECTED = "unexpected"
+ERROR = "error"
+TIMEOUT = "timeout"
+OUTCOMES = (HANDLED, UNEXPECTED, ERROR, TIMEOUT)
+# Branch target that ends the demo
+END = "end"
+
+
+class DemoStep:
+    def __init__(self, prompt: str, step_id: Optional[str] = None,
+                 expect_skill: Optional[str] = None,
+                 max_latency: Optional[float] = None,
+                 wait_for_audio: bool = True,
+                 next_steps: Optional[Dict[str, str]] = None):
+        """
+        A single prompt in a demo script.
+        :param prompt: utterance to speak and send to skills
+        :param step_id: optional unique ID other steps may branch to
+        :param expect_skill: skill_id expected to handle the prompt
+        :param max_latency: max seconds to wait for the prompt to be handled
+        :param wait_for_audio: if False, continue as soon as the prompt is
+            handled without waiting for the response to be spoken
+        :param next_steps: dict of outcome to the ID of the step to continue
+            with (or `END`); unspecified outcomes continue with the next step
+        """
+        self.prompt = prompt
+        self.step_id = step_id
+        self.expect_skill = expect_skill
+        self.max_latency = max_latency
+        self.wait_for_audio = wait_for_audio
+        self.next_steps = next_steps or dict()
+
+    def __eq__(self, other):
+        return isinstance(other, DemoStep) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"DemoStep({self.step_id or self.prompt!r})"
+
+    @classmethod
+    def from_dict(cls, step: Union[str, dict]) -> 'DemoStep':
+        """
+        Parse a step from a structured demo script.
+        :param step: prompt string or dict step definition
+        :returns: parsed DemoStep
+        """
+        if isinstance(step, str):
+            step = {"prompt": step}
+        if not isinstance(step, dict) or not step.get("prompt"):
+            raise ValueError(f"Step requires a prompt: {step}")
+        next_steps = step.get("next") or dict()
+        invalid = [o for o in next_steps if o not in OUTCOMES]
+        if invalid:
+            raise ValueError(f"Invalid outcomes {invalid} in step: {step}")
+        max_latency = step.get("max_latency")
+        return cls(prompt=' '.join(str(step["prompt"]).split()),
+                   step_id=step.get("id"),
+                   expect_skill=step.get("expect_skill"),
+                   max_latency=float(max_latency) if max_latency else None,
+                   wait_for_audio=step.get("wait_for_audio", True),
+                   next_steps={o: str(t) for o, t in next_steps.items()})
+
+
+def load_demo_steps(demo_file: str) -> Tuple[List[DemoStep], dict]:
+    """
+    Read the steps defined in a demo file. `.yaml`, `.yml` and `.json` files
+    are read as structured scripts; any other file is read as a plain list of
+    prompts.
+    :param demo_file: path to a demo file
+    :returns: list of steps and a dict of script metadata
+    """
+    ext = splitext(demo_file)[1].lower()
+    if ext not in (".yaml", ".yml", ".json"):
+        return [DemoStep(p) for p in load_demo_prompts(demo_file)], dict()
+    with open(demo_file) as f:
+        script = json.load(f) if ext == ".json" else yaml.safe_load(f)
+    if not isinstance(script, dict) or \
+            not isinstance(script.get("steps"), list):
+        raise ValueError(f"Demo script requires a list of steps: {demo_file}")
+    steps = [DemoStep.from_dict(step) for step in script.pop("steps")]
+    step_ids = [step.step_id for step in steps if step.step_id]
+    if len(step_ids) != len(set(step_ids)):
+        raise ValueError(f"Duplicate step IDs in: {demo_file}")
+    for step in steps:
+        for target in step.next_steps.values():
+            if target != END and target not in step_ids:
+                raise ValueError(f"{step} branches to unknown step: {target}")
+    return steps, script
+
+
+def _get_file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class DemoScript:
+    def __init__(self, path: str, lang: str):
+        """
+        Compiled representation of a demo file.
+        :param path: path to the demo file
+        :param lang: language the demo file was resolved for
+        """
+        self.path = path
+        self.lang = lang
+        self.signature = _get_file_signature(path)
+        steps, self.metadata = load_demo_steps(path)
+        self.steps: Tuple[DemoStep, ...] = tuple(steps)
+        self.prompts: Tuple[str, ...] = tuple(s.prompt for s in steps)
+        self._step_index = {step.step_id: idx for idx, step in
+                            enumerate(steps) if step.step_id}
+        self.compiled_at = time()
+
+    def __len__(self):
+        return len(self.steps)
+
+    def get_next_index(self, index: int, outcome: Optional[str]) -> \
+            Optional[int]:
+        """
+        Get the index of the step to continue with after a step completes.
+        :param index: index of the completed step, or -1 to start the script
+        :param outcome: outcome of the completed step
+        :returns: index of the next step, None if the demo should end
+        """
+        if index < 0:
+            return 0 if self.steps else None
+        target = self.steps[index].next_steps.get(outcome)
+        if target == END:
+            return None
+        if target:
+            return self._step_index[target]
+        return index + 1 if index + 1 < len(self.steps) else None
+
+    @property
+    def is_current(self) -> bool:
+        """
+        True if the demo file has not changed since it was compiled.
+        """
+        return self.signature is not None and \
+            _get_file_signature(self.path) == self.signature
+
+
+class DemoScriptCache:
+    def __init__(self, resolver: Callable[[str, str], Optional[str]]):
+        """
+        Cache of compiled demo scripts by filename and language. Scripts are
+        resolved and compiled once and recompiled when the resolved file's
+        inode, mtime or size changes.
+        :param resolver: callable returning the path of a demo file, given a
+            filename and lang
+        """
+        self._resolver = resolver
+        self._scripts: Dict[Tuple[str, str], DemoScript] = dict()
+        self._lock = Lock()
+
+    def get(self, filename: str, lang: str) -> Optional[DemoScript]:
+        """
+        Get the compiled demo script for a filename and language.
+        :param filename: demo file name or path
+        :param lang: language of the demo
+        :returns: compiled DemoScript, else None if no file is resolved
+        """
+        key = (filename, lang.lower())
+        with self._lock:
+            script = self._scripts.get(key)
+            if script and script.is_current:
+                return script
+            path = self._resolver(filename, lang)
+            if not path:
+                self._scripts.pop(key, None)
+                return None
+            LOG.debug(f"Compiling demo script: {path}")
+            try:
+                script = DemoScript(path, lang)
+            except Exception as e:
+                LOG.error(f"Invalid demo script {path}: {e}")
+                self._scripts.pop(key, None)
+                return None
+            self._scripts[key] = script
+            return script
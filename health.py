@@ -0,0 +1,166 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Event, Lock
+from time import monotonic
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+
+from .demo_script import DemoStep, HANDLED
+from .session import DEMO_SESSION_KEY, get_prompt_context, get_step_outcome
+
+PASS = "pass"
+FAIL = "fail"
+
+
+class _Probe:
+    def __init__(self, index: int, step: DemoStep, timeout: float):
+        self.session_id = str(uuid4())
+        self.username = f"demo_health_{index}"
+        self.index = index
+        self.step = step
+        self.timeout = step.max_latency or timeout
+        self.emitted_at: Optional[float] = None
+        self.handled: Optional[Message] = None
+        self.latency: Optional[float] = None
+
+    @property
+    def outcome(self) -> str:
+        return get_step_outcome(self.step, self.handled is not None,
+                                self.handled)
+
+    def as_dict(self) -> dict:
+        outcome = self.outcome
+        return {"index": self.index,
+                "prompt": self.step.prompt,
+                "status": PASS if outcome == HANDLED else FAIL,
+                "outcome": outcome,
+                "skill_id": self.handled.context.get("skill_id")
+                if self.handled else None,
+                "expect_skill": self.step.expect_skill,
+                "latency": self.latency,
+                "timeout": self.timeout}
+
+
+class HealthSweep:
+    def __init__(self, bus, steps: List[DemoStep], lang: str = "en-us",
+                 timeout: float = 10.0, profile: Optional[dict] = None,
+                 silent: bool = True):
+        """
+        Sends every demo prompt at once, each in its own session, to check
+        that the skills they exercise respond. A full sweep takes about as
+        long as the slowest skill.
+        :param bus: MessageBusClient (or FakeBus) to emit utterances on
+        :param steps: demo steps to send prompts for
+        :param lang: language of the prompts
+        :param timeout: seconds to wait for a prompt to be handled, unless
+            the step specifies `max_latency`
+        :param profile: optional user profile to send with prompts
+        :param silent: if True, request skills emit responses instead of
+            speaking them (supported by Neon skills)
+        """
+        self.bus = bus
+        self.lang = lang
+        self.profile = profile
+        self.silent = silent
+        self._probes: Dict[str, _Probe] = dict()
+        for idx, step in enumerate(steps):
+            probe = _Probe(idx, step, timeout)
+            self._probes[probe.session_id] = probe
+        self._lock = Lock()
+        self._pending = len(self._probes)
+        self._done = Event()
+        self._started = 0.0
+        self._finished = 0.0
+
+    def run(self) -> dict:
+        """
+        Send all prompts and wait for them to be handled or time out.
+        :returns: dict report with a result for each prompt
+        """
+        self.bus.on("mycroft.skill.handler.complete", self._on_handled)
+        self._started = monotonic()
+        try:
+            if not self._probes:
+                self._done.set()
+            for probe in self._probes.values():
+                self._emit(probe)
+            deadline = max((p.emitted_at + p.timeout
+                            for p in self._probes.values()),
+                           default=self._started)
+            self._done.wait(max(deadline - monotonic(), 0))
+        finally:
+            self.bus.remove("mycroft.skill.handler.complete",
+                            self._on_handled)
+        self._finished = monotonic()
+        return self.get_report()
+
+    def get_report(self) -> dict:
+        """
+        Get the status and latency of each prompt.
+        """
+        results = [probe.as_dict() for probe in
+                   sorted(self._probes.values(), key=lambda p: p.index)]
+        passed = len([r for r in results if r["status"] == PASS])
+        return {"passed": passed,
+                "failed": len(results) - passed,
+                "duration": round((self._finished or monotonic()) -
+                                  self._started, 3),
+                "results": results}
+
+    def _emit(self, probe: _Probe):
+        context = {"session": {"session_id": probe.session_id}}
+        if self.silent:
+            context["cc_data"] = {"emit_response": True}
+        context = get_prompt_context(probe.username, probe.session_id,
+                                     self.profile, context)
+        probe.emitted_at = monotonic()
+        self.bus.emit(Message("recognizer_loop:utterance",
+                              {"utterances": [probe.step.prompt.lower()],
+                               "lang": self.lang}, context))
+
+    def _on_handled(self, message: Message):
+        now = monotonic()
+        probe = self._probes.get(message.context.get(DEMO_SESSION_KEY))
+        if not probe or probe.emitted_at is None:
+            return
+        with self._lock:
+            if probe.handled:
+                return
+            latency = now - probe.emitted_at
+            if latency > probe.timeout:
+                LOG.debug(f"Late response to: {probe.step.prompt}")
+                return
+            probe.handled = message
+            probe.latency = round(latency, 4)
+            self._pending -= 1
+            if not self._pending:
+                self._done.set()
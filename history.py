@@ -0,0 +1,191 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sqlite3
+
+from contextlib import closing
+from os import makedirs
+from os.path import dirname, join
+from threading import Lock
+from typing import List, Optional
+
+from ovos_utils.log import LOG
+
+from .demo_script import TIMEOUT
+
+# Bus message requesting a run history report
+HISTORY_MSG_TYPE = "neon.demo.history"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT,
+    version TEXT,
+    lang TEXT,
+    demo_file TEXT,
+    started REAL,
+    duration REAL,
+    stopped INTEGER
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER REFERENCES runs(id),
+    idx INTEGER,
+    prompt TEXT,
+    outcome TEXT,
+    skill_id TEXT,
+    expect_skill TEXT,
+    synthesis_wait REAL,
+    handler_latency REAL,
+    audio_end_latency REAL,
+    total_time REAL
+);
+CREATE INDEX IF NOT EXISTS steps_prompt ON steps(prompt);
+"""
+
+# Skill a step is attributed to; timed out steps have no responding skill,
+# so the skill that last handled the same prompt is used
+_STEP_SKILL = """
+COALESCE(s.skill_id, s.expect_skill,
+         (SELECT h.skill_id FROM steps h WHERE h.prompt = s.prompt AND
+          h.skill_id IS NOT NULL ORDER BY h.run_id DESC LIMIT 1),
+         'unknown')
+"""
+
+
+def get_history_file(data_path: str, skill_id: str) -> str:
+    """
+    Get the database demo run history is stored in.
+    :param data_path: XDG data path to store history under
+    :param skill_id: skill_id of the demo skill
+    :returns: path to the history database
+    """
+    return join(data_path, "history", skill_id, "demo_runs.db")
+
+
+class RunHistory:
+    def __init__(self, path: str):
+        """
+        SQLite store of completed demo runs and their per-step outcomes and
+        timings. The database is created when the first run is added.
+        :param path: database file
+        """
+        self.path = path
+        self._lock = Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        makedirs(dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    def add_run(self, run: dict, steps: List[dict]) -> Optional[int]:
+        """
+        Store a demo run.
+        :param run: dict `session_id`, `version`, `lang`, `demo_file`,
+            `started`, `duration`, and `stopped` of the run
+        :param steps: step metrics records of the run
+        :returns: ID of the stored run, else None on error
+        """
+        try:
+            with self._lock, closing(self._connect()) as conn, conn:
+                run_id = conn.execute(
+                    "INSERT INTO runs (session_id, version, lang, demo_file, "
+                    "started, duration, stopped) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run.get("session_id"), run.get("version"),
+                     run.get("lang"), run.get("demo_file"),
+                     run.get("started"), run.get("duration"),
+                     int(bool(run.get("stopped"))))).lastrowid
+                conn.executemany(
+                    "INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, step.get("index"), step.get("prompt"),
+                      step.get("outcome"), step.get("skill_id"),
+                      step.get("expect_skill"), step.get("synthesis_wait"),
+                      step.get("handler_latency"),
+                      step.get("audio_end_latency"), step.get("total_time"))
+                     for step in steps])
+            return run_id
+        except sqlite3.Error as e:
+            LOG.error(f"Failed to store demo run: {e}")
+            return None
+
+    def get_report(self, limit: int = 10,
+                   version: Optional[str] = None) -> dict:
+        """
+        Get aggregate performance of stored demo runs.
+        :param limit: max number of prompts to list as slowest
+        :param version: only include runs of this skill version in prompt
+            and skill aggregates (default all versions)
+        :returns: dict with `runs`, `slowest_prompts`, `skills`, and
+            `versions` aggregates
+        """
+        where = "WHERE r.version = ?" if version else ""
+        params = (version,) if version else tuple()
+        try:
+            with self._lock, closing(self._connect()) as conn:
+                runs = conn.execute(
+                    f"SELECT COUNT(*) FROM runs r {where}", params
+                ).fetchone()[0]
+                prompts = conn.execute(
+                    f"SELECT s.prompt, COUNT(*) AS steps, "
+                    f"ROUND(AVG(s.handler_latency), 3) AS mean_latency, "
+                    f"MAX(s.handler_latency) AS max_latency "
+                    f"FROM steps s JOIN runs r ON s.run_id = r.id {where} "
+                    f"GROUP BY s.prompt HAVING mean_latency IS NOT NULL "
+                    f"ORDER BY mean_latency DESC LIMIT ?",
+                    params + (limit,)).fetchall()
+                skills = conn.execute(
+                    f"SELECT {_STEP_SKILL} AS skill_id, COUNT(*) AS steps, "
+                    f"SUM(s.outcome = '{TIMEOUT}') AS timeouts, "
+                    f"ROUND(AVG(s.outcome = '{TIMEOUT}'), 3) AS "
+                    f"timeout_rate, "
+                    f"ROUND(AVG(s.handler_latency), 3) AS mean_latency "
+                    f"FROM steps s JOIN runs r ON s.run_id = r.id {where} "
+                    f"GROUP BY 1 ORDER BY timeout_rate DESC, "
+                    f"mean_latency DESC", params).fetchall()
+                versions = conn.execute(
+                    f"SELECT r.version, COUNT(DISTINCT r.id) AS runs, "
+                    f"MIN(r.started) AS first_run, "
+                    f"ROUND(AVG(s.handler_latency), 3) AS mean_latency, "
+                    f"ROUND(AVG(s.outcome = '{TIMEOUT}'), 3) AS "
+                    f"timeout_rate, "
+                    "(SELECT ROUND(AVG(v.duration), 3) FROM runs v WHERE "
+                    "v.version IS r.version AND NOT v.stopped) AS "
+                    "mean_duration FROM runs r "
+                    "LEFT JOIN steps s ON s.run_id = r.id "
+                    "GROUP BY r.version ORDER BY first_run").fetchall()
+        except sqlite3.Error as e:
+            LOG.error(f"Failed to read demo run history: {e}")
+            return {"error": str(e)}
+        return {"runs": runs,
+                "slowest_prompts": [dict(row) for row in prompts],
+                "skills": [dict(row) for row in skills],
+                "versions": [dict(row) for row in versions]}
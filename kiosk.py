@@ -0,0 +1,130 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from os import cpu_count, getloadavg
+from time import monotonic
+from typing import Callable, Optional
+
+from ovos_utils.log import LOG
+
+# DemoRunner key of the kiosk loop scheduler
+KIOSK_TASK = "kiosk"
+# Seconds after audio starts that it is assumed to have ended, in case an
+# `audio_output_end` event is missed
+AUDIO_TIMEOUT = 600
+
+
+def get_cpu_load() -> Optional[float]:
+    """
+    Get the 1-minute load average per CPU.
+    :returns: load per CPU (1.0 is fully loaded), else None if unavailable
+    """
+    try:
+        return getloadavg()[0] / (cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+class KioskScheduler:
+    def __init__(self, interval: float = 300, idle_time: float = 60,
+                 max_load: float = 0.8, retry_interval: float = 30,
+                 get_load: Callable[[], Optional[float]] = get_cpu_load):
+        """
+        Decides when to run the next demo loop on a kiosk. A loop runs
+        `interval` seconds after the last one finished, once nobody has used
+        the device for `idle_time` seconds. While audio is playing or the
+        CPU is loaded, loops are retried with exponential backoff.
+        :param interval: seconds between the end of one loop and the next
+        :param idle_time: seconds without user activity before a loop runs
+        :param max_load: max load per CPU to start a loop at
+        :param retry_interval: initial seconds to wait while the device is busy
+        :param get_load: callable returning the current load per CPU
+        """
+        self.interval = interval
+        self.idle_time = idle_time
+        self.max_load = max_load
+        self.retry_interval = retry_interval
+        self._get_load = get_load
+        self.last_activity: Optional[float] = None
+        self.last_finished: Optional[float] = None
+        self.audio_started: Optional[float] = None
+        self.backoff = 0
+
+    def on_activity(self):
+        """
+        Record user activity, i.e. a wake word or utterance.
+        """
+        self.last_activity = monotonic()
+
+    def on_audio_started(self):
+        self.audio_started = monotonic()
+
+    def on_audio_stopped(self):
+        self.audio_started = None
+
+    def on_loop_finished(self):
+        self.last_finished = monotonic()
+
+    def get_busy_reason(self, now: Optional[float] = None) -> Optional[str]:
+        """
+        Check if the device is too busy to run a demo.
+        :param now: current monotonic time
+        :returns: reason the device is busy, else None
+        """
+        now = now or monotonic()
+        if self.audio_started and now - self.audio_started < AUDIO_TIMEOUT:
+            return "audio playing"
+        load = self._get_load()
+        if load is not None and load > self.max_load:
+            return f"load={load:.2f}"
+        return None
+
+    def get_next_run(self, now: Optional[float] = None) -> float:
+        """
+        Get the time the next loop should run.
+        :param now: current monotonic time
+        :returns: monotonic time to run the next loop; `now` if it should
+            run now
+        """
+        now = now or monotonic()
+        next_run = now
+        if self.last_finished is not None:
+            next_run = max(next_run, self.last_finished + self.interval)
+        if self.last_activity is not None:
+            next_run = max(next_run, self.last_activity + self.idle_time)
+        if next_run > now:
+            return next_run
+        reason = self.get_busy_reason(now)
+        if reason:
+            delay = min(self.retry_interval * 2 ** self.backoff,
+                        max(self.interval, self.retry_interval))
+            self.backoff += 1
+            LOG.debug(f"Device busy ({reason}); retrying in {delay}s")
+            return now + delay
+        self.backoff = 0
+        return now
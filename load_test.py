@@ -0,0 +1,277 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import argparse
+import json
+
+from math import ceil
+from os.path import dirname
+from threading import Event, Lock
+from time import monotonic
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from ovos_bus_client import Message
+from ovos_config.locations import get_xdg_data_save_path
+from ovos_utils.log import LOG
+
+from .demo_script import DemoScript, resolve_demo_file
+from .runner import DemoRunner
+from .demo_script import ERROR, TIMEOUT
+from .session import DEMO_SESSION_KEY, get_prompt_context, get_step_outcome
+from .warmup import SKILL_ID
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    Get a percentile of a list of values using the nearest-rank method.
+    :param values: values to get a percentile of
+    :param pct: percentile to get (0-100)
+    :returns: value at `pct`, else None if `values` is empty
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class _SyntheticUser:
+    def __init__(self, index: int, prompts: List[str], iterations: int):
+        self.session_id = str(uuid4())
+        self.username = f"demo_load_{index}"
+        self.prompts = prompts * iterations
+        self.index = 0
+        self.emitted_at: Optional[float] = None
+        self.handled: Optional[Message] = None
+        self.deadline = 0.0
+
+
+class LoadTest:
+    def __init__(self, bus, prompts: List[str], lang: str = "en-us",
+                 users: int = 10, concurrency: Optional[int] = None,
+                 rate: Optional[float] = None, iterations: int = 1,
+                 timeout: float = 10.0, profile: Optional[dict] = None):
+        """
+        Replays demo prompts as utterances from synthetic users, without
+        speaking prompts or waiting for audio, and measures how long skills
+        take to handle them.
+        :param bus: MessageBusClient (or FakeBus) to emit utterances on
+        :param prompts: demo prompts each user sends in order
+        :param lang: language of the prompts
+        :param users: total number of synthetic users
+        :param concurrency: max users sending prompts at once (default all)
+        :param rate: max prompts per second across all users (default none)
+        :param iterations: number of times each user repeats the prompts
+        :param timeout: seconds to wait for a prompt to be handled
+        :param profile: optional user profile to send with prompts
+        """
+        self.bus = bus
+        self.lang = lang
+        self.concurrency = concurrency or users
+        self.rate = rate
+        self.timeout = timeout
+        self.profile = profile
+        self._pending = [_SyntheticUser(idx, prompts, iterations)
+                         for idx in range(users)]
+        self._active: Dict[str, _SyntheticUser] = dict()
+        self._runner = DemoRunner("demo_load_test")
+        self._lock = Lock()
+        self._next_emit = 0.0
+        self._done = Event()
+        self._latencies: List[float] = list()
+        self._sent = 0
+        self._timeouts = 0
+        self._errors = 0
+        self._started = 0.0
+        self._finished = 0.0
+
+    def run(self, timeout: Optional[float] = None) -> dict:
+        """
+        Run the load test and wait for it to complete.
+        :param timeout: max seconds to wait for all users to finish
+        :returns: dict report of throughput and handler latency
+        """
+        self.bus.on("mycroft.skill.handler.complete", self._on_handled)
+        self._started = monotonic()
+        try:
+            with self._lock:
+                if not self._pending:
+                    self._done.set()
+                while self._pending and len(self._active) < self.concurrency:
+                    self._start_user()
+            if not self._done.wait(timeout):
+                LOG.warning("Load test timed out")
+        finally:
+            self.bus.remove("mycroft.skill.handler.complete",
+                            self._on_handled)
+            self._runner.shutdown()
+        self._finished = self._finished or monotonic()
+        return self.get_report()
+
+    def get_report(self) -> dict:
+        """
+        Get a summary of the load test.
+        """
+        duration = (self._finished or monotonic()) - self._started
+        completed = len(self._latencies)
+        latencies = self._latencies
+        return {"users": len(self._active) + len(self._pending),
+                "concurrency": self.concurrency,
+                "sent": self._sent,
+                "completed": completed,
+                "timeouts": self._timeouts,
+                "errors": self._errors,
+                "duration": round(duration, 3),
+                "throughput": round(completed / duration, 3)
+                if duration else None,
+                "latency": {
+                    "mean": round(sum(latencies) / completed, 4)
+                    if completed else None,
+                    "p50": percentile(latencies, 50),
+                    "p95": percentile(latencies, 95),
+                    "p99": percentile(latencies, 99),
+                    "max": max(latencies) if latencies else None}}
+
+    def _start_user(self):
+        # Must be called with `self._lock` held
+        user = self._pending.pop(0)
+        self._active[user.session_id] = user
+        self._runner.start(user.session_id, lambda: self._advance(user))
+
+    def _on_handled(self, message: Message):
+        user = self._active.get(message.context.get(DEMO_SESSION_KEY))
+        if user and user.emitted_at is not None and not user.handled:
+            user.handled = message
+            self._runner.notify(user.session_id)
+
+    def _advance(self, user: _SyntheticUser) -> Optional[float]:
+        now = monotonic()
+        if user.emitted_at is not None:
+            if not user.handled and now < user.deadline:
+                return user.deadline
+            self._record(user, now)
+            user.index += 1
+        if user.index >= len(user.prompts):
+            self._finish_user(user)
+            return None
+        with self._lock:
+            if self.rate and now < self._next_emit:
+                return self._next_emit
+            if self.rate:
+                self._next_emit = max(now, self._next_emit) + 1 / self.rate
+            self._sent += 1
+        self._emit(user)
+        return user.deadline
+
+    def _emit(self, user: _SyntheticUser):
+        context = get_prompt_context(user.username, user.session_id,
+                                     self.profile)
+        user.handled = None
+        user.emitted_at = monotonic()
+        user.deadline = user.emitted_at + self.timeout
+        self.bus.emit(Message("recognizer_loop:utterance",
+                              {"utterances": [user.prompts[user.index]
+                                              .lower()],
+                               "lang": self.lang}, context))
+
+    def _record(self, user: _SyntheticUser, now: float):
+        outcome = get_step_outcome(None, user.handled is not None,
+                                   user.handled)
+        with self._lock:
+            if outcome == TIMEOUT:
+                self._timeouts += 1
+            elif outcome == ERROR:
+                self._errors += 1
+            else:
+                self._latencies.append(round(now - user.emitted_at, 4))
+        user.emitted_at = None
+
+    def _finish_user(self, user: _SyntheticUser):
+        with self._lock:
+            if self._pending:
+                self._start_user()
+            elif all(u.index >= len(u.prompts)
+                     for u in self._active.values()):
+                self._finished = monotonic()
+                self._done.set()
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Console entry point to load test intent handling on a running messagebus
+    using the demo script as synthetic traffic.
+    """
+    from ovos_bus_client import MessageBusClient
+    parser = argparse.ArgumentParser(
+        description="Load test skills by replaying demo prompts")
+    parser.add_argument("--host", default="0.0.0.0",
+                        help="messagebus host (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8181,
+                        help="messagebus port (default: 8181)")
+    parser.add_argument("--file", default="demo.txt",
+                        help="demo file name or path (default: demo.txt)")
+    parser.add_argument("--lang", default="en-us",
+                        help="language of the demo (default: en-us)")
+    parser.add_argument("--users", type=int, default=10,
+                        help="number of synthetic users (default: 10)")
+    parser.add_argument("--concurrency", type=int,
+                        help="max users active at once (default: all)")
+    parser.add_argument("--rate", type=float,
+                        help="max prompts per second (default: unlimited)")
+    parser.add_argument("--iterations", type=int, default=1,
+                        help="times each user repeats the demo (default: 1)")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="seconds to wait for each prompt (default: 10)")
+    parser.add_argument("--data-path", default=get_xdg_data_save_path(),
+                        help="XDG data path containing user demo files")
+    parser.add_argument("--skill-id", default=SKILL_ID,
+                        help=f"skill_id of the demo skill (default: "
+                             f"{SKILL_ID})")
+    parsed = parser.parse_args(args)
+    demo_file = resolve_demo_file(parsed.file, parsed.lang, parsed.skill_id,
+                                  dirname(__file__), parsed.data_path)
+    if not demo_file:
+        print(f"Demo file not found: {parsed.file}")
+        return 1
+    bus = MessageBusClient(host=parsed.host, port=parsed.port)
+    bus.run_in_thread()
+    if not bus.connected_event.wait(10):
+        print(f"Could not connect to messagebus at "
+              f"{parsed.host}:{parsed.port}")
+        return 1
+    load_test = LoadTest(bus, list(DemoScript(demo_file, parsed.lang).prompts),
+                         parsed.lang, parsed.users, parsed.concurrency,
+                         parsed.rate, parsed.iterations, parsed.timeout)
+    print(json.dumps(load_test.run(), indent=2))
+    bus.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
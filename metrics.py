@@ -0,0 +1,141 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from os import makedirs, replace
+from os.path import dirname, getsize, isfile, join
+from threading import Lock
+from time import monotonic, time
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+# Bus message emitted for each completed demo step
+METRICS_MSG_TYPE = "neon.demo.metrics"
+
+# Timeline events, in the order they normally occur within a step
+SYNTHESIS_READY = "synthesis_ready"
+PLAYBACK_START = "playback_start"
+PLAYBACK_END = "playback_end"
+PROMPT_EMITTED = "emitted"
+PROMPT_HANDLED = "handled"
+AUDIO_END = "audio_end"
+
+
+def get_metrics_file(data_path: str, skill_id: str) -> str:
+    """
+    Get the JSONL file demo step metrics are written to.
+    :param data_path: XDG data path to write metrics under
+    :param skill_id: skill_id of the demo skill
+    :returns: path to the metrics file
+    """
+    return join(data_path, "metrics", skill_id, "demo_steps.jsonl")
+
+
+class StepTimeline:
+    def __init__(self, session_id: str, index: int, prompt: str, lang: str):
+        """
+        Timeline of a single demo step. Event times are recorded relative to
+        the start of the step.
+        :param session_id: ID of the demo session the step is part of
+        :param index: index of the step in the demo script
+        :param prompt: prompt of the step
+        :param lang: language of the demo
+        """
+        self.session_id = session_id
+        self.index = index
+        self.prompt = prompt
+        self.lang = lang
+        self.started_at = time()
+        self._start = monotonic()
+        self.events = dict()
+        self.data = dict()
+
+    def mark(self, event: str, at: Optional[float] = None):
+        """
+        Record the time an event occurred.
+        :param event: name of the event
+        :param at: monotonic time of the event (default now)
+        """
+        self.events[event] = (at or monotonic()) - self._start
+
+    def _between(self, start: str, end: str) -> Optional[float]:
+        if start in self.events and end in self.events and \
+                self.events[end] >= self.events[start]:
+            return round(self.events[end] - self.events[start], 3)
+        return None
+
+    def as_dict(self) -> dict:
+        """
+        Get a serializable summary of the step.
+        """
+        return {"session_id": self.session_id,
+                "index": self.index,
+                "prompt": self.prompt,
+                "lang": self.lang,
+                "timestamp": self.started_at,
+                "total_time": round(monotonic() - self._start, 3),
+                "synthesis_wait": self.events.get(SYNTHESIS_READY),
+                "playback_time": self._between(PLAYBACK_START, PLAYBACK_END),
+                "handler_latency": self._between(PROMPT_EMITTED,
+                                                 PROMPT_HANDLED),
+                "audio_end_latency": self._between(PROMPT_EMITTED,
+                                                   AUDIO_END),
+                "events": {k: round(v, 3) for k, v in self.events.items()},
+                **self.data}
+
+
+class MetricsLog:
+    def __init__(self, path: str, max_size: int = 10 * 1024 * 1024):
+        """
+        Append-only JSONL log of demo step metrics. When the log reaches
+        `max_size`, it is moved to `{path}.1` (replacing any earlier one) and
+        a new log is started, so at most twice `max_size` is kept on disk.
+        :param path: file to append metrics to
+        :param max_size: size in bytes at which the log is rotated
+        """
+        self.path = path
+        self.max_size = max_size
+        self._lock = Lock()
+
+    def write(self, record: dict):
+        """
+        Append a record to the log.
+        :param record: JSON-serializable dict to write
+        """
+        line = json.dumps(record, default=str)
+        with self._lock:
+            try:
+                makedirs(dirname(self.path), exist_ok=True)
+                if isfile(self.path) and getsize(self.path) >= self.max_size:
+                    replace(self.path, f"{self.path}.1")
+                with open(self.path, 'a') as f:
+                    f.write(f"{line}\n")
+            except OSError as e:
+                LOG.error(f"Failed to write demo metrics: {e}")
@@ -0,0 +1,319 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import argparse
+import gzip
+import json
+
+from collections import defaultdict
+from itertools import count
+from os import makedirs
+from os.path import dirname
+from threading import Event, Lock
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+
+from .runner import DemoRunner
+from .session import DEMO_SESSION_KEY, DEMO_USERNAME
+
+RECORDING_VERSION = 1
+
+# Messages emitted by the demo skill; these trigger recorded responses
+PROMPT_EVENTS = ("recognizer_loop:utterance", "speak")
+# Messages the demo skill waits for
+RESPONSE_EVENTS = ("mycroft.skill.handler.complete",
+                   "recognizer_loop:audio_output_start",
+                   "recognizer_loop:audio_output_end")
+AUDIO_EVENTS = RESPONSE_EVENTS[1:]
+
+# A recorded message: (seconds since recording started, type, data, context)
+Record = Tuple[float, str, dict, dict]
+
+
+def save_recording(path: str, records: List[Record]):
+    """
+    Write recorded demo traffic to a gzipped JSON lines file.
+    :param path: file to write
+    :param records: recorded messages to write
+    """
+    if dirname(path):
+        makedirs(dirname(path), exist_ok=True)
+    with gzip.open(path, 'wt') as f:
+        f.write(json.dumps({"version": RECORDING_VERSION}) + "\n")
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':'),
+                               default=str) + "\n")
+
+
+def load_recording(path: str) -> List[Record]:
+    """
+    Read demo traffic written by `save_recording`.
+    :param path: file to read
+    :returns: list of recorded messages
+    """
+    with gzip.open(path, 'rt') as f:
+        header = json.loads(f.readline())
+        if header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: "
+                             f"{header.get('version')}")
+        return [tuple(json.loads(line)) for line in f if line.strip()]
+
+
+def _is_prompt_event(message: Message) -> bool:
+    """
+    Check if a message is emitted by the demo skill. Speech in response to
+    demo prompts is sent with the demo prompt context and is not replayed.
+    """
+    return message.msg_type == "recognizer_loop:utterance" or \
+        message.context.get("username") != DEMO_USERNAME
+
+
+def _get_text(msg_type: str, data: dict) -> Optional[str]:
+    """
+    Get the text a demo prompt event is matched by.
+    """
+    if msg_type == "speak":
+        return data.get("utterance")
+    return (data.get("utterances") or [None])[0]
+
+
+class DemoRecorder:
+    def __init__(self, bus, session_id: Optional[str] = None):
+        """
+        Records the bus traffic of demo runs: prompts emitted by the demo
+        skill and the handler and audio events it waits for.
+        :param bus: MessageBusClient (or FakeBus) to record from
+        :param session_id: demo session to record (default all sessions)
+        """
+        self.bus = bus
+        self.session_id = session_id
+        self._records: List[Record] = list()
+        self._lock = Lock()
+        self._started: Optional[float] = None
+
+    @property
+    def records(self) -> List[Record]:
+        with self._lock:
+            return list(self._records)
+
+    def start(self):
+        """
+        Start recording demo traffic.
+        """
+        self._started = monotonic()
+        for msg_type in PROMPT_EVENTS + RESPONSE_EVENTS:
+            self.bus.on(msg_type, self._on_message)
+
+    def stop(self):
+        """
+        Stop recording demo traffic.
+        """
+        for msg_type in PROMPT_EVENTS + RESPONSE_EVENTS:
+            self.bus.remove(msg_type, self._on_message)
+
+    def save(self, path: str):
+        """
+        Write recorded traffic to a file.
+        :param path: file to write
+        """
+        save_recording(path, self.records)
+
+    def _on_message(self, message: Message):
+        session_id = message.context.get(DEMO_SESSION_KEY)
+        if session_id is None and message.msg_type not in AUDIO_EVENTS:
+            # Audio events may not include the context of what is spoken
+            return
+        if self.session_id and session_id not in (self.session_id, None):
+            return
+        if message.msg_type == "speak" and not _is_prompt_event(message):
+            return
+        # Only responses need context (i.e. updated `user_profiles`)
+        context = {k: v for k, v in message.context.items()
+                   if k != DEMO_SESSION_KEY} \
+            if message.msg_type == RESPONSE_EVENTS[0] else dict()
+        with self._lock:
+            self._records.append((round(monotonic() - self._started, 4),
+                                  message.msg_type, dict(message.data),
+                                  context))
+
+
+class DemoReplay:
+    def __init__(self, bus, records: List[Record], time_scale: float = 0.0):
+        """
+        Answers prompts emitted by the demo skill with the responses
+        recorded for them, so demos run without live skills or audio.
+        Prompts are matched by text; repeated prompts cycle through the
+        responses recorded for them. Spoken prompts with no recording are
+        answered with immediate audio start and end events.
+        :param bus: MessageBusClient (or FakeBus) the demo skill is on
+        :param records: recorded traffic (see `load_recording`)
+        :param time_scale: multiplier of recorded response delays; 0 to
+            respond as fast as possible
+        """
+        self.bus = bus
+        self.time_scale = time_scale
+        self.replayed = 0
+        self._responses: Dict[Tuple[str, str], List[List[Record]]] = \
+            defaultdict(list)
+        self._cursors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._runner = DemoRunner("demo_replay")
+        self._task_ids = count()
+        self._lock = Lock()
+        self._idle = Event()
+        self._idle.set()
+        self._pending = 0
+        self._load(records)
+
+    def _load(self, records: List[Record]):
+        responses = None
+        for record in records:
+            msg_type, data = record[1], record[2]
+            if msg_type in PROMPT_EVENTS:
+                responses = [record]
+                self._responses[(msg_type, _get_text(msg_type, data))]\
+                    .append(responses)
+            elif responses is not None:
+                responses.append(record)
+
+    def start(self):
+        """
+        Start answering demo prompts.
+        """
+        for msg_type in PROMPT_EVENTS:
+            self.bus.on(msg_type, self._on_prompt)
+
+    def shutdown(self):
+        """
+        Stop answering demo prompts and drop any pending responses.
+        """
+        for msg_type in PROMPT_EVENTS:
+            self.bus.remove(msg_type, self._on_prompt)
+        self._runner.shutdown()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all scheduled responses have been emitted.
+        :param timeout: max seconds to wait
+        :returns: True if no responses are pending
+        """
+        return self._idle.wait(timeout)
+
+    def _get_responses(self, message: Message) -> Optional[List[Record]]:
+        key = (message.msg_type, _get_text(message.msg_type, message.data))
+        with self._lock:
+            recorded = self._responses.get(key)
+            if not recorded:
+                return None
+            idx = self._cursors[key] % len(recorded)
+            self._cursors[key] += 1
+        return recorded[idx]
+
+    def _on_prompt(self, message: Message):
+        session_id = message.context.get(DEMO_SESSION_KEY)
+        if not session_id or not _is_prompt_event(message):
+            return
+        recorded = self._get_responses(message)
+        if recorded:
+            prompt_time = recorded[0][0]
+            responses = [((elapsed - prompt_time) * self.time_scale,
+                          msg_type, data, context)
+                         for elapsed, msg_type, data, context
+                         in recorded[1:]]
+        elif message.msg_type == "speak":
+            responses = [(0.0, msg_type, dict(), dict())
+                         for msg_type in AUDIO_EVENTS]
+        else:
+            LOG.debug(f"No recorded response for: {message.data}")
+            return
+        if not responses:
+            return
+        start = monotonic()
+        responses.reverse()
+        with self._lock:
+            self._pending += 1
+            self._idle.clear()
+
+        def step() -> Optional[float]:
+            now = monotonic()
+            while responses and start + responses[-1][0] <= now:
+                _, msg_type, data, context = responses.pop()
+                self.bus.emit(Message(msg_type, data,
+                                      {**context,
+                                       DEMO_SESSION_KEY: session_id}))
+                self.replayed += 1
+            if responses:
+                return start + responses[-1][0]
+            with self._lock:
+                self._pending -= 1
+                if not self._pending:
+                    self._idle.set()
+            return None
+
+        self._runner.start(next(self._task_ids), step)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Console entry point to record demo bus traffic on a running messagebus.
+    """
+    from ovos_bus_client import MessageBusClient
+    parser = argparse.ArgumentParser(
+        description="Record demo bus traffic for replay in tests")
+    parser.add_argument("output", help="file to write the recording to")
+    parser.add_argument("--host", default="0.0.0.0",
+                        help="messagebus host (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8181,
+                        help="messagebus port (default: 8181)")
+    parser.add_argument("--duration", type=float,
+                        help="seconds to record (default: until "
+                             "interrupted)")
+    parsed = parser.parse_args(args)
+    bus = MessageBusClient(host=parsed.host, port=parsed.port)
+    bus.run_in_thread()
+    if not bus.connected_event.wait(10):
+        print(f"Could not connect to messagebus at "
+              f"{parsed.host}:{parsed.port}")
+        return 1
+    recorder = DemoRecorder(bus)
+    recorder.start()
+    try:
+        Event().wait(parsed.duration)
+    except KeyboardInterrupt:
+        pass
+    recorder.stop()
+    recorder.save(parsed.output)
+    print(f"Recorded {len(recorder.records)} messages to {parsed.output}")
+    bus.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
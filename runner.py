@@ -0,0 +1,220 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from subprocess import Popen
+from threading import Condition, Thread
+from time import monotonic
+from typing import Callable, Dict, Hashable, Optional, Set
+
+from ovos_utils.log import LOG
+
+# A step callable advances a task as far as it can without blocking and
+# returns the monotonic time it should be called again, or None when the task
+# is complete. Tasks are also advanced early when `notify` is called for them.
+StepCallable = Callable[[], Optional[float]]
+
+
+class DemoRunner:
+    def __init__(self, name: str = "demo_runner"):
+        """
+        Drives any number of concurrent, non-blocking tasks (i.e. demo runs)
+        from a single thread. Each task is advanced when it is notified of an
+        event or when the deadline it last requested passes.
+        :param name: name of the runner thread
+        """
+        self._name = name
+        self._steps: Dict[Hashable, StepCallable] = dict()
+        self._deadlines: Dict[Hashable, float] = dict()
+        self._notified: Set[Hashable] = set()
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._running = False
+
+    def __contains__(self, key: Hashable):
+        return key in self._steps
+
+    def __len__(self):
+        return len(self._steps)
+
+    def start(self, key: Hashable, step: StepCallable):
+        """
+        Start driving a task. `step` is called for the first time on the
+        runner thread as soon as possible.
+        :param key: unique identifier of the task
+        :param step: callable that advances the task
+        """
+        with self._cond:
+            self._steps[key] = step
+            self._deadlines[key] = monotonic()
+            self._running = True
+            if not self._thread or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name=self._name,
+                                      daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def notify(self, key: Hashable):
+        """
+        Advance a task as soon as possible, i.e. after an event it is waiting
+        for has occurred.
+        :param key: identifier of the task to advance
+        """
+        with self._cond:
+            if key in self._steps:
+                self._notified.add(key)
+                self._cond.notify()
+
+    def cancel(self, key: Hashable):
+        """
+        Stop driving a task without calling its step again.
+        :param key: identifier of the task to remove
+        """
+        with self._cond:
+            self._remove(key)
+
+    def shutdown(self):
+        """
+        Stop the runner thread and drop all tasks.
+        """
+        with self._cond:
+            self._running = False
+            self._steps.clear()
+            self._deadlines.clear()
+            self._notified.clear()
+            self._cond.notify()
+
+    def _remove(self, key: Hashable):
+        self._steps.pop(key, None)
+        self._deadlines.pop(key, None)
+        self._notified.discard(key)
+
+    def _get_ready(self) -> Dict[Hashable, StepCallable]:
+        """
+        Wait until at least one task is due and return all tasks to advance.
+        Must be called with `self._cond` held.
+        """
+        while self._running:
+            now = monotonic()
+            ready = {key for key, deadline in self._deadlines.items()
+                     if deadline <= now} | self._notified
+            if ready:
+                self._notified.clear()
+                return {key: self._steps[key] for key in ready
+                        if key in self._steps}
+            timeout = min(self._deadlines.values()) - now \
+                if self._deadlines else None
+            self._cond.wait(timeout)
+        return dict()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                ready = self._get_ready()
+                if not self._running:
+                    return
+            for key, step in ready.items():
+                try:
+                    deadline = step()
+                except Exception as e:
+                    LOG.exception(f"Demo task {key} failed: {e}")
+                    deadline = None
+                with self._cond:
+                    if self._steps.get(key) is not step:
+                        # Task was cancelled or replaced during the step
+                        continue
+                    if deadline is None:
+                        self._remove(key)
+                    else:
+                        self._deadlines[key] = deadline
+
+
+class PlaybackWatcher:
+    def __init__(self, interval: float = 0.05, name: str = "demo_playback"):
+        """
+        Watches any number of playback processes from a single thread and
+        calls back when each one exits. The thread only runs while there are
+        processes to watch.
+        :param interval: seconds between checks of watched processes
+        :param name: name of the watcher thread
+        """
+        self.interval = interval
+        self._name = name
+        self._watched: Dict[Popen, Callable[[], None]] = dict()
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._running = True
+
+    def __len__(self):
+        return len(self._watched)
+
+    def watch(self, process: Popen, callback: Callable[[], None]):
+        """
+        Call `callback` from the watcher thread once `process` exits.
+        :param process: playback process to watch
+        :param callback: callable to call when the process exits
+        """
+        with self._cond:
+            if not self._running:
+                return
+            self._watched[process] = callback
+            if not self._thread:
+                self._thread = Thread(target=self._run, name=self._name,
+                                      daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def shutdown(self):
+        """
+        Stop watching all processes.
+        """
+        with self._cond:
+            self._running = False
+            self._watched.clear()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running or not self._watched:
+                    # Started again by `watch` when needed
+                    self._thread = None
+                    return
+                watched = list(self._watched.items())
+            exited = [(process, callback) for process, callback in watched
+                      if process.poll() is not None]
+            with self._cond:
+                for process, _ in exited:
+                    self._watched.pop(process, None)
+            for _, callback in exited:
+                try:
+                    callback()
+                except Exception as e:
+                    LOG.exception(f"Playback callback failed: {e}")
+            with self._cond:
+                if self._running and self._watched:
+                    self._cond.wait(self.interval)
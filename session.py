@@ -0,0 +1,292 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import Future
+from enum import Enum
+from subprocess import Popen
+from threading import Event, Lock
+from time import monotonic, time
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+from neon_utils.message_utils import get_message_user
+from ovos_plugin_manager.templates import TTS
+
+from .cancel import CancelToken
+from .demo_profile import OverlayProfile
+from .demo_script import DemoScript, DemoStep, ERROR, HANDLED, TIMEOUT, \
+    UNEXPECTED
+from .metrics import StepTimeline
+from .synthesis import PromptSynthesizer
+from .timing import StepTimingModel
+
+# Message context key used to route bus events to a demo session
+DEMO_SESSION_KEY = "demo_session"
+# Message context key identifying the demo step a response belongs to
+DEMO_STEP_KEY = "demo_step"
+# Username demo prompts are sent as
+DEMO_USERNAME = "demo"
+
+
+def get_prompt_context(username: str, session_id: str,
+                       profile: Optional[dict] = None,
+                       context: Optional[dict] = None) -> dict:
+    """
+    Build the context of a demo prompt sent to skills.
+    :param username: user the prompt is sent as
+    :param session_id: demo session responses are routed to
+    :param profile: user profile to send with the prompt; it is copied if
+        its username doesn't match `username`
+    :param context: base context to extend
+    :returns: context for a `recognizer_loop:utterance` Message
+    """
+    context = dict(context or dict())
+    context.update({"username": username,
+                    "neon_should_respond": True,
+                    "source": ["demo"],
+                    "destination": ["skills"],
+                    DEMO_SESSION_KEY: session_id})
+    if profile:
+        user = profile.get('user') or dict()
+        if user.get('username') != username:
+            profile = {**profile, 'user': {**user, 'username': username}}
+        context['user_profiles'] = [profile]
+    return context
+
+
+def get_step_outcome(step: Optional[DemoStep], handled: bool,
+                     response: Optional[Message]) -> str:
+    """
+    Determine the outcome of a demo prompt once it was handled or timed out.
+    :param step: DemoStep the prompt was sent for, if any
+    :param handled: True if skills finished handling the prompt
+    :param response: `mycroft.skill.handler.complete` Message, if any
+    :returns: one of HANDLED, UNEXPECTED, ERROR, or TIMEOUT
+    """
+    if not handled:
+        return TIMEOUT
+    if not response:
+        # Handled with a request for user input
+        return HANDLED
+    if response.data.get("exception"):
+        return ERROR
+    expected = step.expect_skill if step else None
+    if expected and response.context.get("skill_id") != expected:
+        LOG.warning(f"Expected {expected} to handle {step.prompt}, "
+                    f"got {response.context.get('skill_id')}")
+        return UNEXPECTED
+    return HANDLED
+
+
+class DemoState(Enum):
+    WAIT_AUDIO = "wait_audio"  # Waiting for the intro to finish speaking
+    SYNTHESIZING = "synthesizing"  # Waiting for prompt audio to render
+    PLAYING = "playing"  # Playing rendered prompt audio
+    SPEAKING = "speaking"  # Waiting for the audio module to speak a prompt
+    HANDLING = "handling"  # Waiting for skills to handle a prompt
+    RESPONDING = "responding"  # Waiting for the response to be spoken
+    SETTLING = "settling"  # Waiting to see if more responses are spoken
+    FINISHED = "finished"
+
+
+class DemoSession:
+    def __init__(self, user: str, lang: str, message: Message):
+        """
+        Synchronization state for a single demo run.
+        :param user: username of the user who requested the demo
+        :param lang: language of the demo
+        :param message: message associated with the demo request
+        """
+        self.session_id = str(uuid4())
+        self.user = user
+        self.lang = lang
+        # Copy of the request with session context; responses to the demo
+        # user are sent with this message
+        self.message = Message(message.msg_type, message.data,
+                               {**message.context,
+                                DEMO_SESSION_KEY: self.session_id})
+        self.stopped = CancelToken()
+        self.audio_output_done = Event()
+        # Audio segments started and not yet ended, for any step
+        self.audio_playing = 0
+        self.prompt_handled = Event()
+        self.last_response: Optional[Message] = None
+
+        # Demo run state, managed by the skill
+        self.state = DemoState.WAIT_AUDIO
+        self.deadline = 0.0
+        self.index = -1
+        # Incremented for every step run, including repeated steps
+        self.step_number = 0
+        self.chunk = 0
+        self.outcome: Optional[str] = None
+        self.script: Optional[DemoScript] = None
+        self.prompts: List[str] = list()
+        self.prompter: dict = dict()
+        self.profile: Optional[OverlayProfile] = None
+        self.prompt_message: Optional[Message] = None
+        self.tts: Optional[TTS] = None
+        self.synthesizer: Optional[PromptSynthesizer] = None
+        self.audio_future: Optional[Future] = None
+        self.playback: Optional[Popen] = None
+        self.timing: Optional[StepTimingModel] = None
+        self.finished = Event()
+        self.started_at = time()
+        # Metrics of completed steps, stored in run history
+        self.step_records: List[dict] = list()
+
+        # Timing of the current step
+        self.emitted_at: Optional[float] = None
+        self.handled_at: Optional[float] = None
+        self.audio_ended_at: Optional[float] = None
+        self.audio_segments = 0
+        self.timeline: Optional[StepTimeline] = None
+
+    @property
+    def prompt(self) -> Optional[str]:
+        """
+        The prompt currently being spoken or handled.
+        """
+        if 0 <= self.index < len(self.prompts):
+            return self.prompts[self.index]
+        return None
+
+    @property
+    def step(self) -> Optional[DemoStep]:
+        """
+        The script step currently being spoken or handled.
+        """
+        if self.script and 0 <= self.index < len(self.script):
+            return self.script.steps[self.index]
+        return None
+
+    def stop(self):
+        """
+        Stop the demo and release any pending wait for a prompt response.
+        """
+        self.stopped.set()
+        self.prompt_handled.set()
+
+    def is_current_step(self, message: Message) -> bool:
+        """
+        Check if a bus event belongs to the current step. Events without a
+        step, i.e. the intro or a spoken prompt, are treated as current.
+        :param message: bus event associated with this session
+        """
+        step = message.context.get(DEMO_STEP_KEY)
+        return step is None or step == self.step_number
+
+    def on_audio_started(self, message: Message):
+        self.audio_playing += 1
+        if self.is_current_step(message):
+            self.audio_output_done.clear()
+
+    def on_audio_stopped(self, message: Message):
+        self.audio_playing = max(0, self.audio_playing - 1)
+        if not self.is_current_step(message):
+            # Response to an earlier step that didn't wait for audio
+            return
+        self.audio_ended_at = monotonic()
+        self.audio_segments += 1
+        self.audio_output_done.set()
+
+    def on_mic_listen(self, message: Message):
+        if not self.is_current_step(message):
+            return
+        self.prompt_handled.set()
+
+    def on_handler_complete(self, message: Message):
+        if not self.is_current_step(message):
+            # Late response to an earlier step that timed out
+            return
+        self.handled_at = monotonic()
+        self.last_response = message
+        self.prompt_handled.set()
+
+
+class DemoSessionManager:
+    def __init__(self):
+        """
+        Tracks active demo sessions and resolves which session a bus event
+        belongs to.
+        """
+        self._sessions: Dict[str, DemoSession] = dict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str):
+        return session_id in self._sessions
+
+    def add(self, session: DemoSession):
+        with self._lock:
+            self._sessions[session.session_id] = session
+
+    def remove(self, session: DemoSession):
+        with self._lock:
+            self._sessions.pop(session.session_id, None)
+
+    def get_user_sessions(self, user: Optional[str]) -> List[DemoSession]:
+        """
+        Get active demo sessions requested by the specified user.
+        :param user: username to get sessions for
+        :returns: list of the user's active sessions
+        """
+        with self._lock:
+            return [s for s in self._sessions.values() if s.user == user]
+
+    def get_session(self, message: Message,
+                    strict: bool = False) -> Optional[DemoSession]:
+        """
+        Resolve the demo session a bus event belongs to. Events are matched
+        by demo session context, then by requesting user. Events with no
+        identifying context are attributed to the only active session, if
+        exactly one session is active.
+        :param message: bus event to resolve a session for
+        :param strict: if True, only match events by demo session context
+        :returns: matching DemoSession, else None
+        """
+        context = message.context if message else dict()
+        with self._lock:
+            session_id = context.get(DEMO_SESSION_KEY)
+            if session_id or strict:
+                return self._sessions.get(session_id)
+            user = get_message_user(message) if message else None
+            if user:
+                sessions = [s for s in self._sessions.values()
+                            if s.user == user]
+                if len(sessions) == 1:
+                    return sessions[0]
+            if len(self._sessions) == 1:
+                return list(self._sessions.values())[0]
+        if self._sessions:
+            LOG.debug(f"No demo session for message: {message.msg_type}")
+        return None
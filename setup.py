@@ -33,6 +33,9 @@ SKILL_NAME = "skill-demo"
 SKILL_PKG = SKILL_NAME.replace('-', '_')
 # skill_id=package_name:SkillClass
 PLUGIN_ENTRY_POINT = f'{SKILL_NAME}.neongeckocom={SKILL_PKG}:DemoSkill'
+PRERENDER_ENTRY_POINT = f'neon-demo-prerender={SKILL_PKG}.warmup:main'
+LOAD_TEST_ENTRY_POINT = f'neon-demo-load-test={SKILL_PKG}.load_test:main'
+RECORD_ENTRY_POINT = f'neon-demo-record={SKILL_PKG}.recording:main'
 BASE_PATH = path.abspath(path.dirname(__file__))
 
 
@@ -98,5 +101,8 @@ setup(
     packages=[SKILL_PKG],
     package_data={SKILL_PKG: find_resource_files()},
     include_package_data=True,
-    entry_points={"ovos.plugin.skill": PLUGIN_ENTRY_POINT}
+    entry_points={"ovos.plugin.skill": PLUGIN_ENTRY_POINT,
+                  "console_scripts": [PRERENDER_ENTRY_POINT,
+                                      LOAD_TEST_ENTRY_POINT,
+                                      RECORD_ENTRY_POINT]}
 )
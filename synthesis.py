@@ -0,0 +1,373 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event, Lock
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ovos_utils.log import LOG
+from ovos_plugin_manager.templates import TTS
+
+from .audio_buffer import AudioBuffer
+from .audio_cache import PromptAudioCache
+
+# TTS modules that play pre-recorded audio for whole sentences and so can't
+# render partial prompts
+WHOLE_FILE_TTS_MODULES = ("neon-tts-plugin-audiofiles",)
+
+_BOUNDARY = re.compile(r"(?<=[.!?;:,])\s+")
+
+
+def split_prompt(prompt: str, min_length: int = 40) -> List[str]:
+    """
+    Split a prompt into chunks at sentence and clause boundaries so playback
+    can start before the whole prompt is rendered. Clauses are combined so
+    chunks are at least `min_length` characters where possible.
+    :param prompt: prompt to split
+    :param min_length: min number of characters per chunk
+    :returns: list of prompt chunks, in order
+    """
+    chunks = list()
+    for part in _BOUNDARY.split(prompt.strip()):
+        if chunks and len(chunks[-1]) < min_length:
+            chunks[-1] = f"{chunks[-1]} {part}"
+        else:
+            chunks.append(part)
+    if len(chunks) > 1 and len(chunks[-1]) < min_length // 2:
+        # Don't end with a very short chunk
+        chunks[-2] = f"{chunks[-2]} {chunks.pop()}"
+    return chunks or [prompt]
+
+
+def can_stream(tts: TTS) -> bool:
+    """
+    Check if a TTS plugin can render partial prompts.
+    :param tts: TTS plugin instance
+    :returns: False if the plugin must render whole prompts
+    """
+    module = (getattr(tts, "config", None) or {}).get("module")
+    return module not in WHOLE_FILE_TTS_MODULES
+
+
+def can_batch(tts: TTS) -> bool:
+    """
+    Check if a TTS plugin can render many sentences in one call. Batch-capable
+    plugins implement `get_tts_batch(sentences, wav_files)`, returning a list
+    of `(wav_file, phonemes)` in the order of `sentences`.
+    :param tts: TTS plugin instance
+    :returns: True if the plugin supports batched synthesis
+    """
+    return callable(getattr(type(tts), "get_tts_batch", None))
+
+
+class PromptSynthesizer:
+    def __init__(self, tts: TTS, prompts: List[str], lookahead: int = 1,
+                 cancel: Optional[Event] = None,
+                 cache: Optional[PromptAudioCache] = None,
+                 lang: Optional[str] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 buffer: Optional[AudioBuffer] = None,
+                 chunked: bool = False, batched: bool = False):
+        """
+        Renders demo prompts to audio on a worker thread, staying up to
+        `lookahead` prompts ahead of the prompt currently being played.
+        :param tts: TTS plugin instance used to synthesize prompts
+        :param prompts: ordered list of prompts to be spoken
+        :param lookahead: number of prompts to render ahead of playback
+        :param cancel: Event that stops synthesis when set
+        :param cache: PromptAudioCache to read and store rendered audio in
+        :param lang: language of prompts (defaults to the TTS language)
+        :param on_error: optional callback called when synthesis raises
+        :param buffer: AudioBuffer to render into; cleared on `shutdown`
+        :param chunked: if True, render prompts in chunks that may be played
+            as each one is ready
+        :param batched: if True, render prompts after the first look-ahead
+            window in one call to the plugin's `get_tts_batch` (see
+            `can_batch`)
+        """
+        self._tts = tts
+        self._prompts = prompts
+        self._lookahead = max(lookahead, 0)
+        self._cancel = cancel or Event()
+        self._stopped = Event()
+        self._cache = cache
+        self._lang = lang or self._tts.lang
+        self._on_error = on_error
+        self._buffer = buffer if buffer is not None else AudioBuffer()
+        self._chunked = chunked
+        self._batched = batched
+        self._batch_queued = False
+        self._chunks: Dict[int, List[str]] = dict()
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="demo_tts")
+        self._futures: Dict[Tuple[int, int], Future] = dict()
+        # Synthesis time and cache usage by prompt index
+        self.timings: Dict[int, dict] = dict()
+        self._lock = Lock()
+
+    def get_chunks(self, index: int) -> List[str]:
+        """
+        Get the chunks the prompt at `index` is rendered in.
+        :param index: index of a prompt
+        :returns: list of prompt chunks; the whole prompt if not chunked
+        """
+        if index not in self._chunks:
+            prompt = self._prompts[index]
+            self._chunks[index] = split_prompt(prompt) if self._chunked \
+                else [prompt]
+        return self._chunks[index]
+
+    def get_remaining(self, index: int, chunk: int = 0) -> str:
+        """
+        Get the text of a prompt starting at `chunk`.
+        :param index: index of a prompt
+        :param chunk: index of the first chunk to include
+        :returns: text of the prompt from `chunk` to the end
+        """
+        if chunk == 0:
+            return self._prompts[index]
+        return " ".join(self.get_chunks(index)[chunk:])
+
+    def prefetch(self, index: int):
+        """
+        Queue synthesis of the prompt at `index` and the look-ahead window
+        following it.
+        :param index: index of the next prompt to be played
+        """
+        last = min(index + self._lookahead, len(self._prompts) - 1)
+        with self._lock:
+            for idx in range(index, last + 1):
+                for chunk in range(len(self.get_chunks(idx))):
+                    if (idx, chunk) in self._futures or self.cancelled:
+                        continue
+                    try:
+                        self._futures[(idx, chunk)] = self._executor.submit(
+                            self._synthesize, idx, chunk)
+                    except RuntimeError:
+                        # Executor was shut down
+                        return
+            if self._batched and not self._batch_queued:
+                # The window above is rendered individually so playback
+                # doesn't wait for the whole batch
+                self._submit_batch()
+
+    def _submit_batch(self):
+        """
+        Queue synthesis of every prompt not already queued in one batch. Must
+        be called with `self._lock` held.
+        """
+        futures = dict()
+        for idx in range(len(self._prompts)):
+            for chunk in range(len(self.get_chunks(idx))):
+                if (idx, chunk) not in self._futures:
+                    futures[(idx, chunk)] = Future()
+        try:
+            self._executor.submit(self._synthesize_batch, futures)
+        except RuntimeError:
+            # Executor was shut down
+            return
+        self._batch_queued = True
+        self._futures.update(futures)
+
+    def get_future(self, index: int, chunk: int = 0) -> Optional[Future]:
+        """
+        Get a Future resolving to rendered audio for the prompt at `index`
+        without waiting for synthesis. Synthesis of following prompts is
+        queued as with `get`.
+        :param index: index of the prompt to get audio for
+        :param chunk: index of the prompt chunk to get audio for
+        :returns: Future resolving to a path to rendered audio, else None
+        """
+        if not 0 <= index < len(self._prompts):
+            return None
+        self.prefetch(index)
+        return self._futures.get((index, chunk))
+
+    def get(self, index: int, timeout: Optional[float] = None,
+            chunk: int = 0) -> Optional[str]:
+        """
+        Get rendered audio for the prompt at `index`, waiting for synthesis
+        if it has not completed yet. Synthesis of following prompts is queued
+        before waiting.
+        :param index: index of the prompt to get audio for
+        :param timeout: max seconds to wait for synthesis
+        :param chunk: index of the prompt chunk to get audio for
+        :returns: path to rendered audio, else None
+        """
+        future = self.get_future(index, chunk)
+        if not future:
+            return None
+        try:
+            return future.result(timeout)
+        except Exception as e:
+            LOG.error(f"Failed to synthesize prompt {index}: {e}")
+            return None
+
+    def release(self, index: int):
+        """
+        Release rendered audio for the prompt at `index` once it has been
+        played. The prompt is rendered again if it is requested again.
+        :param index: index of a prompt that was played
+        """
+        with self._lock:
+            futures = [self._futures.pop(key) for key in
+                       list(self._futures) if key[0] == index]
+        for future in futures:
+            if future.cancel():
+                continue
+            if future.done() and not future.exception():
+                self._buffer.release(future.result())
+            else:
+                # Release audio when synthesis completes
+                future.add_done_callback(
+                    lambda f: None if f.cancelled() or f.exception() else
+                    self._buffer.release(f.result()))
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set() or self._stopped.is_set()
+
+    def shutdown(self):
+        """
+        Cancel any pending synthesis and release the worker thread.
+        """
+        self._stopped.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for future in self._futures.values():
+                # Batched futures are not managed by the executor
+                future.cancel()
+        self._buffer.clear()
+
+    def _synthesize(self, index: int, chunk: int = 0) -> Optional[str]:
+        if self.cancelled:
+            return None
+        prompt = self.get_chunks(index)[chunk]
+        key = self._get_cache_key(prompt) if self._cache else None
+        start = monotonic()
+        if key:
+            cached = self._cache.get(key)
+            if cached:
+                LOG.debug(f"Using cached audio for prompt {index}: {prompt}")
+                self._add_timing(index, chunk, monotonic() - start, True)
+                return cached
+        LOG.debug(f"Synthesizing prompt {index}: {prompt}")
+        output_file = self._buffer.allocate()
+        try:
+            wav_file, _ = self._tts.get_tts(prompt, output_file)
+        except Exception as e:
+            self._buffer.release(output_file)
+            if self._on_error:
+                self._on_error(e)
+            raise
+        if wav_file != output_file:
+            # Plugin returned its own file (i.e. pre-rendered audio)
+            self._buffer.release(output_file)
+        if key and wav_file:
+            wav_file = self._cache.put(key, wav_file)
+            self._buffer.release(output_file)
+        self._add_timing(index, chunk, monotonic() - start, False)
+        if self.cancelled:
+            self._buffer.release(wav_file)
+            return None
+        return wav_file
+
+    def _synthesize_batch(self, futures: Dict[Tuple[int, int], Future]):
+        # Skip prompts that were released before synthesis started
+        futures = {key: future for key, future in futures.items()
+                   if future.set_running_or_notify_cancel()}
+        if self.cancelled:
+            for future in futures.values():
+                future.set_result(None)
+            return
+        pending = dict()
+        for (index, chunk), future in futures.items():
+            prompt = self.get_chunks(index)[chunk]
+            key = self._get_cache_key(prompt) if self._cache else None
+            cached = self._cache.get(key) if key else None
+            if cached:
+                self._add_timing(index, chunk, 0.0, True)
+                future.set_result(cached)
+            else:
+                pending[(index, chunk)] = (prompt, key, future)
+        if not pending:
+            return
+        LOG.debug(f"Synthesizing {len(pending)} prompts in one batch")
+        output_files = [self._buffer.allocate() for _ in pending]
+        start = monotonic()
+        try:
+            results = self._tts.get_tts_batch(
+                [prompt for prompt, _, _ in pending.values()], output_files)
+            if len(results) != len(pending):
+                raise ValueError(f"Expected {len(pending)} results, got "
+                                 f"{len(results)}")
+        except Exception as e:
+            LOG.warning(f"Batched synthesis failed, synthesizing prompts "
+                        f"individually: {e}")
+            for output_file in output_files:
+                self._buffer.release(output_file)
+            for (index, chunk), (_, _, future) in pending.items():
+                try:
+                    future.set_result(self._synthesize(index, chunk))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        synthesis_time = (monotonic() - start) / len(pending)
+        for ((index, chunk), (_, key, future)), output_file, (wav_file, _) \
+                in zip(pending.items(), output_files, results):
+            if wav_file != output_file:
+                self._buffer.release(output_file)
+            if key and wav_file:
+                wav_file = self._cache.put(key, wav_file)
+                self._buffer.release(output_file)
+            self._add_timing(index, chunk, synthesis_time, False)
+            if self.cancelled:
+                self._buffer.release(wav_file)
+                wav_file = None
+            future.set_result(wav_file)
+
+    def _add_timing(self, index: int, chunk: int, synthesis_time: float,
+                    cached: bool):
+        if chunk == 0 or index not in self.timings:
+            self.timings[index] = {"synthesis_time": synthesis_time,
+                                   "cached": cached,
+                                   "chunks": 1}
+            return
+        timing = self.timings[index]
+        timing["synthesis_time"] += synthesis_time
+        timing["cached"] = timing["cached"] and cached
+        timing["chunks"] += 1
+
+    def _get_cache_key(self, prompt: str) -> str:
+        module = (getattr(self._tts, "config", None) or {}).get("module") or \
+            self._tts.__class__.__name__
+        return PromptAudioCache.get_key(prompt, self._lang, module,
+                                        getattr(self._tts, "voice", None))
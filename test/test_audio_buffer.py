@@ -0,0 +1,100 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from os import listdir
+from os.path import isdir, isfile, join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+
+class TestAudioBuffer(unittest.TestCase):
+    def test_get_audio_buffer_dir(self):
+        from tempfile import gettempdir
+        from skill_demo.audio_buffer import get_audio_buffer_dir
+        path = get_audio_buffer_dir("skill-demo.neongeckocom")
+        self.assertTrue(path.startswith(gettempdir()))
+        self.assertIn("skill-demo.neongeckocom", path)
+
+    def test_allocate_release(self):
+        from skill_demo.audio_buffer import AudioBuffer
+        root = mkdtemp()
+        buffer = AudioBuffer(join(root, "session"))
+        self.assertTrue(isdir(buffer.directory))
+        first = buffer.allocate()
+        second = buffer.allocate(".mp3")
+        self.assertNotEqual(first, second)
+        self.assertTrue(second.endswith(".mp3"))
+        self.assertEqual(len(buffer), 2)
+        self.assertIn(first, buffer)
+        # Paths are allocated without creating (or opening) files
+        self.assertEqual(listdir(buffer.directory), [])
+        for path in (first, second):
+            with open(path, 'w') as f:
+                f.write("audio")
+        buffer.release(first)
+        self.assertFalse(isfile(first))
+        self.assertNotIn(first, buffer)
+        # Release is idempotent
+        buffer.release(first)
+        # Files not allocated by the buffer are left in place
+        other = join(root, "other.wav")
+        with open(other, 'w') as f:
+            f.write("audio")
+        buffer.release(other)
+        self.assertTrue(isfile(other))
+
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertFalse(isdir(buffer.directory))
+        self.assertTrue(isfile(other))
+        rmtree(root)
+
+    def test_default_directory(self):
+        from skill_demo.audio_buffer import AudioBuffer
+        buffer = AudioBuffer()
+        self.assertTrue(isdir(buffer.directory))
+        buffer.clear()
+        self.assertFalse(isdir(buffer.directory))
+
+    def test_clear_all(self):
+        from skill_demo.audio_buffer import AudioBuffer
+        root = join(mkdtemp(), "buffers")
+        for session in ("one", "two"):
+            with open(AudioBuffer(join(root, session)).allocate(), 'w') as f:
+                f.write("audio")
+        AudioBuffer.clear_all(root)
+        self.assertFalse(isdir(root))
+        # Missing directories are ignored
+        AudioBuffer.clear_all(root)
+
+
+if __name__ == '__main__':
+    pytest.main()
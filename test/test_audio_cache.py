@@ -0,0 +1,142 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from os.path import isfile, join
+from mock import patch
+from tempfile import mkdtemp
+from shutil import rmtree
+
+
+class TestPromptAudioCache(unittest.TestCase):
+    cache_dir = None
+
+    def setUp(self):
+        self.cache_dir = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.cache_dir)
+
+    def _get_audio(self, name: str, size: int = 10) -> str:
+        path = join(self.cache_dir, f"{name}.wav")
+        with open(path, 'wb') as f:
+            f.write(b'0' * size)
+        return path
+
+    def test_get_key(self):
+        from skill_demo.audio_cache import PromptAudioCache
+        key = PromptAudioCache.get_key("what time is it?", "en-us", "tts")
+        self.assertEqual(key, PromptAudioCache.get_key("what time is it?",
+                                                       "en-US", "tts"))
+        self.assertNotEqual(key, PromptAudioCache.get_key("what time is it?",
+                                                          "uk-ua", "tts"))
+        self.assertNotEqual(key, PromptAudioCache.get_key("what time is it?",
+                                                          "en-us", "other"))
+        self.assertNotEqual(key, PromptAudioCache.get_key("what time is it?",
+                                                          "en-us", "tts",
+                                                          "female"))
+
+    def test_put_get_persisted(self):
+        from skill_demo.audio_cache import PromptAudioCache
+        cache = PromptAudioCache(join(self.cache_dir, "cache"))
+        self.assertIsNone(cache.get("key"))
+        cached = cache.put("key", self._get_audio("test"))
+        self.assertTrue(isfile(cached))
+        self.assertEqual(cache.get("key"), cached)
+        self.assertEqual(cache.size, 10)
+
+        # Index is loaded on init
+        cache = PromptAudioCache(join(self.cache_dir, "cache"))
+        self.assertEqual(cache.get("key"), cached)
+
+    def test_access_persisted_periodically(self):
+        from skill_demo.audio_cache import PromptAudioCache
+        cache_dir = join(self.cache_dir, "cache")
+        cache = PromptAudioCache(cache_dir, save_interval=60)
+        cache.put("first", self._get_audio("first"))
+        cache.put("second", self._get_audio("second"))
+
+        # Hits don't rewrite the index within `save_interval`
+        with patch.object(cache, "_save_index",
+                          wraps=cache._save_index) as save_index:
+            cache.get("first")
+            cache.get("first")
+            save_index.assert_not_called()
+            cache.flush()
+            save_index.assert_called_once()
+            cache.flush()
+            save_index.assert_called_once()
+        last_used = cache._index["first"]["last_used"]
+        self.assertEqual(PromptAudioCache(cache_dir)._index["first"]
+                         ["last_used"], last_used)
+
+        # Hits are written once `save_interval` has passed
+        cache.save_interval = 0
+        cache.get("second")
+        self.assertEqual(PromptAudioCache(cache_dir)._index["second"]
+                         ["last_used"], cache._index["second"]["last_used"])
+
+    def test_lru_eviction(self):
+        from skill_demo.audio_cache import PromptAudioCache
+        cache = PromptAudioCache(join(self.cache_dir, "cache"), 25)
+        first = cache.put("first", self._get_audio("first"))
+        second = cache.put("second", self._get_audio("second"))
+        # Access the first entry so the second is least recently used
+        cache.get("first")
+        cache.put("third", self._get_audio("third"))
+        self.assertEqual(cache.get("first"), first)
+        self.assertIsNone(cache.get("second"))
+        self.assertFalse(isfile(second))
+        self.assertLessEqual(cache.size, 25)
+
+    def test_eviction_holds_used_entries(self):
+        from skill_demo.audio_cache import PromptAudioCache
+        cache = PromptAudioCache(join(self.cache_dir, "cache"), 25,
+                                 hold_time=60)
+        first = cache.put("first", self._get_audio("first"))
+        second = cache.put("second", self._get_audio("second"))
+        # Audio returned within `hold_time` may be playing; exceed the limit
+        # rather than remove it
+        self.assertEqual(cache.get("first"), first)
+        cache.put("third", self._get_audio("third"))
+        self.assertTrue(isfile(first))
+        self.assertTrue(isfile(second))
+        self.assertEqual(cache.size, 30)
+
+        # Entries are evicted once `hold_time` has passed
+        cache.hold_time = 0
+        cache.put("fourth", self._get_audio("fourth"))
+        self.assertFalse(isfile(first))
+        self.assertFalse(isfile(second))
+        self.assertLessEqual(cache.size, 25)
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,338 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import json
+import pytest
+import subprocess
+import sys
+
+from os.path import dirname, isdir, join
+from threading import Timer
+from time import monotonic, sleep
+
+from mock import Mock, patch
+from ovos_bus_client import Message
+from ovos_utils.messagebus import FakeBus
+
+# Benchmarks for the demo pipeline, run with the unit tests or alone with
+# `pytest test/test_benchmark.py --benchmark-only`. Delays are seconds.
+HANDLER_DELAY = 0.005
+AUDIO_DELAY = 0.005
+SYNTHESIS_DELAY = 0.005
+
+
+class DemoBus(FakeBus):
+    """
+    In-process bus that answers utterances like a skill handling them and a
+    spoken response, and `speak` messages like the audio service.
+    """
+    def __init__(self, handler_delay=HANDLER_DELAY, audio_delay=AUDIO_DELAY):
+        FakeBus.__init__(self)
+        self.emitter = self.ee
+        self.handler_delay = handler_delay
+        self.audio_delay = audio_delay
+        self.on("recognizer_loop:utterance", self._on_utterance)
+        self.on("speak", self._on_speak)
+
+    def _later(self, delay, target, *args):
+        if delay:
+            Timer(delay, target, args).start()
+        else:
+            target(*args)
+
+    def _on_utterance(self, message):
+        self._later(self.handler_delay, self._handle, message)
+
+    def _handle(self, message):
+        self.emit(message.forward("mycroft.skill.handler.complete", {}))
+        self.emit(message.forward("speak", {"utterance": "response"}))
+
+    def _on_speak(self, message):
+        self.emit(message.forward("recognizer_loop:audio_output_start"))
+        self._later(self.audio_delay, self.emit,
+                    message.forward("recognizer_loop:audio_output_end"))
+
+
+class FakeTTS:
+    """
+    Deterministic TTS that writes a small audio file per sentence.
+    """
+    def __init__(self, lang="en-us", delay=SYNTHESIS_DELAY):
+        self.lang = lang
+        self.voice = "fake"
+        self.config = {"module": "fake_tts"}
+        self.delay = delay
+        self.calls = 0
+
+    def get_tts(self, sentence, wav_file):
+        self.calls += 1
+        sleep(self.delay)
+        with open(wav_file, "wb") as f:
+            f.write(b"RIFF" + hashlib.sha256(sentence.encode()).digest())
+        return wav_file, None
+
+    def shutdown(self):
+        pass
+
+
+class FakePlayback:
+    """
+    Popen-like playback that finishes after a delay.
+    """
+    def __init__(self, delay=AUDIO_DELAY):
+        self._end = monotonic() + delay
+
+    def poll(self):
+        return 0 if monotonic() >= self._end else None
+
+    def terminate(self):
+        self._end = 0
+
+    kill = terminate
+
+    def wait(self, timeout=None):
+        remaining = self._end - monotonic()
+        if timeout is not None and remaining > timeout:
+            sleep(timeout)
+            raise subprocess.TimeoutExpired("playback", timeout)
+        sleep(max(remaining, 0))
+        return self.poll()
+
+
+@pytest.fixture(scope="module")
+def demo_skill(tmp_path_factory):
+    from ovos_plugin_manager.skills import find_skill_plugins
+    from neon_minerva.skill import get_skill_object
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv("XDG_DATA_HOME", str(tmp_path_factory.mktemp("data")))
+        env.setenv("XDG_CONFIG_HOME", str(tmp_path_factory.mktemp("config")))
+        bus = DemoBus()
+        bus.run_forever()
+        skill = get_skill_object(
+            skill_entrypoint=list(find_skill_plugins())[0],
+            skill_id="test_skill.benchmark", bus=bus)
+        skill.settings["adaptive_timing"] = False
+        skill._settle_time = 0.0
+        skill._get_demo_tts = Mock(return_value=FakeTTS())
+        with patch("ovos_utils.sound.play_audio",
+                   side_effect=lambda *_: FakePlayback()):
+            yield skill
+        skill.shutdown()
+
+
+def _run_demos(skill, users=1, timeout=30):
+    messages = [Message("recognizer_loop:utterance",
+                        context={"neon_should_respond": True,
+                                 "username": f"bench_user_{idx}"})
+                for idx in range(users)]
+    sessions = list()
+    for message in messages:
+        skill.handle_show_demo(message)
+        sessions.append(skill._active_demos.get_session(message))
+    for session in sessions:
+        assert session.finished.wait(timeout)
+    assert len(skill._active_demos) == 0
+    # Rendered prompt audio is removed when a demo finishes
+    assert not any(isdir(join(skill._audio_buffer_dir, session.session_id))
+                   for session in sessions)
+    return sessions
+
+
+def _set_per_step(benchmark, steps):
+    benchmark.extra_info["steps"] = steps
+    if benchmark.stats:
+        benchmark.extra_info["per_step"] = benchmark.stats.stats.mean / steps
+
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+import neon_utils.skills, ovos_workshop.decorators
+start = time.perf_counter()
+import skill_demo
+print(json.dumps({"skill_import": time.perf_counter() - start,
+                  "modules": sorted(m for m in sys.modules
+                                    if m.startswith("skill_demo"))}))
+"""
+
+
+@pytest.mark.benchmark(group="load")
+def test_import_time(benchmark):
+    """
+    Import the skill in a new interpreter, as when a device boots. The time
+    to import the skill after its framework is reported as `skill_import`.
+    """
+    def import_skill():
+        out = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT],
+                             capture_output=True, text=True, check=True)
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    result = benchmark.pedantic(import_skill, rounds=2)
+    benchmark.extra_info["skill_import"] = result["skill_import"]
+    # Modules for optional modes are imported when used
+    assert "skill_demo.load_test" not in result["modules"]
+    assert "skill_demo.recording" not in result["modules"]
+    assert "skill_demo.health" not in result["modules"]
+
+
+@pytest.mark.benchmark(group="load")
+def test_skill_load(benchmark, tmp_path):
+    """
+    Create the skill, as the skill loader does on boot.
+    """
+    from ovos_plugin_manager.skills import find_skill_plugins
+    from neon_minerva.skill import get_skill_object
+    entrypoint = list(find_skill_plugins())[0]
+    bus = FakeBus()
+    bus.emitter = bus.ee
+    skills = list()
+
+    def load_skill():
+        skills.append(get_skill_object(skill_entrypoint=entrypoint,
+                                       skill_id="test_skill.load", bus=bus))
+
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+        env.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        benchmark.pedantic(load_skill, rounds=5)
+    for skill in skills:
+        # Nothing is set up until a demo is requested
+        assert not skill._demos_initialized
+        skill.shutdown()
+
+
+@pytest.mark.benchmark(group="demo")
+def test_demo_step_overhead(benchmark, demo_skill):
+    """
+    Full demo with no handler, audio, or synthesis delays, so the time per
+    step is skill overhead.
+    """
+    bus = demo_skill.bus
+    tts = demo_skill._get_demo_tts()
+    with patch.multiple(bus, handler_delay=0, audio_delay=0), \
+            patch.object(tts, "delay", 0), \
+            patch("ovos_utils.sound.play_audio",
+                  side_effect=lambda *_: FakePlayback(0)):
+        sessions = benchmark.pedantic(_run_demos, (demo_skill,), rounds=3)
+    _set_per_step(benchmark, len(sessions[0].prompts))
+
+
+@pytest.mark.benchmark(group="demo")
+def test_demo_end_to_end(benchmark, demo_skill):
+    """
+    Full demo with synthesis, playback, and handler delays.
+    """
+    sessions = benchmark.pedantic(_run_demos, (demo_skill,), rounds=3)
+    _set_per_step(benchmark, len(sessions[0].prompts))
+
+
+@pytest.mark.benchmark(group="concurrency")
+@pytest.mark.parametrize("users", [1, 4, 16])
+def test_demo_concurrent_users(benchmark, demo_skill, users):
+    """
+    Concurrent demos for different users sharing one runner and TTS engine.
+    """
+    benchmark.extra_info["users"] = users
+    sessions = benchmark.pedantic(_run_demos, (demo_skill, users), rounds=2)
+    assert len(sessions) == users
+
+
+@pytest.mark.benchmark(group="demo")
+def test_demo_replay(benchmark, demo_skill):
+    """
+    Record a demo, then replay its bus traffic with no delays in place of
+    skills and audio, as for regression tests of the runner.
+    """
+    from skill_demo.recording import DemoRecorder, DemoReplay
+    bus = demo_skill.bus
+    recorder = DemoRecorder(bus)
+    # Record speech before it is answered, as on a networked bus
+    bus.remove("speak", bus._on_speak)
+    recorder.start()
+    bus.on("speak", bus._on_speak)
+    _run_demos(demo_skill)
+    recorder.stop()
+
+    replay = DemoReplay(bus, recorder.records)
+    bus.remove("recognizer_loop:utterance", bus._on_utterance)
+    bus.remove("speak", bus._on_speak)
+    replay.start()
+    tts = demo_skill._get_demo_tts()
+    try:
+        with patch.object(tts, "delay", 0), \
+                patch("ovos_utils.sound.play_audio",
+                      side_effect=lambda *_: FakePlayback(0)):
+            sessions = benchmark.pedantic(_run_demos, (demo_skill,),
+                                          rounds=5)
+    finally:
+        replay.shutdown()
+        bus.on("recognizer_loop:utterance", bus._on_utterance)
+        bus.on("speak", bus._on_speak)
+    assert replay.replayed
+    _set_per_step(benchmark, len(sessions[0].prompts))
+
+
+@pytest.mark.benchmark(group="cache")
+@pytest.mark.parametrize("cached", [False, True])
+def test_prompt_synthesis(benchmark, tmp_path, cached):
+    """
+    Synthesize all demo prompts with a cold or warm prompt audio cache.
+    """
+    from skill_demo.audio_cache import PromptAudioCache
+    from skill_demo.demo_script import load_demo_prompts
+    from skill_demo.synthesis import PromptSynthesizer
+    prompts = load_demo_prompts(join(dirname(dirname(__file__)), "locale",
+                                     "en-us", "demo.txt"))
+    tts = FakeTTS()
+    rounds = iter(range(100))
+
+    def setup():
+        cache = PromptAudioCache(str(tmp_path / ("warm" if cached else
+                                                 str(next(rounds)))))
+        synthesizer = PromptSynthesizer(tts, prompts, 0, cache=cache,
+                                        lang="en-us")
+        if cached:
+            for idx in range(len(prompts)):
+                synthesizer.get(idx, 5)
+        synthesizer.shutdown()
+        return (cache,), {}
+
+    def synthesize(cache):
+        synthesizer = PromptSynthesizer(tts, prompts, 0, cache=cache,
+                                        lang="en-us")
+        files = [synthesizer.get(idx, 5) for idx in range(len(prompts))]
+        synthesizer.shutdown()
+        return files
+
+    files = benchmark.pedantic(synthesize, setup=setup, rounds=3)
+    assert all(files)
+    _set_per_step(benchmark, len(prompts))
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,73 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from mock import Mock
+
+
+class TestCancelToken(unittest.TestCase):
+    def test_cancel_token(self):
+        from threading import Event
+        from skill_demo.cancel import CancelToken
+        token = CancelToken()
+        self.assertIsInstance(token, Event)
+        callback = Mock()
+        token.add_callback(callback)
+        self.assertFalse(token.wait(0.01))
+        callback.assert_not_called()
+
+        token.set()
+        self.assertTrue(token.is_set())
+        self.assertTrue(token.wait(0))
+        callback.assert_called_once()
+
+        # Callbacks run once
+        token.set()
+        callback.assert_called_once()
+
+        # Callbacks added after cancellation run immediately
+        late = Mock()
+        token.add_callback(late)
+        late.assert_called_once()
+
+    def test_callback_errors(self):
+        from skill_demo.cancel import CancelToken
+        token = CancelToken()
+        failing = Mock(side_effect=RuntimeError("failed"))
+        callback = Mock()
+        token.add_callback(failing)
+        token.add_callback(callback)
+        token.set()
+        failing.assert_called_once()
+        callback.assert_called_once()
+        self.assertTrue(token.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
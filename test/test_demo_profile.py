@@ -0,0 +1,96 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+
+class TestOverlayProfile(unittest.TestCase):
+    base = {"user": {"username": "user", "first_name": "Test"},
+            "units": {"measure": "metric", "time": 12},
+            "speech": {"tts_gender": "female"}}
+
+    def test_get_set(self):
+        from skill_demo.demo_profile import OverlayProfile
+        profile = OverlayProfile(self.base, {"user": {"username": "demo"}})
+        self.assertEqual(profile.get("user", "username"), "demo")
+        self.assertEqual(profile.get("user", "first_name"), "Test")
+        self.assertEqual(profile.get("units", "measure"), "metric")
+        self.assertIsNone(profile.get("location", "city"))
+        self.assertEqual(profile.get("location", "city", "Seattle"),
+                         "Seattle")
+        profile.set("units", "measure", "imperial")
+        self.assertEqual(profile.get("units", "measure"), "imperial")
+        # Base profile is never modified
+        self.assertEqual(self.base["user"]["username"], "user")
+        self.assertEqual(self.base["units"]["measure"], "metric")
+
+    def test_materialize(self):
+        from skill_demo.demo_profile import OverlayProfile
+        profile = OverlayProfile(self.base, {"user": {"username": "demo"},
+                                             "units": {"measure": "imperial"}})
+        materialized = profile.materialize()
+        self.assertEqual(materialized["user"], {"username": "demo",
+                                                "first_name": "Test"})
+        self.assertEqual(materialized["units"], {"measure": "imperial",
+                                                 "time": 12})
+        # Unchanged sections are shared with the base profile
+        self.assertIs(materialized["speech"], self.base["speech"])
+        # Materialized profile is reused until a value changes
+        self.assertIs(profile.materialize(), materialized)
+        profile.set("speech", "tts_gender", "male")
+        changed = profile.materialize()
+        self.assertIsNot(changed, materialized)
+        self.assertEqual(changed["speech"], {"tts_gender": "male"})
+        self.assertEqual(materialized["speech"], {"tts_gender": "female"})
+
+    def test_update(self):
+        from skill_demo.demo_profile import OverlayProfile
+        profile = OverlayProfile(self.base, {"user": {"username": "demo"}})
+        materialized = profile.materialize()
+        # Unchanged profiles are ignored
+        self.assertFalse(profile.update(None))
+        self.assertFalse(profile.update(materialized))
+        self.assertFalse(profile.update({"user": dict(materialized["user"]),
+                                         "units": dict(self.base["units"])}))
+        self.assertIs(profile.materialize(), materialized)
+        # Changed values are kept as overrides
+        response = {"user": {"username": "demo", "first_name": "Demo"},
+                    "units": {"measure": "metric", "time": 24},
+                    "version": 1}
+        self.assertTrue(profile.update(response))
+        self.assertEqual(profile.get("user", "first_name"), "Demo")
+        self.assertEqual(profile.get("units", "time"), 24)
+        self.assertEqual(profile._overrides,
+                         {"user": {"username": "demo", "first_name": "Demo"},
+                          "units": {"time": 24}})
+        self.assertEqual(self.base["units"]["time"], 12)
+
+
+if __name__ == '__main__':
+    pytest.main()
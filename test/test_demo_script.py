@@ -0,0 +1,167 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import unittest
+import pytest
+
+from os import utime
+from os.path import dirname, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from mock import Mock
+
+SKILL_DIR = dirname(dirname(__file__))
+
+
+class TestDemoScript(unittest.TestCase):
+    test_dir = None
+
+    def setUp(self):
+        self.test_dir = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.test_dir)
+
+    def _write_demo(self, lines: str, name: str = "demo.txt") -> str:
+        path = join(self.test_dir, name)
+        with open(path, 'w') as f:
+            f.write(lines)
+        return path
+
+    def test_resolve_demo_file(self):
+        from skill_demo.demo_script import resolve_demo_file
+        skill_file = resolve_demo_file("demo.txt", "uk-ua", "skill-demo.test",
+                                       SKILL_DIR, self.test_dir)
+        self.assertEqual(skill_file, join(SKILL_DIR, "locale", "uk-ua",
+                                          "demo.txt"))
+        self.assertIsNone(resolve_demo_file("missing.txt", "en-us",
+                                            "skill-demo.test", SKILL_DIR,
+                                            self.test_dir))
+        fs_file = self._write_demo("test")
+        self.assertEqual(resolve_demo_file("demo.txt", "en-us",
+                                           "skill-demo.test", SKILL_DIR,
+                                           self.test_dir, self.test_dir),
+                         fs_file)
+        self.assertEqual(resolve_demo_file(fs_file, "en-us",
+                                           "skill-demo.test", SKILL_DIR,
+                                           self.test_dir), fs_file)
+
+    def test_load_demo_prompts(self):
+        from skill_demo.demo_script import load_demo_prompts
+        prompts = load_demo_prompts(join(SKILL_DIR, "locale", "en-us",
+                                         "mall_demo.txt"))
+        self.assertEqual(len(prompts), 10)
+        self.assertEqual(prompts[0], "where is apple store")
+        self.assertEqual(prompts[-1], "yes")
+        self.assertTrue(all(prompts))
+
+        path = self._write_demo("# comment\n  what   time is it? \n\n\nyes\n")
+        self.assertEqual(load_demo_prompts(path),
+                         ["what time is it?", "yes"])
+
+    def test_demo_script_cache(self):
+        from skill_demo.demo_script import DemoScriptCache
+        path = self._write_demo("one\ntwo\n")
+        resolver = Mock(return_value=path)
+        cache = DemoScriptCache(resolver)
+        script = cache.get("demo.txt", "en-us")
+        self.assertEqual(script.prompts, ("one", "two"))
+        self.assertEqual(script.path, path)
+        self.assertEqual(len(script), 2)
+        self.assertIs(cache.get("demo.txt", "en-US"), script)
+        resolver.assert_called_once_with("demo.txt", "en-us")
+
+        # Changed file is recompiled
+        self._write_demo("one\ntwo\nthree\n")
+        utime(path, ns=(0, script.signature[1] + 1000))
+        self.assertFalse(script.is_current)
+        updated = cache.get("demo.txt", "en-us")
+        self.assertEqual(updated.prompts, ("one", "two", "three"))
+        self.assertEqual(resolver.call_count, 2)
+
+        # Removed file is dropped from the cache
+        resolver.return_value = None
+        utime(path, ns=(0, updated.signature[1] + 1000))
+        self.assertIsNone(cache.get("demo.txt", "en-us"))
+        self.assertIsNone(cache.get("demo.txt", "en-us"))
+        self.assertEqual(resolver.call_count, 4)
+
+    def test_structured_script(self):
+        from skill_demo.demo_script import DemoScript, DemoStep, END
+        script = DemoScript(join(SKILL_DIR, "locale", "en-us",
+                                 "mall_demo.yaml"), "en-us")
+        self.assertEqual(list(script.prompts), load_txt_prompts())
+        self.assertEqual(script.steps[1], DemoStep("yes"))
+        self.assertEqual(script.get_next_index(-1, None), 0)
+        self.assertEqual(script.get_next_index(0, "handled"), 1)
+        self.assertEqual(script.get_next_index(0, "timeout"), 2)
+        self.assertIsNone(script.get_next_index(8, "error"))
+        self.assertIsNone(script.get_next_index(len(script) - 1, None))
+
+        path = self._write_demo(json.dumps({
+            "name": "test",
+            "steps": [{"prompt": "what time is it?",
+                       "expect_skill": "skill-date_time.neongeckocom",
+                       "max_latency": 5, "wait_for_audio": False,
+                       "next": {"unexpected": END}},
+                      "how are you?"]}), "demo.json")
+        script = DemoScript(path, "en-us")
+        self.assertEqual(script.metadata, {"name": "test"})
+        step = script.steps[0]
+        self.assertEqual(step.expect_skill, "skill-date_time.neongeckocom")
+        self.assertEqual(step.max_latency, 5.0)
+        self.assertFalse(step.wait_for_audio)
+        self.assertIsNone(script.get_next_index(0, "unexpected"))
+        self.assertEqual(script.get_next_index(0, "handled"), 1)
+
+    def test_invalid_structured_script(self):
+        from skill_demo.demo_script import DemoScriptCache, load_demo_steps
+        invalid = ["steps: what time is it?",
+                   "steps:\n  - id: one\n    prompt: one\n"
+                   "  - id: one\n    prompt: two",
+                   "steps:\n  - prompt: one\n    next:\n      done: end",
+                   "steps:\n  - prompt: one\n    next:\n"
+                   "      timeout: missing",
+                   "steps:\n  - id: one"]
+        for script in invalid:
+            path = self._write_demo(script, "demo.yaml")
+            with self.assertRaises(ValueError):
+                load_demo_steps(path)
+        cache = DemoScriptCache(Mock(return_value=path))
+        self.assertIsNone(cache.get("demo.yaml", "en-us"))
+
+
+def load_txt_prompts():
+    from skill_demo.demo_script import load_demo_prompts
+    return load_demo_prompts(join(SKILL_DIR, "locale", "en-us",
+                                  "mall_demo.txt"))
+
+
+if __name__ == '__main__':
+    pytest.main()
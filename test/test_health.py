@@ -0,0 +1,119 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from threading import Timer
+
+from ovos_utils.messagebus import FakeBus
+
+
+class _SkillsBus(FakeBus):
+    """
+    Bus that answers utterances like the skill configured for each one
+    """
+    def __init__(self, skills):
+        FakeBus.__init__(self)
+        # utterance: (skill_id, delay, data)
+        self.skills = skills
+        self.received = list()
+        self.on("recognizer_loop:utterance", self._respond)
+
+    def _respond(self, message):
+        self.received.append(message)
+        utterance = message.data["utterances"][0]
+        if utterance not in self.skills:
+            return
+        skill_id, delay, data = self.skills[utterance]
+        response = message.forward("mycroft.skill.handler.complete", data)
+        response.context["skill_id"] = skill_id
+        Timer(delay, self.emit, (response,)).start()
+
+
+class TestHealthSweep(unittest.TestCase):
+    def test_health_sweep(self):
+        from skill_demo.demo_script import DemoStep
+        from skill_demo.health import HealthSweep
+        from skill_demo.session import DEMO_SESSION_KEY
+        bus = _SkillsBus({"what time is it": ("time", 0.2, {}),
+                          "how are you": ("chat", 0.2, {}),
+                          "spell caffeine": ("wolfram", 0.05, {}),
+                          "what is the weather": ("weather", 0.05,
+                                                  {"exception": "error"}),
+                          "slow": ("chat", 0.3, {})})
+        steps = [DemoStep("What time is it"),
+                 DemoStep("how are you", expect_skill="chat"),
+                 DemoStep("spell caffeine", expect_skill="spelling"),
+                 DemoStep("what is the weather"),
+                 DemoStep("slow", max_latency=0.1),
+                 DemoStep("unhandled")]
+        sweep = HealthSweep(bus, steps, timeout=0.5,
+                            profile={"user": {"username": "test"}})
+        report = sweep.run()
+        # Prompts are sent at once, each in a distinct session
+        self.assertEqual(len(bus.received), len(steps))
+        sessions = {m.context[DEMO_SESSION_KEY] for m in bus.received}
+        self.assertEqual(len(sessions), len(steps))
+        self.assertEqual({m.context["session"]["session_id"]
+                          for m in bus.received}, sessions)
+        for message in bus.received:
+            self.assertTrue(message.context["cc_data"]["emit_response"])
+            self.assertEqual(message.context["user_profiles"][0]["user"]
+                             ["username"], message.context["username"])
+        self.assertLess(report["duration"], 1.0)
+
+        results = report["results"]
+        self.assertEqual([r["status"] for r in results],
+                         ["pass", "pass", "fail", "fail", "fail", "fail"])
+        self.assertEqual([r["outcome"] for r in results],
+                         ["handled", "handled", "unexpected", "error",
+                          "timeout", "timeout"])
+        self.assertEqual(report["passed"], 2)
+        self.assertEqual(report["failed"], 4)
+        self.assertEqual(results[0]["prompt"], "What time is it")
+        self.assertEqual(results[0]["skill_id"], "time")
+        self.assertGreaterEqual(results[0]["latency"], 0.2)
+        self.assertEqual(results[2]["skill_id"], "wolfram")
+        # Late responses are not counted
+        self.assertEqual(results[4]["timeout"], 0.1)
+        self.assertIsNone(results[4]["latency"])
+        self.assertIsNone(results[5]["skill_id"])
+
+        # Sweep finishes when every prompt is handled
+        sweep = HealthSweep(bus, steps[:3], timeout=5, silent=False)
+        report = sweep.run()
+        self.assertLess(report["duration"], 1.0)
+        self.assertNotIn("cc_data", bus.received[-1].context)
+        self.assertNotIn("user_profiles", bus.received[-1].context)
+
+        # Empty sweep
+        self.assertEqual(HealthSweep(bus, []).run()["results"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from os.path import isfile, join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+
+def _step(index, prompt, outcome="handled", skill_id=None, latency=None):
+    return {"index": index, "prompt": prompt, "outcome": outcome,
+            "skill_id": skill_id, "handler_latency": latency,
+            "total_time": latency}
+
+
+class TestRunHistory(unittest.TestCase):
+    data_path = None
+
+    def setUp(self):
+        self.data_path = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.data_path)
+
+    def test_get_history_file(self):
+        from skill_demo.history import get_history_file
+        self.assertEqual(get_history_file("/data", "skill-demo.test"),
+                         "/data/history/skill-demo.test/demo_runs.db")
+
+    def test_run_history(self):
+        from skill_demo.history import RunHistory
+        history = RunHistory(join(self.data_path, "history", "runs.db"))
+        self.assertFalse(isfile(history.path))
+        self.assertEqual(history.get_report()["runs"], 0)
+
+        run_id = history.add_run(
+            {"session_id": "1", "version": "1.0.0", "started": 100.0,
+             "duration": 10.0},
+            [_step(0, "what time is it", skill_id="time", latency=0.5),
+             _step(1, "how are you", skill_id="chat", latency=2.0)])
+        self.assertIsInstance(run_id, int)
+        history.add_run(
+            {"session_id": "2", "version": "1.1.0", "started": 200.0,
+             "duration": 20.0},
+            [_step(0, "what time is it", "timeout"),
+             _step(1, "how are you", skill_id="chat", latency=4.0)])
+        history.add_run(
+            {"session_id": "3", "version": "1.1.0", "started": 300.0,
+             "duration": 1.0, "stopped": True},
+            [_step(0, "what time is it", skill_id="time", latency=1.5)])
+
+        report = history.get_report()
+        self.assertEqual(report["runs"], 3)
+        self.assertEqual(report["slowest_prompts"][0],
+                         {"prompt": "how are you", "steps": 2,
+                          "mean_latency": 3.0, "max_latency": 4.0})
+        self.assertEqual(len(history.get_report(1)["slowest_prompts"]), 1)
+        # Timeouts are attributed to the skill that handles the prompt
+        skills = {s["skill_id"]: s for s in report["skills"]}
+        self.assertEqual(report["skills"][0]["skill_id"], "time")
+        self.assertEqual(skills["time"]["steps"], 3)
+        self.assertEqual(skills["time"]["timeouts"], 1)
+        self.assertEqual(skills["time"]["timeout_rate"], 0.333)
+        self.assertEqual(skills["chat"]["timeout_rate"], 0.0)
+        # Versions are listed in the order they were first run
+        self.assertEqual([v["version"] for v in report["versions"]],
+                         ["1.0.0", "1.1.0"])
+        newest = report["versions"][1]
+        self.assertEqual(newest["runs"], 2)
+        self.assertEqual(newest["timeout_rate"], 0.333)
+        self.assertEqual(newest["mean_latency"], 2.75)
+        # Stopped runs are not included in duration
+        self.assertEqual(newest["mean_duration"], 20.0)
+
+        report = history.get_report(version="1.0.0")
+        self.assertEqual(report["runs"], 1)
+        self.assertEqual(report["slowest_prompts"][0]["mean_latency"], 2.0)
+        self.assertEqual(len(report["versions"]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from time import monotonic
+from mock import Mock, patch
+
+
+class TestKiosk(unittest.TestCase):
+    def test_get_cpu_load(self):
+        from skill_demo.kiosk import get_cpu_load
+        load = get_cpu_load()
+        self.assertIsInstance(load, float)
+        self.assertGreaterEqual(load, 0)
+        with patch("skill_demo.kiosk.getloadavg",
+                   Mock(side_effect=OSError())):
+            self.assertIsNone(get_cpu_load())
+
+    def test_idle_and_interval(self):
+        from skill_demo.kiosk import KioskScheduler
+        kiosk = KioskScheduler(interval=300, idle_time=60,
+                               get_load=lambda: 0.1)
+        now = monotonic()
+        # First loop runs immediately
+        self.assertEqual(kiosk.get_next_run(now), now)
+        # Next loop runs `interval` after the last one finished
+        kiosk.last_finished = now - 100
+        self.assertEqual(kiosk.get_next_run(now), now + 200)
+        kiosk.last_finished = now - 300
+        self.assertEqual(kiosk.get_next_run(now), now)
+        # User activity delays the loop until the device is idle
+        kiosk.on_activity()
+        self.assertAlmostEqual(kiosk.get_next_run(now),
+                               kiosk.last_activity + 60)
+        kiosk.on_loop_finished()
+        self.assertAlmostEqual(kiosk.get_next_run(now),
+                               kiosk.last_finished + 300)
+
+    def test_busy_backoff(self):
+        from skill_demo.kiosk import KioskScheduler
+        load = Mock(return_value=0.1)
+        kiosk = KioskScheduler(interval=300, idle_time=0, max_load=0.8,
+                               retry_interval=30, get_load=load)
+        now = monotonic()
+        self.assertIsNone(kiosk.get_busy_reason(now))
+
+        # Audio playing
+        kiosk.on_audio_started()
+        self.assertEqual(kiosk.get_busy_reason(now), "audio playing")
+        self.assertAlmostEqual(kiosk.get_next_run(now), now + 30)
+        self.assertAlmostEqual(kiosk.get_next_run(now), now + 60)
+        kiosk.on_audio_stopped()
+        self.assertEqual(kiosk.get_next_run(now), now)
+        self.assertEqual(kiosk.backoff, 0)
+        # Missed audio end events don't block loops forever
+        kiosk.on_audio_started()
+        kiosk.audio_started -= 601
+        self.assertIsNone(kiosk.get_busy_reason(now))
+        kiosk.on_audio_stopped()
+
+        # High load backs off up to `interval`
+        load.return_value = 1.5
+        self.assertEqual(kiosk.get_busy_reason(now), "load=1.50")
+        for expected in (30, 60, 120, 240, 300, 300):
+            self.assertAlmostEqual(kiosk.get_next_run(now) - now, expected)
+        load.return_value = None
+        self.assertEqual(kiosk.get_next_run(now), now)
+
+
+if __name__ == '__main__':
+    pytest.main()
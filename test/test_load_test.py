@@ -0,0 +1,124 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from threading import Timer
+
+from ovos_bus_client import Message
+from ovos_utils.messagebus import FakeBus
+
+
+class _ResponderBus(FakeBus):
+    """
+    Bus that answers utterances with `handler.complete` after a delay
+    """
+    def __init__(self, delay=0.01, skip=None):
+        FakeBus.__init__(self)
+        self.delay = delay
+        self.skip = skip or set()
+        self.utterances = list()
+        self.on("recognizer_loop:utterance", self._respond)
+
+    def _respond(self, message):
+        utterance = message.data["utterances"][0]
+        self.utterances.append((message.context["username"], utterance))
+        if utterance in self.skip:
+            return
+        data = {"exception": "error"} if utterance == "fail" else {}
+        Timer(self.delay, self.emit,
+              (message.forward("mycroft.skill.handler.complete",
+                               data),)).start()
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_percentile(self):
+        from skill_demo.load_test import percentile
+        self.assertIsNone(percentile([], 50))
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile([3, 1, 2], 100), 3)
+
+    def test_run(self):
+        from skill_demo.load_test import LoadTest
+        bus = _ResponderBus()
+        load_test = LoadTest(bus, ["one", "Two"], users=5, concurrency=2,
+                             iterations=2, timeout=2,
+                             profile={"user": {"username": "demo"}})
+        report = load_test.run(10)
+        self.assertEqual(report["users"], 5)
+        self.assertEqual(report["sent"], 20)
+        self.assertEqual(report["completed"], 20)
+        self.assertEqual(report["timeouts"], 0)
+        self.assertGreater(report["throughput"], 0)
+        for key in ("p50", "p95", "p99"):
+            self.assertGreaterEqual(report["latency"][key], 0.01)
+        self.assertEqual(len(bus.utterances), 20)
+        self.assertEqual(len(set(u[0] for u in bus.utterances)), 5)
+        self.assertIn(("demo_load_0", "two"), bus.utterances)
+        # Handler listener is removed when the test is done
+        self.assertFalse(bus.ee.listeners("mycroft.skill.handler.complete"))
+
+    def test_run_timeouts_errors(self):
+        from skill_demo.load_test import LoadTest
+        bus = _ResponderBus(skip={"ignored"})
+        load_test = LoadTest(bus, ["ignored", "fail", "ok"], users=2,
+                             timeout=0.2)
+        report = load_test.run(10)
+        self.assertEqual(report["sent"], 6)
+        self.assertEqual(report["completed"], 2)
+        self.assertEqual(report["timeouts"], 2)
+        self.assertEqual(report["errors"], 2)
+
+    def test_run_rate_limited(self):
+        from skill_demo.load_test import LoadTest
+        bus = _ResponderBus(delay=0)
+        load_test = LoadTest(bus, ["one"], users=6, rate=20, timeout=2)
+        report = load_test.run(10)
+        self.assertEqual(report["completed"], 6)
+        # 6 prompts at 20/s are spread over at least 0.25s
+        self.assertGreaterEqual(report["duration"], 0.25)
+
+    def test_handler_complete_other_session(self):
+        from skill_demo.load_test import LoadTest
+        bus = FakeBus()
+        load_test = LoadTest(bus, ["one"], users=1, timeout=0.2)
+        bus.on("recognizer_loop:utterance", lambda m: bus.emit(
+            Message("mycroft.skill.handler.complete", {},
+                    {"demo_session": "other"})))
+        report = load_test.run(10)
+        self.assertEqual(report["timeouts"], 1)
+        self.assertEqual(report["completed"], 0)
+
+
+if __name__ == '__main__':
+    pytest.main()
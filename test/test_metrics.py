@@ -0,0 +1,91 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import unittest
+import pytest
+
+from os.path import getsize, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import monotonic
+
+
+class TestMetrics(unittest.TestCase):
+    def test_step_timeline(self):
+        from skill_demo.metrics import StepTimeline, SYNTHESIS_READY, \
+            PLAYBACK_START, PLAYBACK_END, PROMPT_EMITTED, PROMPT_HANDLED, \
+            AUDIO_END
+        timeline = StepTimeline("session", 1, "what time is it?", "en-us")
+        start = monotonic()
+        timeline.mark(SYNTHESIS_READY, start + 0.1)
+        timeline.mark(PLAYBACK_START, start + 0.1)
+        timeline.mark(PLAYBACK_END, start + 1.1)
+        timeline.mark(PROMPT_EMITTED, start + 1.2)
+        timeline.mark(PROMPT_HANDLED, start + 1.7)
+        timeline.mark(AUDIO_END, start + 3.2)
+        timeline.data["outcome"] = "handled"
+        record = timeline.as_dict()
+        self.assertEqual(record["session_id"], "session")
+        self.assertEqual(record["index"], 1)
+        self.assertEqual(record["prompt"], "what time is it?")
+        self.assertEqual(record["outcome"], "handled")
+        self.assertAlmostEqual(record["synthesis_wait"], 0.1, 2)
+        self.assertAlmostEqual(record["playback_time"], 1.0, 2)
+        self.assertAlmostEqual(record["handler_latency"], 0.5, 2)
+        self.assertAlmostEqual(record["audio_end_latency"], 2.0, 2)
+        json.dumps(record)
+
+        # Missing events are reported as None
+        record = StepTimeline("session", 0, "test", "en-us").as_dict()
+        self.assertIsNone(record["handler_latency"])
+        self.assertIsNone(record["synthesis_wait"])
+
+    def test_metrics_log(self):
+        from skill_demo.metrics import MetricsLog
+        test_dir = mkdtemp()
+        log = MetricsLog(join(test_dir, "metrics", "steps.jsonl"))
+        log.write({"index": 0})
+        log.write({"index": 1})
+        with open(log.path) as f:
+            lines = [json.loads(line) for line in f.readlines()]
+        self.assertEqual(lines, [{"index": 0}, {"index": 1}])
+
+        # The log is rotated once it reaches `max_size`
+        log.max_size = getsize(log.path)
+        log.write({"index": 2})
+        with open(f"{log.path}.1") as f:
+            self.assertEqual(len(f.readlines()), 2)
+        with open(log.path) as f:
+            lines = [json.loads(line) for line in f.readlines()]
+        self.assertEqual(lines, [{"index": 2}])
+        rmtree(test_dir)
+
+
+if __name__ == '__main__':
+    pytest.main()
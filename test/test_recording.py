@@ -0,0 +1,155 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from time import monotonic, sleep
+
+from ovos_bus_client import Message
+from ovos_utils.messagebus import FakeBus
+
+
+def _prompt(utterance, session_id="session"):
+    from skill_demo.session import DEMO_SESSION_KEY, DEMO_USERNAME
+    return Message("recognizer_loop:utterance",
+                   {"utterances": [utterance], "lang": "en-us"},
+                   {DEMO_SESSION_KEY: session_id, "username": DEMO_USERNAME})
+
+
+def _speak(utterance, username="user", session_id="session"):
+    from skill_demo.session import DEMO_SESSION_KEY
+    return Message("speak", {"utterance": utterance},
+                   {DEMO_SESSION_KEY: session_id, "username": username})
+
+
+class TestRecording(unittest.TestCase):
+    def _record(self, bus):
+        from skill_demo.recording import DemoRecorder
+        from skill_demo.session import DEMO_USERNAME
+        recorder = DemoRecorder(bus, "session")
+        recorder.start()
+        bus.emit(_speak("starting demo"))
+        bus.emit(Message("recognizer_loop:audio_output_start"))
+        bus.emit(Message("recognizer_loop:audio_output_end"))
+        prompt = _prompt("what time is it")
+        bus.emit(prompt)
+        sleep(0.05)
+        bus.emit(prompt.forward("mycroft.skill.handler.complete"))
+        response = prompt.forward("mycroft.skill.handler.complete")
+        response.context["user_profiles"] = [{"units": {"time": 24}}]
+        bus.emit(response)
+        # Speech responding to the prompt is not a prompt event
+        bus.emit(_speak("it is noon", DEMO_USERNAME))
+        bus.emit(Message("recognizer_loop:audio_output_start"))
+        bus.emit(Message("recognizer_loop:audio_output_end"))
+        # Other sessions' traffic is not recorded
+        bus.emit(_prompt("what time is it", "other"))
+        recorder.stop()
+        bus.emit(_prompt("not recorded"))
+        return recorder
+
+    def test_record_and_load(self):
+        from os.path import join
+        from tempfile import mkdtemp
+        from skill_demo.recording import load_recording
+        from skill_demo.session import DEMO_SESSION_KEY
+        bus = FakeBus()
+        recorder = self._record(bus)
+        records = recorder.records
+        msg_types = [r[1] for r in records]
+        self.assertEqual(msg_types[:4], ["speak",
+                                         "recognizer_loop:audio_output_start",
+                                         "recognizer_loop:audio_output_end",
+                                         "recognizer_loop:utterance"])
+        self.assertNotIn("it is noon",
+                         [r[2].get("utterance") for r in records])
+        self.assertEqual(msg_types.count("recognizer_loop:utterance"), 1)
+        self.assertGreaterEqual(records[4][0] - records[3][0], 0.05)
+        for record in records:
+            self.assertNotIn(DEMO_SESSION_KEY, record[3])
+
+        path = join(mkdtemp(), "demo.rec.gz")
+        recorder.save(path)
+        self.assertEqual(load_recording(path), records)
+
+    def test_replay(self):
+        from skill_demo.recording import DemoReplay
+        from skill_demo.session import DEMO_SESSION_KEY
+        records = self._record(FakeBus()).records
+        bus = FakeBus()
+        received = list()
+        for msg_type in ("mycroft.skill.handler.complete",
+                         "recognizer_loop:audio_output_start",
+                         "recognizer_loop:audio_output_end"):
+            bus.on(msg_type, lambda m: received.append((monotonic(), m)))
+        replay = DemoReplay(bus, records)
+        replay.start()
+
+        # Responses are sent to the live session as fast as possible
+        start = monotonic()
+        bus.emit(_prompt("what time is it", "live"))
+        self.assertTrue(replay.wait_idle(1))
+        self.assertEqual([m.msg_type for _, m in received],
+                         ["mycroft.skill.handler.complete",
+                          "mycroft.skill.handler.complete",
+                          "recognizer_loop:audio_output_start",
+                          "recognizer_loop:audio_output_end"])
+        self.assertLess(received[-1][0] - start, 0.05)
+        for _, message in received:
+            self.assertEqual(message.context[DEMO_SESSION_KEY], "live")
+        self.assertEqual(received[1][1].context["user_profiles"],
+                         [{"units": {"time": 24}}])
+
+        # Unrecorded speech is answered with audio events
+        received.clear()
+        bus.emit(_speak("something else", session_id="live"))
+        self.assertTrue(replay.wait_idle(1))
+        self.assertEqual([m.msg_type for _, m in received],
+                         ["recognizer_loop:audio_output_start",
+                          "recognizer_loop:audio_output_end"])
+
+        # Unrecorded prompts are not answered
+        received.clear()
+        bus.emit(_prompt("unknown", "live"))
+        self.assertTrue(replay.wait_idle(1))
+        self.assertEqual(received, [])
+        replay.shutdown()
+
+        # Recorded delays are scaled
+        replay = DemoReplay(bus, records, 0.5)
+        replay.start()
+        start = monotonic()
+        bus.emit(_prompt("what time is it", "live"))
+        self.assertTrue(replay.wait_idle(1))
+        self.assertGreaterEqual(received[0][0] - start, 0.025)
+        self.assertEqual(replay.replayed, 4)
+        replay.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
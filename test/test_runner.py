@@ -0,0 +1,148 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from mock import Mock
+from threading import Event, current_thread, enumerate as enumerate_threads
+from time import monotonic, sleep
+
+
+class TestDemoRunner(unittest.TestCase):
+    def test_deadlines_single_thread(self):
+        from skill_demo.runner import DemoRunner
+        runner = DemoRunner()
+        threads = set()
+        done = {idx: Event() for idx in range(20)}
+
+        def get_step(idx):
+            calls = [0]
+
+            def step():
+                threads.add(current_thread().name)
+                calls[0] += 1
+                if calls[0] == 3:
+                    done[idx].set()
+                    return None
+                return monotonic() + 0.01
+            return step
+
+        for idx in done:
+            runner.start(idx, get_step(idx))
+        for event in done.values():
+            self.assertTrue(event.wait(2))
+        self.assertEqual(threads, {"demo_runner"})
+        self.assertEqual(len(runner), 0)
+        runner.shutdown()
+
+    def test_notify_cancel(self):
+        from skill_demo.runner import DemoRunner
+        runner = DemoRunner()
+        called = Event()
+
+        def step():
+            called.set()
+            # Only advance again when notified
+            return monotonic() + 60
+
+        runner.start("task", step)
+        self.assertTrue(called.wait(1))
+        called.clear()
+        self.assertFalse(called.wait(0.1))
+        runner.notify("task")
+        self.assertTrue(called.wait(1))
+        self.assertIn("task", runner)
+
+        called.clear()
+        runner.cancel("task")
+        runner.notify("task")
+        self.assertFalse(called.wait(0.1))
+        self.assertNotIn("task", runner)
+        runner.shutdown()
+
+    def test_step_exception(self):
+        from skill_demo.runner import DemoRunner
+        runner = DemoRunner()
+        called = Event()
+
+        def step():
+            called.set()
+            raise RuntimeError("step failed")
+
+        runner.start("task", step)
+        self.assertTrue(called.wait(1))
+        # Failed task is removed; runner keeps running
+        ran = Event()
+        runner.start("other", lambda: ran.set())
+        self.assertTrue(ran.wait(1))
+        self.assertNotIn("task", runner)
+        runner.shutdown()
+
+
+
+class TestPlaybackWatcher(unittest.TestCase):
+    def test_watch(self):
+        import sys
+        from subprocess import Popen
+        from skill_demo.runner import PlaybackWatcher
+        watcher = PlaybackWatcher(interval=0.01)
+        exited = {idx: Event() for idx in range(5)}
+        processes = [Popen([sys.executable, "-c",
+                            f"import time; time.sleep({0.1 * idx})"])
+                     for idx in exited]
+        for idx, process in enumerate(processes):
+            watcher.watch(process, exited[idx].set)
+        # One thread watches every process
+        self.assertEqual(len([t for t in enumerate_threads()
+                              if t.name == "demo_playback"]), 1)
+        for event in exited.values():
+            self.assertTrue(event.wait(5))
+        self.assertEqual(len(watcher), 0)
+
+        # The thread stops when idle and is started again when needed
+        for _ in range(100):
+            if not watcher._thread:
+                break
+            sleep(0.01)
+        self.assertIsNone(watcher._thread)
+        process = Popen([sys.executable, "-c", "pass"])
+        done = Event()
+        watcher.watch(process, done.set)
+        self.assertTrue(done.wait(5))
+
+        # Processes are not watched after shutdown
+        process = Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        watcher.watch(process, Mock())
+        watcher.shutdown()
+        self.assertEqual(len(watcher), 0)
+        process.kill()
+
+
+if __name__ == '__main__':
+    pytest.main()
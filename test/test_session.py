@@ -0,0 +1,171 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from ovos_bus_client import Message
+
+
+class TestDemoSession(unittest.TestCase):
+    def test_session_events(self):
+        from skill_demo.session import DemoSession, DEMO_SESSION_KEY
+        request = Message("test", context={"username": "user"})
+        session = DemoSession("user", "en-us", request)
+        self.assertEqual(session.message.context[DEMO_SESSION_KEY],
+                         session.session_id)
+        self.assertNotIn(DEMO_SESSION_KEY, request.context)
+
+        session.on_audio_stopped(Message("end"))
+        self.assertTrue(session.audio_output_done.is_set())
+        session.on_audio_started(Message("start"))
+        self.assertFalse(session.audio_output_done.is_set())
+
+        response = Message("complete")
+        session.on_handler_complete(response)
+        self.assertTrue(session.prompt_handled.is_set())
+        self.assertEqual(session.last_response, response)
+
+        session.prompt_handled.clear()
+        session.stop()
+        self.assertTrue(session.stopped.is_set())
+        self.assertTrue(session.prompt_handled.is_set())
+
+    def test_step_audio(self):
+        from skill_demo.session import DemoSession, DEMO_STEP_KEY
+        session = DemoSession("user", "en-us", Message("test"))
+        session.step_number = 1
+        previous = Message("audio", context={DEMO_STEP_KEY: 1})
+        session.on_audio_started(previous)
+        self.assertEqual(session.audio_playing, 1)
+
+        # Audio from an earlier step doesn't affect the current step
+        session.step_number = 2
+        current = Message("audio", context={DEMO_STEP_KEY: 2})
+        self.assertFalse(session.is_current_step(previous))
+        self.assertTrue(session.is_current_step(current))
+        self.assertTrue(session.is_current_step(Message("audio")))
+        session.on_audio_started(current)
+        self.assertEqual(session.audio_playing, 2)
+        session.on_audio_stopped(previous)
+        self.assertEqual(session.audio_playing, 1)
+        self.assertFalse(session.audio_output_done.is_set())
+        self.assertEqual(session.audio_segments, 0)
+        self.assertIsNone(session.audio_ended_at)
+        session.on_audio_stopped(current)
+        self.assertEqual(session.audio_playing, 0)
+        self.assertTrue(session.audio_output_done.is_set())
+        self.assertEqual(session.audio_segments, 1)
+
+        # Unmatched end events are ignored
+        session.on_audio_stopped(current)
+        self.assertEqual(session.audio_playing, 0)
+
+        # Late responses to an earlier step don't complete the current one
+        late = Message("complete", context={DEMO_STEP_KEY: 1,
+                                            "skill_id": "late"})
+        session.on_handler_complete(late)
+        session.on_mic_listen(late)
+        self.assertFalse(session.prompt_handled.is_set())
+        self.assertIsNone(session.last_response)
+        self.assertIsNone(session.handled_at)
+        session.on_handler_complete(current)
+        self.assertTrue(session.prompt_handled.is_set())
+        self.assertEqual(session.last_response, current)
+
+    def test_session_manager(self):
+        from skill_demo.session import DemoSession, DemoSessionManager, \
+            DEMO_SESSION_KEY
+        manager = DemoSessionManager()
+        self.assertIsNone(manager.get_session(Message("test")))
+        user_1 = DemoSession("user_1", "en-us", Message("test"))
+        manager.add(user_1)
+        # Single session gets un-attributed events
+        self.assertEqual(manager.get_session(Message("test")), user_1)
+
+        user_2 = DemoSession("user_2", "en-us", Message("test"))
+        manager.add(user_2)
+        self.assertEqual(len(manager), 2)
+        self.assertIn(user_1.session_id, manager)
+        self.assertIsNone(manager.get_session(Message("test")))
+        self.assertEqual(manager.get_session(
+            Message("test", context={"username": "user_2"})), user_2)
+        self.assertEqual(manager.get_session(
+            Message("test", context={"username": "demo",
+                                     DEMO_SESSION_KEY: user_1.session_id})),
+            user_1)
+        self.assertEqual(manager.get_user_sessions("user_1"), [user_1])
+
+        manager.remove(user_1)
+        self.assertIsNone(manager.get_session(
+            Message("test", context={DEMO_SESSION_KEY: user_1.session_id})))
+        self.assertEqual(manager.get_session(Message("test")), user_2)
+
+    def test_get_prompt_context(self):
+        from skill_demo.session import get_prompt_context, DEMO_SESSION_KEY
+        context = get_prompt_context("demo_1", "session",
+                                     context={"lang": "en-us"})
+        self.assertEqual(context, {"lang": "en-us",
+                                   "username": "demo_1",
+                                   "neon_should_respond": True,
+                                   "source": ["demo"],
+                                   "destination": ["skills"],
+                                   DEMO_SESSION_KEY: "session"})
+
+        # Profiles are copied for other users and reused otherwise
+        profile = {"user": {"username": "demo_1", "email": ""},
+                   "speech": {"stt_language": "en-us"}}
+        context = get_prompt_context("demo_1", "session", profile)
+        self.assertIs(context['user_profiles'][0], profile)
+        context = get_prompt_context("demo_2", "session", profile)
+        self.assertEqual(context['user_profiles'][0]['user'],
+                         {"username": "demo_2", "email": ""})
+        self.assertEqual(profile['user']['username'], "demo_1")
+
+    def test_get_step_outcome(self):
+        from skill_demo.demo_script import DemoStep, ERROR, HANDLED, \
+            TIMEOUT, UNEXPECTED
+        from skill_demo.session import get_step_outcome
+        step = DemoStep("what time is it?", expect_skill="skill-date-time")
+        expected = Message("mycroft.skill.handler.complete", {},
+                           {"skill_id": "skill-date-time"})
+        other = Message("mycroft.skill.handler.complete", {},
+                        {"skill_id": "skill-other"})
+        failed = Message("mycroft.skill.handler.complete",
+                         {"exception": "failed"},
+                         {"skill_id": "skill-date-time"})
+        self.assertEqual(get_step_outcome(step, False, None), TIMEOUT)
+        self.assertEqual(get_step_outcome(step, True, None), HANDLED)
+        self.assertEqual(get_step_outcome(step, True, expected), HANDLED)
+        self.assertEqual(get_step_outcome(step, True, other), UNEXPECTED)
+        self.assertEqual(get_step_outcome(step, True, failed), ERROR)
+        self.assertEqual(get_step_outcome(None, True, other), HANDLED)
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -28,12 +28,30 @@
 
 import pytest
 
-from mock import Mock
+from mock import Mock, patch
+from neon_utils.user_utils import get_user_prefs
 from ovos_bus_client import Message
 from neon_minerva.tests.skill_unit_test_base import SkillTestCase
 
 
 class TestSkill(SkillTestCase):
+    def setUp(self):
+        super().setUp()
+        # Settings changed by a test are restored even if it fails
+        settings = patch.dict(self.skill.settings)
+        settings.start()
+        self.addCleanup(settings.stop)
+
+    def _patch_skill(self, **attrs):
+        """
+        Replace skill attributes until the end of the current test.
+        :param attrs: attribute names and values to set on the skill
+        """
+        for name, value in attrs.items():
+            patcher = patch.object(self.skill, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     def test_00_skill_init(self):
         # Test any parameters expected to be set in init or initialize methods
         from neon_utils.skills import NeonSkill
@@ -41,6 +59,45 @@ class TestSkill(SkillTestCase):
         self.assertIsInstance(self.skill, NeonSkill)
         self.assertTrue(self.skill.prompt_on_start)
 
+        # Demo resources are initialized when first needed
+        self.assertFalse(self.skill._demos_initialized)
+        self.assertIsNone(self.skill._audio_cache)
+        self.assertFalse(
+            self.bus.ee.listeners("mycroft.skill.handler.complete"))
+        self.assertFalse(self.bus.ee.listeners("recognizer_loop:utterance"))
+        self.skill._init_demos()
+        self.skill._init_demos()
+        self.assertTrue(self.skill._demos_initialized)
+        self.assertIsNotNone(self.skill._audio_cache)
+        self.assertEqual(
+            len(self.bus.ee.listeners("mycroft.skill.handler.complete")), 1)
+
+    def test_prerender_on_ready(self):
+        from time import sleep
+        from ovos_plugin_manager.skills import find_skill_plugins
+        from ovos_utils.messagebus import FakeBus
+        from neon_minerva.skill import get_skill_object
+        bus = FakeBus()
+        bus.emitter = bus.ee
+        skill = get_skill_object(
+            skill_entrypoint=list(find_skill_plugins())[0],
+            skill_id="test_skill.ready", bus=bus)
+        skill.prerender_demos = Mock()
+        skill.ask_yesno = Mock(return_value=None)
+        # Nothing is loaded on ready if no demo is expected
+        skill.settings["prompt_on_start"] = False
+        skill.settings["kiosk_mode"] = False
+        bus.emit(Message("mycroft.ready"))
+        sleep(0.1)
+        skill.prerender_demos.assert_not_called()
+        self.assertFalse(skill._demos_initialized)
+
+        skill.settings["kiosk_mode"] = True
+        bus.emit(Message("mycroft.ready"))
+        sleep(0.1)
+        skill.prerender_demos.assert_called_once()
+        skill.shutdown()
+
     def test_skill_show_demo_prompt_no_response(self):
         def ask_yesno(dialog):
             if dialog == "ask_demo":
@@ -119,27 +176,843 @@ class TestSkill(SkillTestCase):
         default_handle_show_demo = self.skill.handle_show_demo
         self.skill.handle_show_demo = Mock()
 
+        default_update_skill_settings = self.skill.update_skill_settings
+        self.skill.update_skill_settings = Mock()
+
         message = Message("mycroft.ready",
                           context={"neon_should_respond": True})
         self.skill._show_demo_prompt(message)
         self.skill.handle_show_demo.assert_called_with(message)
-        self.assertFalse(self.skill.prompt_on_start)
-        self.assertFalse(self.skill.settings["prompt_on_start"])
+        # Accepting the demo leaves the prompt setting as it was
+        self.skill.update_skill_settings.assert_not_called()
 
         self.skill.ask_yesno = default_ask_yesno
         self.skill.handle_show_demo = default_handle_show_demo
+        self.skill.update_skill_settings = default_update_skill_settings
 
     def test_show_demo_valid(self):
-        self.skill._speak_prompt = Mock()
-        self.skill._send_prompt = Mock()
+        from skill_demo.session import DemoState
+        self._patch_skill(_speak_prompt=Mock(return_value=None))
+
+        def send_prompt(session, message):
+            self.assertEqual(session.state, DemoState.HANDLING)
+            self.assertEqual(message.data["utterances"],
+                             [session.prompt.lower()])
+            # Simulate a handled prompt with a spoken response
+            session.on_handler_complete(message)
+            session.on_audio_stopped(message)
+
+        self._patch_skill(_send_prompt=Mock(side_effect=send_prompt))
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 0.01
+        self._patch_skill(_settle_time=0.0)
+        metrics = list()
+        self.bus.on("neon.demo.metrics", metrics.append)
         msg = Message("recognizer_loop:utterance",
-                      context={"neon_should_respond": True})
+                      context={"neon_should_respond": True,
+                               "username": "test_user"})
         self.skill.handle_show_demo(msg)
-        self.skill.speak_dialog.assert_any_call("starting_demo")
+        self.assertEqual(self.skill.speak_dialog.call_args_list[0][0][0],
+                         "starting_demo")
+        session = self.skill._active_demos.get_session(msg)
+        self.assertTrue(session.finished.wait(5))
         args = self.skill.speak_dialog.call_args
         self.assertEqual(args[0][0], "finished_demo")
+        self.assertEqual(self.skill._speak_prompt.call_count,
+                         len(session.prompts))
+        self.assertEqual(self.skill._send_prompt.call_count,
+                         len(session.prompts))
+        self.assertEqual(len(self.skill._active_demos), 0)
+        # Metrics emitted for every step
+        self.assertEqual(len(metrics), len(session.prompts))
+        self.assertEqual([m.data["index"] for m in metrics],
+                         list(range(len(session.prompts))))
+        self.assertTrue(all(m.data["outcome"] == "handled" for m in metrics))
+        self.assertIsNotNone(metrics[0].data["handler_latency"])
+        self.bus.remove("neon.demo.metrics", metrics.append)
+
+    def test_run_history(self):
+        from os.path import join
+        from time import sleep
+        from skill_demo.history import RunHistory
+        from skill_demo.version import __version__
+        self._patch_skill(_history=RunHistory(
+            join(self.skill.file_system.path, "history", "runs.db")))
+        self._patch_skill(_speak_prompt=Mock(return_value=None))
+
+        def send_prompt(session, message):
+            response = message.forward("mycroft.skill.handler.complete")
+            response.context["skill_id"] = f"skill_{session.index}"
+            session.on_handler_complete(response)
+
+        self._patch_skill(_send_prompt=Mock(side_effect=send_prompt))
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["record_metrics"] = False
+        self.skill.settings["speak_timeout"] = 0.01
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "history_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        self.assertTrue(session.finished.wait(5))
+        for _ in range(50):
+            if self.skill.get_history_report()["runs"]:
+                break
+            sleep(0.05)
+
+        responses = list()
+        self.bus.once("neon.demo.history.response", responses.append)
+        self.bus.emit(Message("neon.demo.history", {"limit": 2}))
+        report = responses[0].data
+        self.assertEqual(report["runs"], 1)
+        self.assertEqual(len(report["slowest_prompts"]), 2)
+        self.assertEqual(sorted(s["skill_id"] for s in report["skills"]),
+                         sorted(f"skill_{idx}"
+                                for idx in range(len(session.prompts))))
+        self.assertEqual(report["versions"][0]["version"], __version__)
+        self.assertEqual(report["versions"][0]["timeout_rate"], 0.0)
+
+    def test_show_demo_structured(self):
+        from os.path import join
+        with open(join(self.skill.file_system.path, "test_demo.yaml"),
+                  "w") as f:
+            f.write("""steps:
+  - prompt: one
+    max_latency: 0.1
+    next:
+      timeout: three
+  - prompt: two
+  - id: three
+    prompt: three
+    wait_for_audio: false
+""")
+        self._patch_skill(_speak_prompt=Mock(return_value=None))
+        sent = list()
+
+        def send_prompt(session, message):
+            sent.append(session.prompt)
+            if session.prompt != "one":
+                session.on_handler_complete(message)
+
+        self._patch_skill(_send_prompt=Mock(side_effect=send_prompt))
+        self.skill.settings["filename"] = "test_demo.yaml"
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 0.01
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "structured_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        self.assertTrue(session.finished.wait(5))
+        # "two" is skipped since "one" timed out
+        self.assertEqual(sent, ["one", "three"])
+        self.assertEqual(session.outcome, "handled")
+
+    def test_show_demo_no_wait_for_audio(self):
+        from os.path import join
+        from time import sleep
+        with open(join(self.skill.file_system.path, "no_wait_demo.yaml"),
+                  "w") as f:
+            f.write("""steps:
+  - prompt: one
+    wait_for_audio: false
+  - prompt: two
+""")
+        spoken = list()
+        sent = list()
+
+        def speak_prompt(session, prompt, prompter, wav_file=None):
+            spoken.append(prompt)
+            session.audio_output_done.set()
+
+        def send_prompt(session, message):
+            sent.append(message)
+            session.on_handler_complete(message)
+            if session.prompt == "one":
+                # Response audio starts and outlasts the step
+                self.skill._audio_started(Message(
+                    "recognizer_loop:audio_output_start",
+                    context=message.context))
+
+        self._patch_skill(_speak_prompt=Mock(side_effect=speak_prompt))
+        self._patch_skill(_send_prompt=Mock(side_effect=send_prompt))
+        self.skill.settings["filename"] = "no_wait_demo.yaml"
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 5
+        self._patch_skill(_settle_time=0.0)
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "no_wait_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        # Intro was spoken
+        session.audio_output_done.set()
+        self.skill._runner.notify(session.session_id)
+        for _ in range(100):
+            if session.index == 1:
+                break
+            sleep(0.01)
+        # The next prompt isn't played over the earlier response
+        sleep(0.1)
+        self.assertEqual(session.index, 1)
+        self.assertEqual(spoken, ["one"])
+        self.assertEqual(session.audio_playing, 1)
+
+        self.skill._audio_stopped(Message(
+            "recognizer_loop:audio_output_end", context=sent[0].context))
+        self.assertTrue(session.finished.wait(5))
+        self.assertEqual(spoken, ["one", "two"])
+        self.assertNotEqual(sent[0].context["demo_step"],
+                            sent[1].context["demo_step"])
+        # Late audio from the first step didn't count toward the second
+        self.assertEqual(session.audio_segments, 0)
+
+    def test_show_demo_repeated_failure(self):
+        self._patch_skill(
+            _queue_audio=Mock(side_effect=RuntimeError("failed")))
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 0.01
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "failing_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        # Failing to recover from an error finishes the demo
+        self.assertTrue(session.finished.wait(5))
+        self.assertEqual(self.skill._queue_audio.call_count, 2)
+        self.assertIsNone(self.skill._active_demos.get_session(msg))
+        self.skill.speak_dialog.assert_called_with("finished_demo",
+                                                   message=session.message)
+
+    def test_show_demo_playback_exit(self):
+        import sys
+        from os.path import join
+        from subprocess import Popen
+        from time import monotonic, sleep
+
+        def get_tts(sentence, output_file):
+            with open(output_file, 'w') as f:
+                f.write(sentence)
+            return output_file, None
+
+        tts = Mock(lang="en-us", voice="test", config={"module": "test"})
+        tts.get_tts = Mock(side_effect=get_tts)
+        self._patch_skill(_get_demo_tts=Mock(return_value=tts))
+        self._patch_skill(_speak_prompt=Mock(
+            side_effect=lambda *_, **__: Popen(
+                [sys.executable, "-c", "import time; time.sleep(0.2)"])))
+        self._patch_skill(_send_prompt=Mock(
+            side_effect=lambda session, message:
+            session.on_handler_complete(message)))
+        with open(join(self.skill.file_system.path, "exit_demo.txt"),
+                  "w") as f:
+            f.write("what time is it\n")
+        self.skill.settings["filename"] = "exit_demo.txt"
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 10
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "exit_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        start = monotonic()
+        # Intro was spoken
+        session.audio_output_done.set()
+        self.skill._runner.notify(session.session_id)
+        # The prompt is sent as soon as playback exits
+        for _ in range(200):
+            if self.skill._send_prompt.called:
+                break
+            sleep(0.01)
+        self.skill._send_prompt.assert_called_once()
+        self.assertLess(monotonic() - start, 5)
+        session.stop()
+        self.assertTrue(session.finished.wait(5))
+
+    def test_show_demo_streaming(self):
+        from os.path import join
+        prompt = "Tell me a joke about computers, and then tell me " \
+                 "another joke about the weather. Then what time is it?"
+        with open(join(self.skill.file_system.path, "stream_demo.txt"),
+                  "w") as f:
+            f.write(f"{prompt}\nhello\n")
+        rendered = list()
+
+        def get_tts(sentence, output_file):
+            rendered.append(sentence)
+            with open(output_file, 'w') as f:
+                f.write(sentence)
+            return output_file, None
+
+        tts = Mock(lang="en-us", voice="test", config={"module": "test"})
+        tts.get_tts = Mock(side_effect=get_tts)
+        self._patch_skill(_get_demo_tts=Mock(return_value=tts))
+        played = list()
+
+        def speak_prompt(session, text, prompter, wav_file=None):
+            with open(wav_file) as f:
+                played.append(f.read())
+            return Mock(poll=Mock(return_value=0))
+
+        sent = list()
+
+        def send_prompt(session, message):
+            sent.append(message.data["utterances"][0])
+            session.on_handler_complete(message)
+
+        self._patch_skill(_speak_prompt=Mock(side_effect=speak_prompt))
+        self._patch_skill(_send_prompt=Mock(side_effect=send_prompt))
+        self.skill.settings["filename"] = "stream_demo.txt"
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 0.01
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "stream_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        self.assertTrue(session.finished.wait(5))
+        # Long prompts are played in chunks, then sent once
+        self.assertGreater(len(played), 2)
+        self.assertEqual(" ".join(played[:-1]), prompt)
+        self.assertEqual(played[-1], "hello")
+        self.assertEqual(rendered, played)
+        self.assertEqual(sent, [prompt.lower(), "hello"])
+
+        # Whole prompts are played if streaming is disabled
+        played.clear()
+        self.skill.settings["stream_prompts"] = False
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        self.assertTrue(session.finished.wait(5))
+        self.assertEqual(played, [prompt, "hello"])
+
+    def test_show_demo_batched(self):
+        from os.path import join
+        prompts = ["What is your name, and what is your quest? What is "
+                   "your favorite color?", "hello", "goodbye"]
+        with open(join(self.skill.file_system.path, "batch_demo.txt"),
+                  "w") as f:
+            f.write("\n".join(prompts))
+
+        class BatchTTS:
+            lang = "en-us"
+            voice = "test"
+            config = {"module": "test-batch"}
+
+            @staticmethod
+            def get_tts_batch(sentences, output_files):
+                batches.append(sentences)
+                for sentence, output_file in zip(sentences, output_files):
+                    with open(output_file, 'w') as f:
+                        f.write(sentence)
+                return [(output_file, None) for output_file in output_files]
+
+            get_tts = Mock(side_effect=lambda sentence, output_file:
+                           BatchTTS.get_tts_batch([sentence],
+                                                  [output_file])[0])
+
+        batches = list()
+        self._patch_skill(_get_demo_tts=Mock(return_value=BatchTTS()))
+        played = list()
+
+        def speak_prompt(session, text, prompter, wav_file=None):
+            with open(wav_file) as f:
+                played.append(f.read())
+            return Mock(poll=Mock(return_value=0))
+
+        self._patch_skill(_speak_prompt=Mock(side_effect=speak_prompt))
+        self._patch_skill(_send_prompt=Mock(
+            side_effect=lambda session, message:
+            session.on_handler_complete(message)))
+        self.skill.settings["filename"] = "batch_demo.txt"
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 0.01
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "batch_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        self.assertTrue(session.finished.wait(5))
+        # The first look-ahead window is rendered individually and the
+        # rest whole in one call
+        self.assertEqual(batches[-1], prompts[2:])
+        self.assertEqual(played, prompts)
+        self.assertEqual([c[0][0] for c in BatchTTS.get_tts.call_args_list],
+                         prompts[:2])
+
+    def test_show_demo_profile(self):
+        from os.path import join
+        with open(join(self.skill.file_system.path, "profile_demo.txt"),
+                  "w") as f:
+            f.write("change my units to metric\nwhat is the weather\n")
+        self._patch_skill(_speak_prompt=Mock(return_value=None))
+        sent = list()
+
+        def send_prompt(session, message):
+            profile = message.context["user_profiles"][0]
+            sent.append(profile)
+            response = {**profile, "units": {**profile["units"],
+                                             "measure": "metric"}}
+            session.on_handler_complete(
+                Message("mycroft.skill.handler.complete",
+                        context={**message.context,
+                                 "user_profiles": [response]}))
+
+        self._patch_skill(_send_prompt=Mock(side_effect=send_prompt))
+        self.skill.settings["filename"] = "profile_demo.txt"
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 0.01
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "profile_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        self.assertTrue(session.finished.wait(5))
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(sent[0]["user"]["username"], "demo")
+        self.assertEqual(sent[0]["units"]["measure"], "imperial")
+        # Changes made by skills are sent with following prompts
+        self.assertEqual(sent[1]["units"]["measure"], "metric")
+        self.assertEqual(sent[1]["user"]["username"], "demo")
+        # The requesting user's profile and message are not modified
+        self.assertNotEqual(get_user_prefs(msg)["user"]["username"], "demo")
+        self.assertNotIn("demo_session", msg.context)
+
+    def test_kiosk_mode(self):
+        from time import sleep
+        from skill_demo.kiosk import KIOSK_TASK, KioskScheduler
+        self._patch_skill(_speak_prompt=Mock(return_value=None))
+        self._patch_skill(_send_prompt=Mock(
+            side_effect=lambda session, message:
+            session.on_handler_complete(message)))
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 0.01
+        self.skill.settings["kiosk_interval"] = 0.05
+        self.skill.settings["kiosk_idle_time"] = 0
+        self.skill.settings["kiosk_max_load"] = 100
+        self._patch_skill(_settle_time=0.0)
+
+        def get_loops():
+            return len([c for c in self.skill.speak_dialog.call_args_list
+                        if c[0][0] == "finished_demo"])
+
+        self.skill.start_kiosk()
+        self.addCleanup(self.skill.stop_kiosk)
+        self.assertIn(KIOSK_TASK, self.skill._runner)
+        for _ in range(100):
+            if get_loops() >= 2:
+                break
+            sleep(0.05)
+        self.assertGreaterEqual(get_loops(), 2)
+        self.skill.stop_kiosk()
+        self.assertIsNone(self.skill._kiosk)
+        self.assertNotIn(KIOSK_TASK, self.skill._runner)
+        for _ in range(20):
+            if not len(self.skill._active_demos):
+                break
+            sleep(0.05)
+        self.assertEqual(len(self.skill._active_demos), 0)
+        loops = get_loops()
+        sleep(0.2)
+        self.assertEqual(get_loops(), loops)
+
+        # Starting a loop doesn't block other demos on the runner
+        from threading import Event
+        start_demo = self.skill._start_demo
+        blocker = Event()
+
+        def slow_start(message):
+            blocker.wait(5)
+            return start_demo(message)
+
+        self._patch_skill(_start_demo=Mock(side_effect=slow_start))
+        self.skill.start_kiosk()
+        probed = Event()
+        self.skill._runner.start("test_probe", probed.set)
+        self.assertTrue(probed.wait(1))
+        self.assertTrue(self.skill._kiosk_starting)
+        self.skill.stop_kiosk()
+        blocker.set()
+        for _ in range(20):
+            if not self.skill._kiosk_starting and \
+                    not len(self.skill._active_demos):
+                break
+            sleep(0.05)
+        self.assertFalse(self.skill._kiosk_starting)
+        self.assertEqual(len(self.skill._active_demos), 0)
+        self.assertIsNone(self.skill._kiosk_session)
+
+        # Demo prompts aren't user activity; other utterances are
+        self._patch_skill(_kiosk=KioskScheduler())
+        self.skill._user_activity(Message("recognizer_loop:utterance",
+                                          context={"demo_session": "test"}))
+        self.assertIsNone(self.skill._kiosk.last_activity)
+        self.skill._user_activity(Message("recognizer_loop:utterance"))
+        self.assertIsNotNone(self.skill._kiosk.last_activity)
+        # Audio outside of a demo marks the device busy
+        self.skill._audio_started(Message("recognizer_loop:"
+                                          "audio_output_start"))
+        self.assertIsNotNone(self.skill._kiosk.audio_started)
+        self.skill._audio_stopped(Message("recognizer_loop:"
+                                          "audio_output_end"))
+        self.assertIsNone(self.skill._kiosk.audio_started)
+
+    def test_show_demo_stop(self):
+        self._patch_skill(_speak_prompt=Mock(return_value=None))
+        self._patch_skill(_send_prompt=Mock())
+        self.skill.settings["adaptive_timing"] = False
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "stop_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        self.assertFalse(session.finished.wait(0.1))
+        with patch("skill_demo.dig_for_message") as dig_for_message:
+            dig_for_message.return_value = msg
+            self.skill.stop()
+        self.assertTrue(session.finished.wait(1))
+        self.assertEqual(self.skill.speak_dialog.call_args[0][0],
+                         "finished_demo")
+        self.skill._send_prompt.assert_not_called()
+
+    def test_show_demo_stop_interrupts(self):
+        import sys
+        from os.path import join
+        from subprocess import Popen
+        from threading import Event
+        from time import monotonic, sleep
+        from skill_demo.session import DemoState
+        release_tts = Event()
+
+        def get_tts(sentence, output_file):
+            if "joke" in sentence:
+                # Block synthesis until the test is finished
+                release_tts.wait(10)
+            with open(output_file, 'w') as f:
+                f.write(sentence)
+            return output_file, None
+
+        tts = Mock(lang="en-us", voice="test", config={"module": "test"})
+        tts.get_tts = Mock(side_effect=get_tts)
+        self._patch_skill(_get_demo_tts=Mock(return_value=tts))
+        playback = list()
+
+        def speak_prompt(session, text, prompter, wav_file=None):
+            playback.append(Popen([sys.executable, "-c",
+                                   "import time; time.sleep(30)"]))
+            return playback[-1]
+
+        self._patch_skill(_speak_prompt=Mock(side_effect=speak_prompt))
+        self._patch_skill(_send_prompt=Mock())
+        self.skill.settings["adaptive_timing"] = False
+        self.skill.settings["speak_timeout"] = 5
+        msg = Message("recognizer_loop:utterance",
+                      context={"neon_should_respond": True,
+                               "username": "interrupt_user"})
+
+        def stop_in_state(state):
+            self.skill.handle_show_demo(msg)
+            session = self.skill._active_demos.get_session(msg)
+            # Intro was spoken
+            session.audio_output_done.set()
+            self.skill._runner.notify(session.session_id)
+            timeout = monotonic() + 5
+            while session.state != state and monotonic() < timeout:
+                sleep(0.01)
+            self.assertEqual(session.state, state)
+            start = monotonic()
+            with patch("skill_demo.dig_for_message") as dig_for_message:
+                dig_for_message.return_value = msg
+                self.skill.stop()
+            self.assertTrue(session.finished.wait(0.5))
+            self.assertLess(monotonic() - start, 0.5)
+            self.assertIsNone(self.skill._active_demos.get_session(msg))
+            return session
+
+        # Playback is killed when the demo is stopped
+        with open(join(self.skill.file_system.path, "play_demo.txt"),
+                  "w") as f:
+            f.write("what time is it\n")
+        self.skill.settings["filename"] = "play_demo.txt"
+        session = stop_in_state(DemoState.PLAYING)
+        self.assertEqual(len(playback), 1)
+        self.assertIsNotNone(playback[0].poll())
+        self.skill._send_prompt.assert_not_called()
+
+        # Synthesis in progress is abandoned when the demo is stopped
+        self.skill._speak_prompt.reset_mock()
+        with open(join(self.skill.file_system.path, "joke_demo.txt"),
+                  "w") as f:
+            f.write("tell me a joke\n")
+        self.skill.settings["filename"] = "joke_demo.txt"
+        session = stop_in_state(DemoState.SYNTHESIZING)
+        self.assertTrue(session.synthesizer.cancelled)
+        self.skill._speak_prompt.assert_not_called()
+        release_tts.set()
+
+    def test_adaptive_timing(self):
+        from os.path import join
+        from skill_demo.session import DemoSession
+        from skill_demo.timing import HANDLER, SPEECH
+        session = DemoSession("user", "en-us", Message("test"))
+        session.prompts = ["what time is it?"]
+        session.index = 0
+        self.assertEqual(self.skill._get_timeout(session, HANDLER, 30), 30)
+        self.assertEqual(self.skill._get_settle_time(session),
+                         self.skill._settle_time)
+
+        demo_file = join(self.skill.file_system.path, "timing_demo.txt")
+        session.timing = self.skill._get_timing_model(demo_file)
+        self.assertIs(session.timing,
+                      self.skill._get_timing_model(demo_file))
+        for _ in range(2):
+            session.emitted_at = 10.0
+            session.handled_at = 11.0
+            session.audio_ended_at = 13.0
+            session.audio_segments = 1
+            self.skill._record_step_timing(session)
+        self.assertLess(self.skill._get_timeout(session, HANDLER, 30), 30)
+        self.assertLess(self.skill._get_timeout(session, SPEECH, 30), 30)
+        # Settle time is skipped once the expected response was spoken
+        self.assertEqual(self.skill._get_settle_time(session), 0.0)
+        session.audio_segments = 0
+        self.assertEqual(self.skill._get_settle_time(session),
+                         self.skill._settle_time)
+
+    def test_get_outcome(self):
+        from skill_demo.demo_script import DemoScript
+        from skill_demo.session import DemoSession
+        session = DemoSession("user", "en-us", Message("test"))
+        script = Mock(spec=DemoScript)
+        script.steps = [Mock(expect_skill="skill-expected")]
+        script.__len__ = Mock(return_value=1)
+        session.script = script
+        session.index = 0
+        self.assertEqual(self.skill._get_outcome(session), "timeout")
+        session.on_mic_listen(Message("mycroft.mic.listen"))
+        self.assertEqual(self.skill._get_outcome(session), "handled")
+        session.on_handler_complete(Message(
+            "mycroft.skill.handler.complete", {"exception": "failed"}))
+        self.assertEqual(self.skill._get_outcome(session), "error")
+        session.on_handler_complete(Message(
+            "mycroft.skill.handler.complete", {},
+            {"skill_id": "skill-other"}))
+        self.assertEqual(self.skill._get_outcome(session), "unexpected")
+        session.on_handler_complete(Message(
+            "mycroft.skill.handler.complete", {},
+            {"skill_id": "skill-expected"}))
+        self.assertEqual(self.skill._get_outcome(session), "handled")
+
+    def test_get_demo_script(self):
+        from os.path import join
+        en_script = self.skill._get_demo_script()
+        self.assertTrue(en_script.path.endswith(join("locale", "en-us",
+                                                     "demo.txt")))
+        self.assertIs(self.skill._get_demo_script("en-us"), en_script)
+        uk_script = self.skill._get_demo_script("uk-ua")
+        self.assertTrue(uk_script.path.endswith(join("locale", "uk-ua",
+                                                     "demo.txt")))
+
+    @patch("skill_demo.prerender_prompts")
+    def test_prerender_demos(self, prerender_prompts):
+        from threading import Barrier, current_thread
+        prerender_prompts.return_value = 1
+        tts = Mock()
+        threads = set()
+        # Both languages must be loading at the same time to pass
+        barrier = Barrier(2, timeout=5)
+
+        def get_demo_tts(lang):
+            threads.add(current_thread().name)
+            barrier.wait()
+            return tts
+
+        self._patch_skill(_get_demo_tts=Mock(side_effect=get_demo_tts))
+        self.skill.prerender_demos()
+        self.skill._get_demo_tts.assert_any_call("en-us")
+        self.skill._get_demo_tts.assert_any_call("uk-ua")
+        self.assertEqual(prerender_prompts.call_count, 2)
+        for call in prerender_prompts.call_args_list:
+            self.assertEqual(call[0][0], tts)
+            self.assertEqual(call[0][2], self.skill._audio_cache)
+        self.assertEqual({c[0][3] for c in prerender_prompts.call_args_list},
+                         {"en-us", "uk-ua"})
+        # Languages are prepared in parallel
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(all(t.startswith("demo_prerender") for t in threads))
+
+        # Errors for one language don't stop others
+        prerender_prompts.reset_mock()
+        prerender_prompts.side_effect = [RuntimeError("failed"), 1]
+        barrier.reset()
+        self.skill.prerender_demos()
+        self.assertEqual(prerender_prompts.call_count, 2)
+
+    def test_get_demo_lang(self):
+        prefs = {"speech": {"stt_language": "en-us"}}
+        self.assertEqual(self.skill._get_demo_lang(Message("test"), prefs),
+                         "en-us")
+        # Request language is used before the user's language
+        self.assertEqual(self.skill._get_demo_lang(
+            Message("test", {"lang": "uk-UA"}), prefs), "uk-ua")
+        self.assertEqual(self.skill._get_demo_lang(
+            Message("test", context={"lang": "uk-ua"}), prefs), "uk-ua")
+        self.assertEqual(self.skill._get_demo_lang(
+            Message("test"), {"speech": {"stt_language": "uk-ua"}}), "uk-ua")
+        # Regional variants are matched
+        self.assertEqual(self.skill._get_demo_lang(
+            Message("test", {"lang": "en-gb"}), prefs), "en-us")
+        self.assertEqual(self.skill._get_demo_lang(
+            Message("test", {"lang": "uk"}), prefs), "uk-ua")
+        # Languages without a demo fall back
+        self.assertEqual(self.skill._get_demo_lang(
+            Message("test", {"lang": "fr-fr"}), prefs), "en-us")
+        self.assertEqual(self.skill._get_demo_lang(
+            Message("test", {"lang": "fr-fr"}), {"speech": {}}),
+            self.skill.core_lang)
+
+    def test_show_demo_lang(self):
+        self._patch_skill(_get_demo_tts=Mock(return_value=None))
+        self._patch_skill(_speak_prompt=Mock(return_value=None))
+        self._patch_skill(_send_prompt=Mock())
+        self.skill.settings["adaptive_timing"] = False
+        msg = Message("recognizer_loop:utterance", {"lang": "uk-ua"},
+                      {"neon_should_respond": True, "username": "uk_user"})
+        self.skill.handle_show_demo(msg)
+        session = self.skill._active_demos.get_session(msg)
+        self.assertEqual(session.lang, "uk-ua")
+        self.assertEqual(session.prompts,
+                         list(self.skill._get_demo_script("uk-ua").prompts))
+        self.skill._get_demo_tts.assert_called_once_with("uk-ua")
+        session.stop()
+        self.skill._runner.notify(session.session_id)
+        self.assertTrue(session.finished.wait(5))
+
+    def test_session_routing(self):
+        from skill_demo.session import DemoSession, DEMO_SESSION_KEY
+        user_1 = DemoSession("user_1", "en-us", Message("test"))
+        user_2 = DemoSession("user_2", "en-us", Message("test"))
+        self.skill._active_demos.add(user_1)
+        self.skill._active_demos.add(user_2)
+
+        response = Message("mycroft.skill.handler.complete",
+                           context={DEMO_SESSION_KEY: user_2.session_id})
+        self.skill._handler_complete(response)
+        self.assertFalse(user_1.prompt_handled.is_set())
+        self.assertTrue(user_2.prompt_handled.is_set())
+        self.assertEqual(user_2.last_response, response)
+
+        self.skill._audio_stopped(Message("recognizer_loop:audio_output_end",
+                                          context={DEMO_SESSION_KEY:
+                                                   user_1.session_id}))
+        self.assertTrue(user_1.audio_output_done.is_set())
+        self.assertFalse(user_2.audio_output_done.is_set())
+
+        with patch("skill_demo.dig_for_message") as dig_for_message:
+            dig_for_message.return_value = \
+                Message("stop", context={"username": "user_1"})
+            self.skill.stop()
+        self.assertTrue(user_1.stopped.is_set())
+        self.assertFalse(user_2.stopped.is_set())
+
+        self.skill._active_demos.remove(user_1)
+        self.skill._active_demos.remove(user_2)
+
+    def test_run_load_test(self):
+        prompts = list(self.skill._get_demo_script("en-us").prompts)
+        utterances = list()
+        responses = list()
+
+        def _respond(message):
+            utterances.append(message)
+            self.bus.emit(message.forward("mycroft.skill.handler.complete"))
+
+        self.bus.on("recognizer_loop:utterance", _respond)
+        self.bus.on("neon.demo.load_test.response", responses.append)
+        report = self.skill.run_load_test(
+            Message("neon.demo.load_test", {"users": 3, "timeout": 1}))
+        self.bus.remove("recognizer_loop:utterance", _respond)
+        self.assertEqual(report["users"], 3)
+        self.assertEqual(report["completed"], 3 * len(prompts))
+        self.assertEqual(report["timeouts"], 0)
+        self.assertEqual(responses[0].data, report)
+        # Prompts are sent with a demo profile, not the requesting user's
+        profile = utterances[0].context["user_profiles"][0]
+        self.assertEqual(profile["user"]["username"],
+                         utterances[0].context["username"])
+        self.assertEqual(profile["units"]["measure"], "imperial")
+        # No demo session is started and nothing is spoken
+        self.assertEqual(len(self.skill._active_demos), 0)
+        self.skill.speak.assert_not_called()
+
+    def test_run_health_sweep(self):
+        from time import sleep
+        prompts = list(self.skill._get_demo_script("en-us").prompts)
+        utterances = list()
+        responses = list()
+
+        def _respond(message):
+            utterances.append(message)
+            if message.data["utterances"][0] != prompts[0].lower():
+                self.bus.emit(message.forward(
+                    "mycroft.skill.handler.complete"))
+
+        self.bus.on("recognizer_loop:utterance", _respond)
+        self.bus.on("neon.demo.health_sweep.response", responses.append)
+        self.bus.emit(Message("neon.demo.health_sweep", {"timeout": 0.2}))
+        for _ in range(50):
+            if responses:
+                break
+            sleep(0.05)
+        self.bus.remove("recognizer_loop:utterance", _respond)
+        report = responses[0].data
+        self.assertEqual(len(utterances), len(prompts))
+        self.assertEqual([r["prompt"] for r in report["results"]], prompts)
+        self.assertEqual(report["results"][0]["status"], "fail")
+        self.assertEqual(report["passed"], len(prompts) - 1)
+        # Prompts are sent silently with a demo profile
+        context = utterances[0].context
+        self.assertTrue(context["cc_data"]["emit_response"])
+        self.assertEqual(context["user_profiles"][0]["units"]["measure"],
+                         "imperial")
+        self.assertEqual(len(self.skill._active_demos), 0)
+        self.skill.speak.assert_not_called()
+
+    def test_send_prompt(self):
+        from skill_demo.session import DemoSession
+        session = DemoSession("test_user", "en-us", Message("test"))
+        session.audio_output_done.set()
+        session.prompt_handled.set()
+        session.last_response = Message("response")
+        emitted = list()
+        self.bus.on("recognizer_loop:utterance", emitted.append)
+        prompt = Message("recognizer_loop:utterance", {"utterances": ["hi"]})
+        self.skill._send_prompt(session, prompt)
+        self.assertEqual(emitted, [prompt])
+        self.assertFalse(session.audio_output_done.is_set())
+        self.assertFalse(session.prompt_handled.is_set())
+        self.assertIsNone(session.last_response)
+        self.bus.remove("recognizer_loop:utterance", emitted.append)
+
+    @patch("ovos_utils.sound.play_audio")
+    def test_speak_prompt(self, play_audio):
+        from skill_demo.session import DemoSession
+        session = DemoSession("test_user", "en-us", Message("test"))
+        prompter = {"name": "demo", "gender": "female"}
+        # Skill-rendered audio is played by the skill
+        self.assertEqual(self.skill._speak_prompt(session, "hi", prompter,
+                                                  "/tmp/prompt.wav"),
+                         play_audio.return_value)
+        self.assertEqual(play_audio.call_args[0][0], "/tmp/prompt.wav")
+        self.skill.speak.assert_not_called()
+        # Else the prompt is spoken by the audio service
+        session.audio_output_done.set()
+        self.assertIsNone(self.skill._speak_prompt(session, "hi", prompter))
+        self.skill.speak.assert_called_once_with("hi", speaker=prompter,
+                                                 message=session.message)
+        self.assertFalse(session.audio_output_done.is_set())
 
-    # TODO: Implement tests for _get_demo_tts, _send_prompt, and _speak_prompt
+    # TODO: Implement tests for _get_demo_tts
 
 
 if __name__ == '__main__':
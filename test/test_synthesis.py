@@ -0,0 +1,311 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from os import listdir
+from os.path import isdir, isfile, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event
+from time import sleep
+from mock import Mock
+
+
+class TestSynthesis(unittest.TestCase):
+    def test_split_prompt(self):
+        from skill_demo.synthesis import split_prompt
+        self.assertEqual(split_prompt("what time is it"), ["what time is it"])
+        self.assertEqual(split_prompt("  hello. "), ["hello."])
+        prompt = "Tell me a joke about computers, and then tell me another " \
+                 "joke about the weather. Then, what time is it?"
+        chunks = split_prompt(prompt)
+        self.assertEqual(chunks, ["Tell me a joke about computers, and "
+                                  "then tell me another joke about the "
+                                  "weather.", "Then, what time is it?"])
+        self.assertEqual(" ".join(chunks), prompt)
+        # Short clauses are combined
+        self.assertEqual(split_prompt("One, two, three. Four!",
+                                      min_length=8),
+                         ["One, two,", "three. Four!"])
+        self.assertEqual(split_prompt("One, two, three. Four!",
+                                      min_length=1),
+                         ["One,", "two,", "three.", "Four!"])
+
+    def test_can_stream(self):
+        from skill_demo.synthesis import can_stream
+        tts = Mock(config={"module": "ovos-tts-plugin-piper"})
+        self.assertTrue(can_stream(tts))
+        tts.config["module"] = "neon-tts-plugin-audiofiles"
+        self.assertFalse(can_stream(tts))
+
+    def test_can_batch(self):
+        from skill_demo.synthesis import can_batch
+
+        class BatchTTS:
+            def get_tts_batch(self, sentences, wav_files):
+                pass
+
+        self.assertTrue(can_batch(BatchTTS()))
+        self.assertFalse(can_batch(Mock()))
+
+
+class TestPromptSynthesizer(unittest.TestCase):
+    prompts = ["one", "two", "three", "four"]
+
+    @staticmethod
+    def _get_tts(delay: float = 0.0):
+        def get_tts(sentence, output_file):
+            sleep(delay)
+            return f"{sentence}.wav", None
+
+        tts = Mock()
+        tts.get_tts = Mock(side_effect=get_tts)
+        return tts
+
+    def test_get_with_lookahead(self):
+        from skill_demo.synthesis import PromptSynthesizer
+        tts = self._get_tts()
+        synth = PromptSynthesizer(tts, self.prompts, lookahead=2)
+        self.assertEqual(synth.get(0, 5), "one.wav")
+        # Look-ahead window is rendered while the first prompt plays
+        synth._futures[(2, 0)].result(5)
+        self.assertEqual(tts.get_tts.call_count, 3)
+        self.assertNotIn((3, 0), synth._futures)
+        self.assertEqual(synth.get(1, 5), "two.wav")
+        self.assertEqual(synth.get(3, 5), "four.wav")
+        self.assertEqual(tts.get_tts.call_count, 4)
+        # Out of range index
+        self.assertIsNone(synth.get(4, 5))
+        synth.shutdown()
+
+    def test_chunked(self):
+        from skill_demo.synthesis import PromptSynthesizer
+        prompt = "This is a longer prompt, with more than one clause. " \
+                 "It is spoken in chunks."
+        tts = self._get_tts()
+        synth = PromptSynthesizer(tts, [prompt, "short"], lookahead=0,
+                                  chunked=True)
+        chunks = synth.get_chunks(0)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(synth.get(0, 5), f"{chunks[0]}.wav")
+        # All chunks of a prompt are queued together
+        self.assertEqual(synth.get(0, 5, 1), f"{chunks[1]}.wav")
+        self.assertEqual(tts.get_tts.call_count, 2)
+        self.assertEqual(synth.timings[0]["chunks"], 2)
+        self.assertFalse(synth.timings[0]["cached"])
+        self.assertEqual(synth.get_remaining(0), prompt)
+        self.assertEqual(synth.get_remaining(0, 1), chunks[1])
+        self.assertEqual(synth.get_chunks(1), ["short"])
+        self.assertIsNone(synth.get(0, 5, 2))
+        synth.release(0)
+        self.assertNotIn((0, 1), synth._futures)
+        synth.shutdown()
+
+        # Whole prompts are rendered if not chunked
+        synth = PromptSynthesizer(tts, [prompt], lookahead=0)
+        self.assertEqual(synth.get_chunks(0), [prompt])
+        self.assertEqual(synth.get(0, 5), f"{prompt}.wav")
+        synth.shutdown()
+
+    def test_batched(self):
+        from skill_demo.synthesis import PromptSynthesizer
+        from skill_demo.audio_cache import PromptAudioCache
+        cache_dir = mkdtemp()
+
+        def get_tts_batch(sentences, output_files):
+            for sentence, output_file in zip(sentences, output_files):
+                with open(output_file, 'w') as f:
+                    f.write(sentence)
+            return [(output_file, None) for output_file in output_files]
+
+        tts = Mock(config={"module": "test-tts"}, voice="default")
+        tts.get_tts = Mock(side_effect=lambda sentence, output_file:
+                           get_tts_batch([sentence], [output_file])[0])
+        tts.get_tts_batch = Mock(side_effect=get_tts_batch)
+        cache = PromptAudioCache(join(cache_dir, "cache"))
+        synth = PromptSynthesizer(tts, self.prompts[:2], lookahead=0,
+                                  cache=cache, lang="en-us")
+        synth.get(0, 5)
+        synth.shutdown()
+
+        # Uncached prompts are rendered in one call
+        synth = PromptSynthesizer(tts, self.prompts, lookahead=0,
+                                  cache=cache, lang="en-us", batched=True)
+        files = [synth.get(idx, 5) for idx in range(len(self.prompts))]
+        tts.get_tts_batch.assert_called_once()
+        self.assertEqual(tts.get_tts_batch.call_args[0][0],
+                         self.prompts[1:])
+        self.assertEqual(tts.get_tts.call_count, 1)
+        for prompt, file in zip(self.prompts, files):
+            with open(file) as f:
+                self.assertEqual(f.read(), prompt)
+        self.assertTrue(synth.timings[0]["cached"])
+        self.assertFalse(synth.timings[1]["cached"])
+        # Released prompts are not part of a new batch
+        synth.release(3)
+        self.assertEqual(synth.get(3, 5), files[3])
+        tts.get_tts_batch.assert_called_once()
+        synth.shutdown()
+
+        # The first look-ahead window doesn't wait for the batch
+        batch_started = Event()
+        release_batch = Event()
+
+        def blocking_batch(sentences, output_files):
+            batch_started.set()
+            release_batch.wait(5)
+            return get_tts_batch(sentences, output_files)
+
+        tts.get_tts_batch = Mock(side_effect=blocking_batch)
+        prompts = ["seven", "eight", "nine", "ten"]
+        synth = PromptSynthesizer(tts, prompts, lookahead=1, batched=True)
+        with open(synth.get(0, 1)) as f:
+            self.assertEqual(f.read(), "seven")
+        with open(synth.get(1, 1)) as f:
+            self.assertEqual(f.read(), "eight")
+        self.assertTrue(batch_started.wait(5))
+        self.assertEqual(tts.get_tts_batch.call_args[0][0], prompts[2:])
+        release_batch.set()
+        with open(synth.get(3, 5)) as f:
+            self.assertEqual(f.read(), "ten")
+        synth.shutdown()
+
+        # Prompts are rendered individually if the batch fails
+        tts.get_tts_batch.side_effect = RuntimeError("Batch Failed")
+        tts.get_tts.reset_mock()
+        synth = PromptSynthesizer(tts, ["five", "six"], lookahead=0,
+                                  batched=True)
+        with open(synth.get(1, 5)) as f:
+            self.assertEqual(f.read(), "six")
+        with open(synth.get(0, 5)) as f:
+            self.assertEqual(f.read(), "five")
+        self.assertEqual(tts.get_tts.call_count, 2)
+        synth.shutdown()
+        rmtree(cache_dir)
+
+    def test_cancel(self):
+        from skill_demo.synthesis import PromptSynthesizer
+        cancel = Event()
+        tts = self._get_tts(0.2)
+        synth = PromptSynthesizer(tts, self.prompts, lookahead=3,
+                                  cancel=cancel)
+        synth.prefetch(0)
+        cancel.set()
+        self.assertIsNone(synth.get(3, 5))
+        self.assertLessEqual(tts.get_tts.call_count, 1)
+        synth.shutdown()
+        self.assertFalse(synth._futures[(3, 0)].running())
+
+    def test_cached_audio(self):
+        from skill_demo.synthesis import PromptSynthesizer
+        from skill_demo.audio_cache import PromptAudioCache
+        cache_dir = mkdtemp()
+        audio = join(cache_dir, "audio.wav")
+        with open(audio, 'w') as f:
+            f.write("audio")
+
+        tts = self._get_tts()
+        tts.get_tts.side_effect = lambda *_: (audio, None)
+        tts.config = {"module": "test-tts"}
+        tts.voice = "default"
+        cache = PromptAudioCache(join(cache_dir, "cache"))
+        synth = PromptSynthesizer(tts, self.prompts, lookahead=0,
+                                  cache=cache, lang="en-us")
+        cached = synth.get(0, 5)
+        self.assertTrue(cached.startswith(cache.cache_dir))
+        self.assertEqual(tts.get_tts.call_count, 1)
+        synth.shutdown()
+
+        # Cached audio is used in a new demo run
+        synth = PromptSynthesizer(tts, self.prompts, lookahead=0,
+                                  cache=cache, lang="en-us")
+        self.assertEqual(synth.get(0, 5), cached)
+        self.assertEqual(tts.get_tts.call_count, 1)
+        synth.shutdown()
+        rmtree(cache_dir)
+
+    def test_synthesis_error(self):
+        from skill_demo.synthesis import PromptSynthesizer
+        tts = Mock()
+        tts.get_tts = Mock(side_effect=RuntimeError("TTS Failed"))
+        synth = PromptSynthesizer(tts, self.prompts, lookahead=0)
+        self.assertIsNone(synth.get(0, 5))
+        # Nothing is left in the buffer after a failure
+        self.assertEqual(len(synth._buffer), 0)
+        synth.shutdown()
+
+    def test_audio_buffer(self):
+        from skill_demo.audio_buffer import AudioBuffer
+        from skill_demo.audio_cache import PromptAudioCache
+        from skill_demo.synthesis import PromptSynthesizer
+
+        def get_tts(sentence, output_file):
+            with open(output_file, 'w') as f:
+                f.write(sentence)
+            return output_file, None
+
+        tts = Mock()
+        tts.voice = "test"
+        tts.config = {"module": "test"}
+        tts.get_tts = Mock(side_effect=get_tts)
+        buffer_dir = join(mkdtemp(), "buffer")
+        synth = PromptSynthesizer(tts, self.prompts, lookahead=0,
+                                  buffer=AudioBuffer(buffer_dir))
+        first = synth.get(0, 5)
+        self.assertTrue(first.startswith(buffer_dir))
+        self.assertTrue(isfile(first))
+        synth.get_future(1).result(5)
+        self.assertEqual(len(listdir(buffer_dir)), 2)
+        # Played audio is removed and rendered again if requested
+        synth.release(0)
+        self.assertFalse(isfile(first))
+        self.assertEqual(len(listdir(buffer_dir)), 1)
+        self.assertTrue(isfile(synth.get(0, 5)))
+        self.assertEqual(tts.get_tts.call_count, 3)
+        synth.shutdown()
+        self.assertFalse(isdir(buffer_dir))
+
+        # Cached audio is copied out of the buffer immediately
+        cache_dir = mkdtemp()
+        cache = PromptAudioCache(cache_dir)
+        synth = PromptSynthesizer(tts, self.prompts, lookahead=0,
+                                  cache=cache, lang="en-us",
+                                  buffer=AudioBuffer(buffer_dir))
+        cached = synth.get(0, 5)
+        self.assertTrue(cached.startswith(cache_dir))
+        self.assertEqual(listdir(buffer_dir), [])
+        synth.release(0)
+        self.assertTrue(isfile(cached))
+        synth.shutdown()
+        rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    pytest.main()
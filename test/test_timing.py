@@ -0,0 +1,122 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from os import chmod
+from os.path import isfile, join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+
+class TestStepTimingModel(unittest.TestCase):
+    test_dir = None
+
+    def setUp(self):
+        self.test_dir = mkdtemp()
+
+    def tearDown(self):
+        chmod(self.test_dir, 0o755)
+        rmtree(self.test_dir)
+
+    def test_get_timing_file(self):
+        from skill_demo.timing import get_timing_file
+        demo_file = join(self.test_dir, "demo.txt")
+        self.assertEqual(get_timing_file(demo_file, "/fallback"),
+                         f"{demo_file}.timing.json")
+        # Timing for demo files bundled with the skill is kept out of it
+        timing_file = get_timing_file(demo_file, "/fallback", self.test_dir)
+        self.assertTrue(timing_file.startswith("/fallback/demo.txt."))
+        self.assertEqual(get_timing_file(demo_file, "/fallback",
+                                         join(self.test_dir, "skill")),
+                         f"{demo_file}.timing.json")
+        chmod(self.test_dir, 0o555)
+        timing_file = get_timing_file(demo_file, "/fallback")
+        if timing_file != f"{demo_file}.timing.json":
+            # Running as root ignores directory permissions
+            self.assertTrue(timing_file.startswith("/fallback/demo.txt."))
+
+    def test_learned_timeout(self):
+        from skill_demo.timing import StepTimingModel, HANDLER, SPEECH
+        model = StepTimingModel(join(self.test_dir, "timing.json"))
+        self.assertEqual(model.get_timeout("prompt", HANDLER, 30), 30)
+        model.record("prompt", HANDLER, 1.0)
+        # Not enough samples
+        self.assertEqual(model.get_timeout("prompt", HANDLER, 30), 30)
+        model.record("prompt", HANDLER, 1.0)
+        timeout = model.get_timeout("prompt", HANDLER, 30)
+        self.assertLess(timeout, 30)
+        self.assertGreaterEqual(timeout, model.min_timeout)
+        self.assertEqual(model.get_timeout("prompt", SPEECH, 30), 30)
+
+        # Learned timeout never exceeds the configured timeout
+        self.assertEqual(model.get_timeout("prompt", HANDLER, 1), 1)
+
+        # A timed out step uses the default until it completes again
+        model.record_timeout("prompt", HANDLER)
+        self.assertEqual(model.get_timeout("prompt", HANDLER, 30), 30)
+        model.record("prompt", HANDLER, 1.0)
+        self.assertLessEqual(model.get_timeout("prompt", HANDLER, 30),
+                             timeout)
+
+        # Slower, variable handler gets a longer timeout
+        model.record("slow", HANDLER, 4.0)
+        model.record("slow", HANDLER, 8.0)
+        self.assertGreater(model.get_timeout("slow", HANDLER, 30), timeout)
+
+    def test_expected_segments(self):
+        from skill_demo.timing import StepTimingModel
+        model = StepTimingModel(join(self.test_dir, "timing.json"))
+        self.assertIsNone(model.get_expected_segments("prompt"))
+        model.record_segments("prompt", 1)
+        self.assertIsNone(model.get_expected_segments("prompt"))
+        model.record_segments("prompt", 1)
+        self.assertEqual(model.get_expected_segments("prompt"), 1)
+        model.record_segments("prompt", 2)
+        self.assertIsNone(model.get_expected_segments("prompt"))
+
+    def test_save_load(self):
+        from skill_demo.timing import StepTimingModel, HANDLER
+        path = join(self.test_dir, "timing", "timing.json")
+        model = StepTimingModel(path)
+        model.record("prompt", HANDLER, 1.0)
+        model.record("prompt", HANDLER, 2.0)
+        model.record_segments("prompt", 1)
+        model.record_segments("prompt", 1)
+        model.save()
+        self.assertTrue(isfile(path))
+
+        loaded = StepTimingModel(path)
+        self.assertEqual(loaded.get_timeout("prompt", HANDLER, 30),
+                         model.get_timeout("prompt", HANDLER, 30))
+        self.assertEqual(loaded.get_expected_segments("prompt"), 1)
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,150 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from mock import Mock, patch
+
+
+def _create_engine(config):
+    if config['module'] == "broken":
+        return None
+    tts = Mock()
+    tts.config = config
+    return tts
+
+
+@patch("skill_demo.tts_pool.TTSEnginePool._create_engine",
+       Mock(side_effect=_create_engine))
+class TestTTSEnginePool(unittest.TestCase):
+    config = {"module": "test-tts", "lang": "en-us"}
+
+    def test_get_key(self):
+        from skill_demo.tts_pool import TTSEnginePool
+        key = TTSEnginePool.get_key(self.config)
+        self.assertEqual(key[:2], ("test-tts", "en-us"))
+        self.assertEqual(key, TTSEnginePool.get_key(dict(self.config)))
+        self.assertNotEqual(key, TTSEnginePool.get_key(
+            dict(self.config, voice="male")))
+
+    def test_acquire_reuse(self):
+        from skill_demo.tts_pool import TTSEnginePool
+        pool = TTSEnginePool()
+        tts = pool.acquire(self.config)
+        self.assertEqual(tts.config, self.config)
+        pool.release(tts)
+        self.assertIs(pool.acquire(dict(self.config)), tts)
+        self.assertIsNot(pool.acquire(dict(self.config, lang="uk-ua")), tts)
+        TTSEnginePool._create_engine.reset_mock()
+
+    def test_fallback_cached(self):
+        from skill_demo.tts_pool import TTSEnginePool
+        pool = TTSEnginePool(retry_interval=60)
+        config = dict(self.config, module="broken")
+        tts = pool.acquire(config, "test-tts")
+        self.assertEqual(tts.config['module'], "test-tts")
+        TTSEnginePool._create_engine.reset_mock()
+        # Failed primary is not retried until `retry_interval` expires
+        self.assertIs(pool.acquire(config, "test-tts"), tts)
+        TTSEnginePool._create_engine.assert_not_called()
+        self.assertIsNone(pool.acquire(config))
+
+        pool.retry_interval = 0
+        pool.acquire(config, "test-tts")
+        TTSEnginePool._create_engine.assert_called_once()
+        TTSEnginePool._create_engine.reset_mock()
+
+    def test_idle_eviction(self):
+        from skill_demo.tts_pool import TTSEnginePool
+        pool = TTSEnginePool(idle_timeout=60)
+        tts = pool.acquire(self.config)
+        pool.idle_timeout = 0
+        # Engines in use are not evicted
+        pool.evict_idle()
+        tts.shutdown.assert_not_called()
+        pool.release(tts)
+        pool.evict_idle()
+        tts.shutdown.assert_called_once()
+        self.assertIsNot(pool.acquire(self.config), tts)
+        pool.shutdown()
+        TTSEnginePool._create_engine.reset_mock()
+
+    def test_idle_eviction_timer(self):
+        from time import sleep
+        from skill_demo.tts_pool import TTSEnginePool
+        pool = TTSEnginePool(idle_timeout=0.1)
+        tts = pool.acquire(self.config)
+        sleep(0.2)
+        # Engines in use are not evicted
+        tts.shutdown.assert_not_called()
+        pool.release(tts)
+        # Released engines are evicted without another `acquire`
+        sleep(0.3)
+        tts.shutdown.assert_called_once()
+        self.assertIsNone(pool._evict_timer)
+        self.assertIsNot(pool.acquire(self.config), tts)
+        pool.shutdown()
+        TTSEnginePool._create_engine.reset_mock()
+
+    def test_unhealthy_replaced(self):
+        from skill_demo.tts_pool import TTSEnginePool
+        pool = TTSEnginePool()
+        tts = pool.acquire(self.config)
+        pool.release(tts)
+        pool.mark_unhealthy(tts)
+        new_tts = pool.acquire(self.config)
+        self.assertIsNot(new_tts, tts)
+        tts.shutdown.assert_called_once()
+        pool.release(new_tts)
+
+        # An engine in use is only shut down once every user released it
+        first = pool.acquire(self.config)
+        second = pool.acquire(self.config)
+        self.assertIs(first, second)
+        pool.mark_unhealthy(first)
+        third = pool.acquire(self.config)
+        self.assertIsNot(third, first)
+        first.shutdown.assert_not_called()
+        pool.release(first)
+        first.shutdown.assert_not_called()
+        pool.release(second)
+        first.shutdown.assert_called_once()
+        third.shutdown.assert_not_called()
+        pool.release(third)
+        self.assertIs(pool.acquire(self.config), third)
+
+        # Replaced engines in use are shut down with the pool
+        pool.mark_unhealthy(third)
+        pool.acquire(self.config)
+        pool.shutdown()
+        third.shutdown.assert_called_once()
+        TTSEnginePool._create_engine.reset_mock()
+
+if __name__ == '__main__':
+    pytest.main()
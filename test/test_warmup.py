@@ -0,0 +1,139 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+import pytest
+
+from os.path import dirname, isfile, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from mock import Mock, patch
+
+SKILL_DIR = dirname(dirname(__file__))
+
+
+class TestWarmup(unittest.TestCase):
+    data_path = None
+
+    def setUp(self):
+        self.data_path = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.data_path)
+
+    def _get_tts(self):
+        def get_tts(sentence, output_file):
+            with open(output_file, 'w') as f:
+                f.write(sentence)
+            return output_file, None
+
+        tts = Mock()
+        tts.get_tts = Mock(side_effect=get_tts)
+        tts.config = {"module": "test-tts"}
+        tts.voice = None
+        return tts
+
+    def test_get_demo_langs(self):
+        from skill_demo.warmup import get_demo_langs
+        langs = get_demo_langs(SKILL_DIR)
+        self.assertIn("en-us", langs)
+        self.assertIn("uk-ua", langs)
+        self.assertEqual(get_demo_langs(self.data_path), [])
+
+    def test_prerender_prompts(self):
+        from skill_demo.warmup import prerender_prompts
+        from skill_demo.audio_cache import PromptAudioCache
+        cache = PromptAudioCache(join(self.data_path, "cache"))
+        tts = self._get_tts()
+        prompts = ["one", "two"]
+        self.assertEqual(prerender_prompts(tts, prompts, cache, "en-us"), 2)
+        self.assertEqual(tts.get_tts.call_count, 2)
+        for prompt in prompts:
+            key = PromptAudioCache.get_key(prompt, "en-us", "test-tts")
+            self.assertTrue(isfile(cache.get(key)))
+
+        # Cached prompts are not rendered again
+        self.assertEqual(prerender_prompts(tts, prompts, cache, "en-us"), 2)
+        self.assertEqual(tts.get_tts.call_count, 2)
+
+        # Chunks are cached for streamed playback
+        prompt = "This is a longer prompt, with more than one clause. " \
+                 "It is spoken in chunks."
+        self.assertEqual(prerender_prompts(tts, [prompt], cache, "en-us",
+                                           chunked=True), 1)
+        self.assertEqual(tts.get_tts.call_count, 4)
+        key = PromptAudioCache.get_key("It is spoken in chunks.", "en-us",
+                                       "test-tts")
+        self.assertTrue(isfile(cache.get(key)))
+
+        # Prompts after the first are rendered in one call for batch-capable
+        # plugins
+        tts.get_tts_batch = Mock(side_effect=lambda sentences, files: [
+            tts.get_tts(sentence, file)
+            for sentence, file in zip(sentences, files)])
+        prompts = ["three", "four", "one"]
+        self.assertEqual(prerender_prompts(tts, prompts, cache, "en-us",
+                                           batched=True), 3)
+        tts.get_tts_batch.assert_called_once()
+        self.assertEqual(tts.get_tts_batch.call_args[0][0], ["four"])
+
+    @patch("skill_demo.warmup._create_tts")
+    def test_main(self, create_tts):
+        from skill_demo.warmup import main
+        from skill_demo.demo_script import load_demo_prompts
+        tts = self._get_tts()
+        create_tts.return_value = tts
+        self.assertEqual(main(["--lang", "en-us", "--data-path",
+                               self.data_path]), 0)
+        create_tts.assert_called_once_with("neon-tts-plugin-audiofiles",
+                                           "en-us")
+        prompts = load_demo_prompts(join(SKILL_DIR, "locale", "en-us",
+                                         "demo.txt"))
+        self.assertEqual(tts.get_tts.call_count, len(set(prompts)))
+
+        create_tts.return_value = None
+        self.assertEqual(main(["--lang", "en-us", "--data-path",
+                               self.data_path]), 1)
+
+    @patch("skill_demo.warmup._create_tts")
+    def test_main_structured_script(self, create_tts):
+        from skill_demo.warmup import main
+        from skill_demo.demo_script import DemoScript
+        tts = self._get_tts()
+        create_tts.return_value = tts
+        self.assertEqual(main(["--lang", "en-us", "--file", "mall_demo.yaml",
+                               "--data-path", self.data_path]), 0)
+        script = DemoScript(join(SKILL_DIR, "locale", "en-us",
+                                 "mall_demo.yaml"), "en-us")
+        # Only step prompts are rendered, not the raw file contents
+        rendered = {c[0][0] for c in tts.get_tts.call_args_list}
+        self.assertEqual(rendered, set(script.prompts))
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,184 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from hashlib import sha256
+from os import access, makedirs, replace, W_OK
+from os.path import abspath, basename, commonpath, dirname, isfile, join
+from threading import Lock
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+HANDLER = "handler"
+SPEECH = "speech"
+
+
+def get_timing_file(demo_file: str, fallback_dir: str,
+                    skill_dir: Optional[str] = None) -> str:
+    """
+    Get the path to store learned step timing for a demo file. Timing for a
+    user-supplied demo file is stored next to it if that directory is
+    writable; timing for demo files bundled with the skill is never written
+    into the installed package.
+    :param demo_file: path to the demo file timing is learned for
+    :param fallback_dir: directory to use for bundled or read-only demo files
+    :param skill_dir: skill base directory containing bundled demo files
+    :returns: path to the timing file
+    """
+    bundled = skill_dir and commonpath(
+        [abspath(demo_file), abspath(skill_dir)]) == abspath(skill_dir)
+    if not bundled and access(dirname(demo_file), W_OK):
+        return f"{demo_file}.timing.json"
+    file_hash = sha256(demo_file.encode('utf-8')).hexdigest()[:8]
+    return join(fallback_dir, f"{basename(demo_file)}.{file_hash}.timing.json")
+
+
+class StepTimingModel:
+    def __init__(self, path: str, alpha: float = 0.3, margin: float = 4.0,
+                 slack: float = 1.0, min_timeout: float = 2.0,
+                 min_samples: int = 2):
+        """
+        Learns how long each demo prompt takes to be handled and spoken so
+        timeouts can be set per-prompt instead of using one global value.
+        Durations are tracked as exponentially weighted mean and deviation.
+        :param path: JSON file to persist learned timing to
+        :param alpha: weight of new samples in the moving averages
+        :param margin: number of deviations above the mean to allow
+        :param slack: seconds added to every learned timeout
+        :param min_timeout: minimum learned timeout in seconds
+        :param min_samples: samples required before learned values are used
+        """
+        self.path = path
+        self.alpha = alpha
+        self.margin = margin
+        self.slack = slack
+        self.min_timeout = min_timeout
+        self.min_samples = min_samples
+        self._lock = Lock()
+        # Demos sharing this model may save it concurrently
+        self._save_lock = Lock()
+        self._prompts = self._load()
+
+    def record(self, prompt: str, kind: str, duration: float):
+        """
+        Record how long a step took.
+        :param prompt: demo prompt the step was for
+        :param kind: HANDLER or SPEECH
+        :param duration: seconds the step took
+        """
+        with self._lock:
+            stats = self._prompts.setdefault(prompt, dict()).setdefault(
+                kind, {"mean": duration, "dev": duration / 2, "n": 0})
+            if stats["n"]:
+                error = abs(duration - stats["mean"])
+                stats["mean"] += self.alpha * (duration - stats["mean"])
+                stats["dev"] += self.alpha * (error - stats["dev"])
+            stats["n"] += 1
+            stats["timed_out"] = False
+
+    def record_timeout(self, prompt: str, kind: str):
+        """
+        Record that a step did not complete before its timeout. The default
+        timeout is used for this step until it completes again.
+        :param prompt: demo prompt the step was for
+        :param kind: HANDLER or SPEECH
+        """
+        with self._lock:
+            stats = self._prompts.setdefault(prompt, dict()).get(kind)
+            if stats:
+                stats["timed_out"] = True
+
+    def record_segments(self, prompt: str, segments: int):
+        """
+        Record how many audio outputs were spoken in response to a prompt.
+        :param prompt: demo prompt the response was for
+        :param segments: number of audio_output_end events observed
+        """
+        with self._lock:
+            entry = self._prompts.setdefault(prompt, dict())
+            if entry.get("segments") == segments:
+                entry["segments_runs"] = entry.get("segments_runs", 0) + 1
+            else:
+                entry["segments"] = segments
+                entry["segments_runs"] = 1
+
+    def get_timeout(self, prompt: str, kind: str, default: float) -> float:
+        """
+        Get the timeout for a step.
+        :param prompt: demo prompt the step is for
+        :param kind: HANDLER or SPEECH
+        :param default: timeout to use if there is not enough history
+        :returns: learned timeout in seconds, no greater than `default`
+        """
+        with self._lock:
+            stats = self._prompts.get(prompt, dict()).get(kind)
+            if not stats or stats["n"] < self.min_samples or \
+                    stats.get("timed_out"):
+                return default
+            timeout = stats["mean"] + self.margin * stats["dev"] + self.slack
+        return min(max(timeout, self.min_timeout), default)
+
+    def get_expected_segments(self, prompt: str) -> Optional[int]:
+        """
+        Get the number of audio outputs a prompt's response consistently
+        produced in past runs.
+        :param prompt: demo prompt to check
+        :returns: expected number of audio outputs, None if not known
+        """
+        with self._lock:
+            entry = self._prompts.get(prompt, dict())
+            if entry.get("segments_runs", 0) >= self.min_samples:
+                return entry["segments"]
+        return None
+
+    def save(self):
+        """
+        Persist learned timing to `self.path`.
+        """
+        try:
+            makedirs(dirname(self.path), exist_ok=True)
+            with self._lock:
+                data = json.dumps({"prompts": self._prompts}, indent=2)
+            with self._save_lock:
+                with open(f"{self.path}.tmp", 'w') as f:
+                    f.write(data)
+                replace(f"{self.path}.tmp", self.path)
+        except OSError as e:
+            LOG.error(f"Failed to save demo timing to {self.path}: {e}")
+
+    def _load(self) -> dict:
+        if not isfile(self.path):
+            return dict()
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("prompts", dict())
+        except Exception as e:
+            LOG.error(f"Failed to load demo timing from {self.path}: {e}")
+            return dict()
@@ -0,0 +1,238 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from dataclasses import dataclass, field
+from hashlib import sha256
+from threading import Lock, Timer
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from ovos_utils.log import LOG
+from ovos_plugin_manager.templates import TTS
+
+
+@dataclass
+class _PoolEntry:
+    tts: TTS
+    last_used: float = field(default_factory=monotonic)
+    refs: int = 0
+    healthy: bool = True
+
+
+class TTSEnginePool:
+    def __init__(self, idle_timeout: float = 900,
+                 retry_interval: float = 300):
+        """
+        Pool of loaded TTS plugin instances shared across demo runs. Engines
+        are created on first use, reused until marked unhealthy and shut down
+        by a timer after sitting unused for `idle_timeout` seconds.
+        :param idle_timeout: seconds an unused engine is kept loaded
+        :param retry_interval: seconds to wait before retrying to load a
+            plugin that failed to load
+        """
+        self.idle_timeout = idle_timeout
+        self.retry_interval = retry_interval
+        self._engines: Dict[Tuple[str, str, str], _PoolEntry] = dict()
+        # Replaced engines still in use; shut down once released
+        self._detached: List[_PoolEntry] = list()
+        self._failures: Dict[Tuple[str, str, str], float] = dict()
+        self._key_locks: Dict[Tuple[str, str, str], Lock] = dict()
+        self._lock = Lock()
+        self._evict_timer: Optional[Timer] = None
+
+    @staticmethod
+    def get_key(config: dict) -> Tuple[str, str, str]:
+        """
+        Build a pool key for a TTS config.
+        :param config: TTS config including `module` and `lang`
+        :returns: tuple of module, lang, and a hash of the full config
+        """
+        config_hash = sha256(json.dumps(config, sort_keys=True, default=str)
+                             .encode('utf-8')).hexdigest()
+        return config.get('module'), config.get('lang'), config_hash
+
+    def acquire(self, config: dict,
+                fallback_module: Optional[str] = None) -> Optional[TTS]:
+        """
+        Get a loaded TTS engine for the specified config, falling back to
+        `fallback_module` if the configured module can't be loaded. The
+        returned engine should be passed to `release` when no longer in use.
+        :param config: TTS config including `module` and `lang`
+        :param fallback_module: TTS module to use if `module` fails to load
+        :returns: TTS instance if one could be loaded, else None
+        """
+        self.evict_idle()
+        tts = self._get_engine(config)
+        if not tts and fallback_module and \
+                fallback_module != config.get('module'):
+            LOG.info(f"Trying with configured fallback_module "
+                     f"{fallback_module}")
+            tts = self._get_engine(dict(config, module=fallback_module))
+        return tts
+
+    def release(self, tts: Optional[TTS]):
+        """
+        Mark an engine returned by `acquire` as no longer in use.
+        :param tts: TTS instance to release
+        """
+        detached = None
+        with self._lock:
+            for entry in self._engines.values():
+                if entry.tts is tts:
+                    entry.refs = max(entry.refs - 1, 0)
+                    entry.last_used = monotonic()
+                    break
+            else:
+                for entry in self._detached:
+                    if entry.tts is tts:
+                        entry.refs -= 1
+                        if entry.refs <= 0:
+                            self._detached.remove(entry)
+                            detached = entry
+                        break
+            self._schedule_eviction()
+        if detached:
+            self._shutdown_engine(detached.tts)
+
+    def mark_unhealthy(self, tts: TTS):
+        """
+        Flag an engine so it is replaced instead of being reused.
+        :param tts: TTS instance that failed
+        """
+        with self._lock:
+            for entry in self._engines.values():
+                if entry.tts is tts:
+                    entry.healthy = False
+                    return
+
+    def evict_idle(self):
+        """
+        Shut down engines that are not in use and have been idle longer than
+        `idle_timeout`.
+        """
+        now = monotonic()
+        with self._lock:
+            expired = [key for key, entry in self._engines.items()
+                       if not entry.refs and
+                       now - entry.last_used >= self.idle_timeout]
+            entries = [self._engines.pop(key) for key in expired]
+        for entry in entries:
+            self._shutdown_engine(entry.tts)
+
+    def shutdown(self):
+        """
+        Shut down all pooled engines.
+        """
+        with self._lock:
+            if self._evict_timer:
+                self._evict_timer.cancel()
+                self._evict_timer = None
+            entries = list(self._engines.values()) + self._detached
+            self._engines.clear()
+            self._detached = list()
+            self._failures.clear()
+        for entry in entries:
+            self._shutdown_engine(entry.tts)
+
+    def _schedule_eviction(self):
+        """
+        Start a timer to evict the next engine to become idle, if there is
+        one and no timer is running. Must be called with `self._lock` held.
+        """
+        idle = [entry.last_used for entry in self._engines.values()
+                if not entry.refs]
+        if not idle or self._evict_timer:
+            return
+        delay = max(min(idle) + self.idle_timeout - monotonic(), 0)
+        self._evict_timer = Timer(delay, self._evict_scheduled)
+        self._evict_timer.daemon = True
+        self._evict_timer.start()
+
+    def _evict_scheduled(self):
+        with self._lock:
+            self._evict_timer = None
+        self.evict_idle()
+        with self._lock:
+            self._schedule_eviction()
+
+    def _get_engine(self, config: dict) -> Optional[TTS]:
+        key = self.get_key(config)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, Lock())
+        # Only one thread loads a given engine; others wait and reuse it
+        with key_lock:
+            with self._lock:
+                entry = self._engines.get(key)
+            if entry and entry.healthy:
+                with self._lock:
+                    entry.refs += 1
+                    entry.last_used = monotonic()
+                return entry.tts
+            if entry:
+                LOG.warning(f"Replacing unhealthy TTS: {config.get('module')}")
+                with self._lock:
+                    self._engines.pop(key, None)
+                    if entry.refs:
+                        # Other demos are still using it
+                        self._detached.append(entry)
+                        entry = None
+                if entry:
+                    self._shutdown_engine(entry.tts)
+            failed = self._failures.get(key)
+            if failed and monotonic() - failed < self.retry_interval:
+                LOG.debug(f"Skipping recently failed TTS: "
+                          f"{config.get('module')}")
+                return None
+            tts = self._create_engine(config)
+            with self._lock:
+                if not tts:
+                    self._failures[key] = monotonic()
+                    return None
+                self._failures.pop(key, None)
+                self._engines[key] = _PoolEntry(tts, refs=1)
+            return tts
+
+    @staticmethod
+    def _create_engine(config: dict) -> Optional[TTS]:
+        from ovos_plugin_manager.tts import OVOSTTSFactory
+        try:
+            LOG.debug(f'Creating TTS with config={config}')
+            return OVOSTTSFactory.create(config)
+        except Exception as e:
+            LOG.error(f"Failed to load TTS Plugin: {config.get('module')}")
+            LOG.error(e)
+            return None
+
+    @staticmethod
+    def _shutdown_engine(tts: TTS):
+        try:
+            tts.shutdown()
+        except Exception as e:
+            LOG.error(f"Failed to shut down TTS: {e}")
@@ -0,0 +1,159 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import argparse
+
+from os import listdir
+from os.path import dirname, isdir, join
+from threading import Event
+from typing import List, Optional
+
+from ovos_utils.log import LOG
+from ovos_config.locations import get_xdg_data_save_path
+from ovos_plugin_manager.templates import TTS
+
+from .audio_cache import PromptAudioCache, get_audio_cache_dir
+from .demo_script import DemoScript, resolve_demo_file
+from .synthesis import PromptSynthesizer, can_batch, can_stream
+
+SKILL_ID = "skill-demo.neongeckocom"
+DEFAULT_TTS_MODULE = "neon-tts-plugin-audiofiles"
+
+
+def get_demo_langs(skill_dir: str) -> List[str]:
+    """
+    Get the languages with resources in the skill's `locale` directory.
+    :param skill_dir: skill base directory containing `locale`
+    :returns: sorted list of language codes
+    """
+    locale_dir = join(skill_dir, "locale")
+    if not isdir(locale_dir):
+        return []
+    return sorted(lang for lang in listdir(locale_dir)
+                  if isdir(join(locale_dir, lang)))
+
+
+def prerender_prompts(tts: TTS, prompts: List[str], cache: PromptAudioCache,
+                      lang: str, cancel: Optional[Event] = None,
+                      timeout: Optional[float] = None,
+                      chunked: bool = False, batched: bool = False) -> int:
+    """
+    Synthesize prompts into the prompt audio cache ahead of a demo.
+    :param tts: TTS plugin instance used to synthesize prompts
+    :param prompts: prompts to render
+    :param cache: PromptAudioCache to store rendered audio in
+    :param lang: language of prompts
+    :param cancel: Event that stops rendering when set
+    :param timeout: max seconds to wait for each prompt to render
+    :param chunked: if True, render prompts in chunks as streamed demos do
+    :param batched: if True, render all prompts after the first in one batch
+    :returns: number of prompts with audio available in the cache
+    """
+    synthesizer = PromptSynthesizer(tts, prompts, lookahead=0, cancel=cancel,
+                                    cache=cache, lang=lang, chunked=chunked,
+                                    batched=batched)
+    rendered = 0
+    try:
+        for idx in range(len(prompts)):
+            if synthesizer.cancelled:
+                break
+            wait = timeout
+            if batched and timeout and idx > 0:
+                # Prompts after the first are ready when the whole batch is
+                wait = timeout * len(prompts)
+            if all(synthesizer.get(idx, wait, chunk) for chunk in
+                   range(len(synthesizer.get_chunks(idx)))):
+                rendered += 1
+    finally:
+        synthesizer.shutdown()
+    return rendered
+
+
+def _create_tts(module: str, lang: str) -> Optional[TTS]:
+    from ovos_config.config import Configuration
+    from ovos_plugin_manager.tts import OVOSTTSFactory
+    config = dict(Configuration().get('tts', {}))
+    config['module'] = module
+    config['lang'] = lang
+    try:
+        return OVOSTTSFactory.create(config)
+    except Exception as e:
+        LOG.error(f"Failed to load TTS Plugin: {module}: {e}")
+        return None
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Console entry point to pre-render demo prompt audio, i.e. when packaging
+    an image so the first demo on a device does not wait for synthesis.
+    """
+    skill_dir = dirname(__file__)
+    parser = argparse.ArgumentParser(
+        description="Pre-render demo prompts into the prompt audio cache")
+    parser.add_argument("--lang", action="append", dest="langs",
+                        help="language to render (default: all installed)")
+    parser.add_argument("--file", default="demo.txt",
+                        help="demo file name or path (default: demo.txt)")
+    parser.add_argument("--module", default=DEFAULT_TTS_MODULE,
+                        help=f"TTS module (default: {DEFAULT_TTS_MODULE})")
+    parser.add_argument("--data-path", default=get_xdg_data_save_path(),
+                        help="XDG data path containing the audio cache")
+    parser.add_argument("--skill-id", default=SKILL_ID,
+                        help=f"skill_id of the demo skill (default: "
+                             f"{SKILL_ID})")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="render whole prompts, as when the skill's "
+                             "stream_prompts setting is disabled")
+    parsed = parser.parse_args(args)
+    cache = PromptAudioCache(get_audio_cache_dir(parsed.data_path,
+                                                 parsed.skill_id))
+    errors = 0
+    for lang in parsed.langs or get_demo_langs(skill_dir):
+        demo_file = resolve_demo_file(parsed.file, lang, parsed.skill_id,
+                                      skill_dir, parsed.data_path)
+        if not demo_file:
+            LOG.warning(f"No demo file found for lang={lang}")
+            continue
+        tts = _create_tts(parsed.module, lang)
+        if not tts:
+            errors += 1
+            continue
+        prompts = list(DemoScript(demo_file, lang).prompts)
+        batched = can_batch(tts)
+        rendered = prerender_prompts(tts, prompts, cache, lang,
+                                     chunked=not parsed.no_stream and
+                                     can_stream(tts) and not batched,
+                                     batched=batched)
+        print(f"{lang}: rendered {rendered}/{len(prompts)} prompts from "
+              f"{demo_file}")
+    cache.flush()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())